@@ -113,5 +113,9 @@ USE_TZ = True
 STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 设置后大文件下载交给 nginx 发送（X-Accel-Redirect），值为 internal location 前缀，如 /protected/data/
+# nginx: location /protected/data/ { internal; alias /path/to/data/; }
+SPIDER_X_ACCEL_REDIRECT_PREFIX = os.environ.get('SPIDER_X_ACCEL_REDIRECT_PREFIX', '')
+
 DATA_DIR = BASE_DIR / 'data'
 DATA_DIR.mkdir(exist_ok=True)
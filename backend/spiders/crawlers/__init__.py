@@ -3,6 +3,7 @@
 用于集中管理所有爬虫项目的配置
 """
 
+import functools
 import re
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -19,6 +20,7 @@ def register_spider(spider_id: str, spider_name: str, spider_display_name: str)
         'spider_name': spider_name,
         'spider_display_name': spider_display_name
     })
+    _find_spider.cache_clear()
 
 
 def get_all_spiders() -> List[Dict]:
@@ -26,14 +28,20 @@ def get_all_spiders() -> List[Dict]:
     return _spiders_registry.copy()
 
 
-def get_spider_by_id(spider_id: str) -> Optional[Dict]:
-    """根据 spider_id 获取爬虫配置"""
+@functools.lru_cache(maxsize=256)
+def _find_spider(spider_id: str) -> Optional[Dict]:
+    """按前缀匹配查找爬虫配置，结果缓存到下次注册爬虫"""
     for spider in _spiders_registry:
         if spider_id.startswith(spider['spider_name']):
             return spider
     return None
 
 
+def get_spider_by_id(spider_id: str) -> Optional[Dict]:
+    """根据 spider_id 获取爬虫配置"""
+    return _find_spider(spider_id)
+
+
 def extract_config_var(content: str, var_name: str) -> Optional[str]:
     """从Python代码中提取变量值"""
     patterns = [
@@ -8,6 +8,8 @@ import signal
 import sys
 import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -18,7 +20,6 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from .utils import (
     generate_item_id,
-    random_delay,
     ensure_item_dir,
     save_content_to_file,
     download_file as utils_download_file,
@@ -27,6 +28,9 @@ from .utils import (
     decode_response,
     html_to_xpath,
     parse_response,
+    compile_extension_pattern,
+    TokenBucket,
+    dumps_jsonl,
 )
 from ..redis_manager import get_spider_redis_manager
 from ..logger import get_spider_logger
@@ -95,11 +99,18 @@ class BaseCrawler(ABC):
     REQUEST_TIMEOUT: int = 10
     RETRY_TIMES: int = 3
     RETRY_DELAY: int = 10
+    RETRY_CAP: float = 30
     REQUEST_DELAY: float = 1
     REQUEST_DELAY_MIN: float = 1
     REQUEST_DELAY_MAX: float = 2
     DETAIL_DELAY_MIN: float = 1
     DETAIL_DELAY_MAX: float = 3
+    REQUEST_RATE: float = 2.0
+    REQUEST_BURST: int = 4
+    DOWNLOAD_WORKERS: int = 4
+    MAX_ATTACHMENTS: int = 39
+    PAGINATION_FLUSH_INTERVAL: int = 10
+    LINKS_BATCH_SIZE: int = 32
     PERPAGE: int = 15
 
     PROXIES: Dict = {}
@@ -124,6 +135,11 @@ class BaseCrawler(ABC):
         self.status = 'idle'
         self.current_date_dir = None
 
+        self._downloadable_re = compile_extension_pattern(self.DOWNLOADABLE_EXTENSIONS)
+        self._page_link_re = compile_extension_pattern(self.PAGE_LINK_EXTENSIONS)
+        self._bucket = TokenBucket(rate=self.REQUEST_RATE, burst=self.REQUEST_BURST)
+        self._data_fp = None
+
         self._setup_signal_handlers()
 
     def _setup_signal_handlers(self) -> None:
@@ -190,6 +206,20 @@ class BaseCrawler(ABC):
         """从提取的数据项创建链接数据，子类必须实现"""
         pass
 
+    def get_dedup_key(self, item: Dict) -> str:
+        """获取列表数据项的去重键，默认为详情页URL
+
+        子类可以覆盖此方法，使用更短的唯一标识去重，从而推迟详情URL的构建
+        """
+        return item.get('URL')
+
+    def is_items_visited(self, items: List[Dict], keys: List[str]) -> List[bool]:
+        """批量检查列表数据项是否已访问，keys 为 get_dedup_key 的结果
+
+        子类更换去重键时可以覆盖此方法，兼容旧去重键写入的已访问集合
+        """
+        return self.rm.is_urls_visited_many(keys)
+
     def _make_list_request(self, column_id: int, startrecord: int, endrecord: int, perpage: int) -> Optional[Any]:
         """发起列表页请求
         
@@ -214,6 +244,7 @@ class BaseCrawler(ABC):
             timeout=self.REQUEST_TIMEOUT,
             retry_times=self.RETRY_TIMES,
             retry_delay=self.RETRY_DELAY,
+            retry_cap=self.RETRY_CAP,
             logger=self.logger,
             error_recorder=self.error_manager.record_error
         )
@@ -239,6 +270,11 @@ class BaseCrawler(ABC):
             self.rm.set_status('running', {'started_at': datetime.now().isoformat()})
             self.logger.info(f'{self.spider_name} 爬虫启动')
 
+            # 上次运行被强制终止时领取但未处理完的链接放回队列
+            recovered = self.rm.recover_processing_links()
+            if recovered:
+                self.logger.info(f'恢复上次未处理完的详情链接 {recovered} 条')
+
             if self._is_all_pagination_complete() and self.rm.get_links_queue_size() == 0:
                 self.logger.info('所有栏目翻页已完成且无待爬取链接，进入每日定时爬取模式')
                 self._start_scheduler()
@@ -282,6 +318,7 @@ class BaseCrawler(ABC):
 
         finally:
             self.is_running = False
+            self.close_data_file()
             self._stop_scheduler()
             if self.should_stop:
                 self.rm.set_status('stopped', {
@@ -362,6 +399,9 @@ class BaseCrawler(ABC):
         consecutive_duplicates = 0
         consecutive_empty = 0
         total_new_links = 0
+        # 翻页进度批量写入Redis，退出时补写最后一次
+        pending_marker = None
+        pages_since_flush = 0
 
         while stop_on_duplicates or endrecord < end_records:
             if self.should_stop:
@@ -381,6 +421,7 @@ class BaseCrawler(ABC):
             items_count = 0
 
             try:
+                self._bucket.acquire()
                 response = self._make_list_request(column_id, startrecord, endrecord, perpage)
 
                 if not response or response.status_code != 200:
@@ -395,7 +436,13 @@ class BaseCrawler(ABC):
                     items_count = len(items)
                     links_count = 0
 
-                    for item in items:
+                    # 整页一次批量查重，新链接一次流水线入队
+                    urls = [self.get_dedup_key(item) for item in items]
+                    visited_flags = self.is_items_visited(items, urls)
+                    page_seen = set()
+                    new_links = []
+
+                    for item, url, visited in zip(items, urls, visited_flags):
                         if self.should_stop:
                             break
 
@@ -403,8 +450,7 @@ class BaseCrawler(ABC):
                         if self.should_stop:
                             break
 
-                        url = item.get('URL')
-                        if self.rm.is_url_visited(url):
+                        if visited or url in page_seen:
                             if stop_on_duplicates:
                                 consecutive_duplicates += 1
                                 if consecutive_duplicates >= max_duplicates:
@@ -414,13 +460,13 @@ class BaseCrawler(ABC):
                             continue
 
                         consecutive_duplicates = 0
+                        page_seen.add(url)
+                        new_links.append((url, self.create_link_data(item, category)))
 
-                        link_data = self.create_link_data(item, category)
-
-                        self.rm.push_to_links_queue(link_data)
-                        self.rm.mark_url_visited(link_data.get('url', ''))
-                        links_count += 1
-                        total_new_links += 1
+                    if new_links:
+                        self.rm.push_links_and_mark_visited(new_links)
+                        links_count = len(new_links)
+                        total_new_links += links_count
 
                     consecutive_empty = 0
 
@@ -432,13 +478,16 @@ class BaseCrawler(ABC):
                     break
 
             if not stop_on_duplicates:
-                self.rm.set_last_pagination_page(column_id, endrecord)
+                pending_marker = endrecord
+                pages_since_flush += 1
+                if pages_since_flush >= self.PAGINATION_FLUSH_INTERVAL or self.should_stop:
+                    self.rm.set_last_pagination_page(column_id, pending_marker)
+                    pending_marker = None
+                    pages_since_flush = 0
 
             if self.should_stop:
                 break
 
-            random_delay(self.REQUEST_DELAY_MIN, self.REQUEST_DELAY_MAX)
-
             if stop_on_duplicates:
                 self.logger.info(f'[入队] 栏目 {category} 第{startrecord // perpage + 1}页: {links_count} 个新链接')
                 if links_count == 0 and items_count > 0:
@@ -459,6 +508,9 @@ class BaseCrawler(ABC):
                 total_pages = (end_records + perpage - 1) // perpage
                 self.logger.link_collection(category, current_page, total_pages, items_count, links_count)
 
+        if pending_marker is not None:
+            self.rm.set_last_pagination_page(column_id, pending_marker)
+
         return total_new_links
 
     def _crawl_details_phase(self) -> None:
@@ -469,91 +521,132 @@ class BaseCrawler(ABC):
         self.logger.info(f'待爬取 {self.rm.get_links_queue_size()} 条详情，总计 {total_to_crawl} 条')
 
         consecutive_errors = 0
+        # 每次从Redis领取一批链接（移入处理中列表），逐条处理完成后确认
+        pending = deque()
 
-        while self.rm.has_pending_links() and not self.should_stop:
-            self._check_pause()
-            if self.should_stop:
-                break
-
-            link_data = self.rm.pop_from_links_queue()
-            if not link_data:
-                break
-
-            url = link_data.get('url')
-            if self.rm.is_url_crawled(url):
-                self.logger.info(f'已爬取过，跳过: {url}')
-                continue
-
-            success = self.crawl_detail_page(link_data)
-
-            if success is True:
-                self.rm.mark_url_crawled(url)
-                crawled_count = self.rm.increment_details_crawled()
-                self.logger.info(f'详情爬取进度: {crawled_count}/{total_to_crawl}')
-                consecutive_errors = 0
-            elif success is None:
-                crawled_count = self.rm.increment_details_crawled()
-                self.logger.info(f'详情爬取进度（无内容跳过）: {crawled_count}/{total_to_crawl}')
-                consecutive_errors = 0
-            else:
-                consecutive_errors += 1
-                if consecutive_errors >= 100:
-                    self.logger.error(f'连续{consecutive_errors}次爬取失败，停止爬虫', error_type='too_many_errors', url=url)
-                    self.rm.set_status('stopped', {
-                        'stopped_at': datetime.now().isoformat(),
-                        'reason': 'too_many_errors',
-                        'error_url': url,
-                        'links_collected': self.rm.get_visited_count(),
-                        'details_crawled': self.rm.get_crawled_count()
-                    })
+        try:
+            while not self.should_stop:
+                self._check_pause()
+                if self.should_stop:
                     break
-                self.logger.error(f'爬取失败，将URL放回队列重试: {url}', error_type='detail_failed', url=url)
-                self.rm.push_to_links_queue(link_data)
-                self.logger.info(f'爬取继续，剩余 {self.rm.get_links_queue_size()} 条待爬取')
 
-    def download_attachments(self, hrefs: List[str], item_dir: Path, item_id: int, base_url: str = '') -> List[str]:
-        """下载附件文件"""
-        saved_paths = []
-        file_index = 2
-        downloaded_urls = set()
+                if not pending:
+                    pending.extend(self.rm.claim_links(self.LINKS_BATCH_SIZE))
+                    if not pending:
+                        break
+                raw, link_data = pending.popleft()
+
+                url = link_data.get('url')
+                if self.rm.is_url_crawled(url):
+                    self.logger.info(f'已爬取过，跳过: {url}')
+                    self.rm.ack_link(raw)
+                    continue
+
+                success = self.crawl_detail_page(link_data)
+
+                if success is True:
+                    # save_item_data 已把数据写入文件，此时再标记已爬取并确认链接
+                    self.rm.mark_url_crawled(url)
+                    self.rm.ack_link(raw)
+                    crawled_count = self.rm.increment_details_crawled()
+                    self.logger.info(f'详情爬取进度: {crawled_count}/{total_to_crawl}')
+                    consecutive_errors = 0
+                elif success is None:
+                    self.rm.ack_link(raw)
+                    crawled_count = self.rm.increment_details_crawled()
+                    self.logger.info(f'详情爬取进度（无内容跳过）: {crawled_count}/{total_to_crawl}')
+                    consecutive_errors = 0
+                else:
+                    consecutive_errors += 1
+                    if consecutive_errors >= 100:
+                        self.logger.error(f'连续{consecutive_errors}次爬取失败，停止爬虫', error_type='too_many_errors', url=url)
+                        self.rm.set_status('stopped', {
+                            'stopped_at': datetime.now().isoformat(),
+                            'reason': 'too_many_errors',
+                            'error_url': url,
+                            'links_collected': self.rm.get_visited_count(),
+                            'details_crawled': self.rm.get_crawled_count()
+                        })
+                        break
+                    self.logger.error(f'爬取失败，将URL放回队列重试: {url}', error_type='detail_failed', url=url)
+                    self.rm.retry_link(raw)
+                    self.logger.info(f'爬取继续，剩余 {self.rm.get_links_queue_size() + len(pending)} 条待爬取')
+        finally:
+            # 正常停止时把已领取未处理的链接放回队列；进程被强制终止时由下次启动时恢复
+            self.rm.recover_processing_links()
+
+    def is_downloadable_link(self, href: str) -> bool:
+        """判断链接是否为可下载附件（非页面链接）"""
+        return bool(self._downloadable_re.search(href)) and not self._page_link_re.search(href)
 
+    def filter_download_urls(self, hrefs: List[str], base_url: str = '') -> List[str]:
+        """一次遍历筛选可下载附件链接，返回去重后的完整URL列表"""
+        dl_urls = []
+        seen = set()
         for href in hrefs:
-            if file_index > 40:
-                break
             if not href or not isinstance(href, str):
                 continue
             href = href.strip()
-            if not href:
+            if not href or not self.is_downloadable_link(href):
                 continue
+            dl_url = parse.urljoin(base_url, href) if base_url else href
+            if dl_url not in seen:
+                seen.add(dl_url)
+                dl_urls.append(dl_url)
+        return dl_urls
 
-            href_lower = href.lower()
-            is_downloadable = any(ext in href_lower for ext in self.DOWNLOADABLE_EXTENSIONS)
-            is_page_link = any(ext in href_lower for ext in self.PAGE_LINK_EXTENSIONS)
-            if not is_downloadable or is_page_link:
-                continue
+    def download_attachments(self, dl_urls: List[str], item_dir: Path, item_id: int) -> List[str]:
+        """下载附件文件
 
-            if base_url:
-                dl_url = parse.urljoin(base_url, href)
-            else:
-                dl_url = href
+        Args:
+            dl_urls: 由 filter_download_urls 筛选出的附件URL列表
+            item_dir: 存储目录
+            item_id: 数据项ID
+        """
+        tasks = [(dl_url, f'{item_id}_{file_index}')
+                 for file_index, dl_url in enumerate(dl_urls[:self.MAX_ATTACHMENTS], start=2)]
+        return self.download_files(tasks, item_dir)
 
-            if dl_url in downloaded_urls:
-                continue
-            downloaded_urls.add(dl_url)
+    def download_files(self, tasks: List[Tuple[str, str]], item_dir: Path, kind: str = '附件') -> List[str]:
+        """用线程池并发下载文件
+
+        Args:
+            tasks: (下载URL, 保存文件名) 列表
+            item_dir: 存储目录
+            kind: 日志中显示的文件类型
+        """
+        if not tasks:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.DOWNLOAD_WORKERS) as executor:
+            results = list(executor.map(lambda task: utils_download_file(task[0], item_dir, task[1]), tasks))
 
-            saved_path = utils_download_file(dl_url, item_dir, f'{item_id}_{file_index}')
+        saved_paths = []
+        for saved_path in results:
             if saved_path:
                 saved_paths.append(saved_path)
-                self.logger.info(f'[下载] 附件保存成功: {saved_path}')
-                file_index += 1
-            time.sleep(0.5)
+                self.logger.info(f'[下载] {kind}保存成功: {saved_path}')
 
         return saved_paths
 
     def save_item_data(self, data: Dict[str, Any]) -> None:
-        """保存数据项到JSONL文件"""
-        with open(self.DATA_FILE, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(data, ensure_ascii=False) + '\n')
+        """保存数据项到JSONL文件（复用文件句柄，每条写入后立即 flush）
+
+        逐条 flush 到操作系统，进程被强制终止时已保存的数据项不会丢失
+        """
+        if self._data_fp is None:
+            self._data_fp = open(self.DATA_FILE, 'ab')
+        self._data_fp.write(dumps_jsonl(data))
+        self._data_fp.flush()
+
+    def close_data_file(self) -> None:
+        """关闭数据文件句柄"""
+        if self._data_fp is not None:
+            try:
+                self._data_fp.close()
+            except Exception as e:
+                self.logger.warning(f'关闭数据文件失败: {e}')
+            self._data_fp = None
 
     def _start_scheduler(self) -> None:
         """启动定时调度器（每天上午8点执行）"""
@@ -90,6 +90,10 @@ class FAXINGUOJIACrawler(BaseCrawler):
         """获取详情页URL"""
         return f"{self.URLS['base']}?gid={gid}"
 
+    def get_dedup_key(self, item: Dict) -> str:
+        """列表数据为原始API字段，使用详情页URL去重"""
+        return self.get_detail_url(item.get('gid', ''))
+
     def _make_list_request(self, column_id: int, startrecord: int, endrecord: int, perpage: int):
         """发起列表页请求（faxin使用JSON body和专用headers）"""
         params, data = self.build_list_params(column_id, startrecord, endrecord, perpage)
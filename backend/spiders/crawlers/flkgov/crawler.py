@@ -13,6 +13,11 @@ from urllib import parse
 import requests
 import urllib3
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from .config import (
@@ -43,8 +48,10 @@ from ..utils import (
     save_content_to_file,
     download_file as utils_download_file,
     request_get_with_retry,
-    request_post_with_retry,
     decode_response,
+    json_loads,
+    json_dumps_bytes,
+    backoff_delay,
 )
 from ...redis_manager import get_spider_redis_manager
 from ...logger import get_spider_logger
@@ -70,21 +77,76 @@ class FLKGovCrawler(BaseCrawler):
     LIST_API = 'https://flk.npc.gov.cn/law-search/search/list'
     DOWNLOAD_API = 'https://flk.npc.gov.cn/law-search/download/pc'
 
+    def __init__(self):
+        super().__init__()
+        self.client, self._is_http2 = self._create_client()
+
+    def _create_client(self) -> Tuple[Any, bool]:
+        """创建复用连接的HTTP客户端
+
+        列表POST与下载GET都访问 flk.npc.gov.cn，优先使用支持HTTP/2多路复用的
+        httpx 客户端；未安装 httpx/h2 时回退到 requests.Session（HTTP/1.1 keep-alive）。
+        服务端不支持HTTP/2时 httpx 会通过ALPN自动降级为HTTP/1.1。
+        """
+        if httpx is not None:
+            try:
+                limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+                # PROXIES 沿用 requests 的 {'http': url, 'https': url} 格式，转换为 httpx 的 mounts
+                mounts = {
+                    f'{scheme}://': httpx.HTTPTransport(
+                        proxy=proxy, http2=True, verify=False, limits=limits
+                    )
+                    for scheme, proxy in (self.PROXIES or {}).items() if proxy
+                }
+                client = httpx.Client(
+                    http2=True,
+                    verify=False,
+                    limits=limits,
+                    timeout=httpx.Timeout(self.REQUEST_TIMEOUT),
+                    # 与 requests 行为一致：下载链接常经302跳转到文件服务器
+                    follow_redirects=True,
+                    mounts=mounts or None,
+                )
+                return client, True
+            except ImportError:
+                pass
+        session = requests.Session()
+        session.verify = False
+        if self.PROXIES:
+            session.proxies.update(self.PROXIES)
+        return session, False
+
+    def _post_body(self, url: str, body: bytes, **kwargs):
+        """以原始字节作为请求体发送POST"""
+        if self._is_http2:
+            return self.client.post(url, content=body, **kwargs)
+        return self.client.post(url, data=body, **kwargs)
+
     def _make_list_request(self, column_id: int, startrecord: int, endrecord: int, perpage: int):
         """发起列表页请求（flkgov使用JSON body）"""
         params, data = self.build_list_params(column_id, startrecord, endrecord, perpage)
-        return request_post_with_retry(
-            self.get_list_url(),
-            json=data,
-            params=params,
-            headers=self.HEADERS,
-            proxies=self.PROXIES,
-            timeout=self.REQUEST_TIMEOUT,
-            retry_times=self.RETRY_TIMES,
-            retry_delay=self.RETRY_DELAY,
-            logger=self.logger,
-            error_recorder=self.error_manager.record_error
-        )
+        url = self.get_list_url()
+        body = json_dumps_bytes(data)
+
+        sleep_for = self.RETRY_DELAY
+        resp = None
+        for i in range(1, self.RETRY_TIMES + 1):
+            try:
+                resp = self._post_body(url, body, params=params, headers=self.HEADERS,
+                                       timeout=self.REQUEST_TIMEOUT)
+                if resp.status_code == 200:
+                    return resp
+                self.logger.warning(f'POST状态码 {resp.status_code}，重试第{i}次: {url}')
+                if i == self.RETRY_TIMES:
+                    self.error_manager.record_error('retry_exhausted', url, f'重试{i}次后失败')
+            except Exception as e:
+                self.logger.error(f'POST请求错误: {e}，重试第{i}次: {url}')
+                if i == self.RETRY_TIMES:
+                    self.error_manager.record_error('retry_exhausted', url, str(e))
+            if i < self.RETRY_TIMES:
+                sleep_for = backoff_delay(sleep_for, self.RETRY_DELAY, self.RETRY_CAP)
+                time.sleep(sleep_for)
+        return resp
 
     SXX_STATUS_MAP = {
         4: '尚未生效',
@@ -126,7 +188,7 @@ class FLKGovCrawler(BaseCrawler):
     def extract_items(self, response) -> List[Dict]:
         """从API响应提取数据（法律法规数据库特有格式）"""
         try:
-            data = response.json()
+            data = json_loads(response.content)
             rows = data.get('rows', [])
             
             # self.logger.info(f'[flkgov] API响应: total={data.get("total", 0)}, rows_count={len(rows)}')
@@ -142,9 +204,6 @@ class FLKGovCrawler(BaseCrawler):
                 sxx = item.get('sxx', '')
                 status = self.SXX_STATUS_MAP.get(sxx, '')
                 
-                encoded_title = parse.quote(title)
-                url = f'https://flk.npc.gov.cn/detail?id={bbbs}&fileId=&type=&title={encoded_title}'
-                
                 data_list.append({
                     'bbbs': bbbs,
                     'title': title,
@@ -154,7 +213,6 @@ class FLKGovCrawler(BaseCrawler):
                     '实施日期': sxrq,
                     'sxx': sxx,
                     'status': status,
-                    'url': url
                 })
             
             # self.logger.info(f'[flkgov] 提取到 {len(data_list)} 条数据')
@@ -163,6 +221,31 @@ class FLKGovCrawler(BaseCrawler):
             self.logger.error(f'解析API响应失败: {e}')
             return []
 
+    def get_detail_url(self, bbbs: str, title: str) -> str:
+        """获取详情页URL"""
+        return f'https://flk.npc.gov.cn/detail?id={bbbs}&fileId=&type=&title={parse.quote(title)}'
+
+    def get_dedup_key(self, item: Dict) -> str:
+        """使用 bbbs 去重，仅为新数据项构建详情URL"""
+        return item.get('bbbs')
+
+    def is_items_visited(self, items: List[Dict], keys: List[str]) -> List[bool]:
+        """按 bbbs 查重，未命中时再查旧版详情URL
+
+        升级前已访问集合中记录的是详情URL，命中旧URL时补记 bbbs，之后同一数据项只查 bbbs
+        """
+        visited_flags = self.rm.is_urls_visited_many(keys)
+        misses = [i for i, visited in enumerate(visited_flags) if not visited and keys[i]]
+        if not misses:
+            return visited_flags
+
+        legacy_urls = [self.get_detail_url(keys[i], items[i].get('title', '')) for i in misses]
+        for i, visited in zip(misses, self.rm.is_urls_visited_many(legacy_urls)):
+            if visited:
+                visited_flags[i] = True
+                self.rm.mark_url_visited(keys[i])
+        return visited_flags
+
     def crawl_detail_page(self, link_data: Dict[str, Any]) -> Optional[bool]:
         """爬取单个详情页"""
         url = link_data.get('url')
@@ -179,7 +262,7 @@ class FLKGovCrawler(BaseCrawler):
                 'bbbs': bbbs,
             }
 
-            response_dl = requests.get(
+            response_dl = self.client.get(
                 self.DOWNLOAD_API,
                 params=params_download,
                 headers=self.HEADERS_DOWNLOAD,
@@ -190,7 +273,7 @@ class FLKGovCrawler(BaseCrawler):
                 self.logger.info(f'无法获取下载信息: {url}', error_type='request_failed', url=url)
                 return None
 
-            dl_json = response_dl.json()
+            dl_json = json_loads(response_dl.content)
             if dl_json.get('code') != 200:
                 self.logger.info(f'下载API返回错误: {dl_json}', error_type='api_error', url=url)
                 return None
@@ -200,7 +283,7 @@ class FLKGovCrawler(BaseCrawler):
                 self.logger.info(f'无下载链接: {title}', error_type='no_content', url=url)
                 return None
 
-            response_dl1 = requests.get(dl_url, headers=self.HEADERS_DOWNLOAD, timeout=120)
+            response_dl1 = self.client.get(dl_url, headers=self.HEADERS_DOWNLOAD, timeout=120)
 
             if response_dl1.status_code != 200:
                 self.logger.info(f'无法下载文件: {url}', error_type='download_failed', url=url)
@@ -244,7 +327,7 @@ class FLKGovCrawler(BaseCrawler):
 
     def create_link_data(self, item: Dict, category: str) -> Dict[str, Any]:
         """从提取的数据项创建链接数据"""
-        url = item.get('url', '')
+        url = self.get_detail_url(item.get('bbbs', ''), item.get('title', ''))
         return {
             'url': url,
             'title': item.get('title', ''),
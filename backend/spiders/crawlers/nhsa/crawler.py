@@ -21,8 +21,6 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 from .config import (
     COLUMN_CONFIGS,
     DATA_FILE,
-    DETAIL_DELAY_MAX,
-    DETAIL_DELAY_MIN,
     DOWNLOADABLE_EXTENSIONS,
     HEADERS,
     HTML_HEADERS,
@@ -39,7 +37,6 @@ from .config import (
 from ..base_crawler import BaseCrawler
 from ..utils import (
     generate_item_id,
-    random_delay,
     ensure_item_dir,
     save_content_to_file,
     download_file as utils_download_file,
@@ -72,6 +69,10 @@ class NHSACrawler(BaseCrawler):
         'detail': 'https://www.nhsa.gov.cn/art/{article_id}.html',
     }
 
+    def __init__(self):
+        super().__init__()
+        self._list_data_cache: Dict[int, Dict[str, str]] = {}
+
     def get_column_configs(self) -> Dict[int, Dict]:
         """获取栏目配置"""
         return COLUMN_CONFIGS
@@ -84,6 +85,24 @@ class NHSACrawler(BaseCrawler):
         """获取详情页URL"""
         return self.URLS['detail'].format(article_id=article_id)
 
+    def _get_list_data(self, column_id: int) -> Dict[str, str]:
+        """获取栏目的列表页POST表单（只与栏目相关，按栏目缓存）"""
+        data = self._list_data_cache.get(column_id)
+        if data is None:
+            data = {
+                'col': '1',
+                'appid': '1',
+                'webid': '1',
+                'path': '/',
+                'columnid': str(column_id),
+                'sourceContentType': '1',
+                'unitid': '2464',
+                'webname': '国家医疗保障局',
+                'permissiontype': '0',
+            }
+            self._list_data_cache[column_id] = data
+        return data
+
     def build_list_params(self, column_id: int, startrecord: int, endrecord: int, perpage: int = 15) -> tuple:
         """构建列表页请求参数"""
         params = {
@@ -92,28 +111,20 @@ class NHSACrawler(BaseCrawler):
             'perpage': str(perpage),
         }
 
-        data = {
-            'col': '1',
-            'appid': '1',
-            'webid': '1',
-            'path': '/',
-            'columnid': str(column_id),
-            'sourceContentType': '1',
-            'unitid': '2464',
-            'webname': '国家医疗保障局',
-            'permissiontype': '0',
-        }
-
-        return params, data
+        return params, self._get_list_data(column_id)
 
     def extract_items(self, response) -> List[Dict]:
         """从HTML提取数据（国家医保局特有格式）"""
-        content = response.text
+        # 接口固定返回UTF-8，直接解码以跳过requests的编码探测
+        content = response.content.decode('utf-8', errors='replace')
         record_pattern = r'<record><!\[CDATA\[(.*?)\]\]></record>'
         records = re.findall(record_pattern, content, re.DOTALL)
 
         data_list = []
         for record in records:
+            # 不足4个span的记录必然被丢弃，跳过HTML解析
+            if record.count('<span') < 4:
+                continue
             soup = BeautifulSoup(record, 'html.parser')
             spans = soup.find_all('span')
 
@@ -141,7 +152,7 @@ class NHSACrawler(BaseCrawler):
         url = link_data.get('url')
         category = link_data.get('category', '未知')
 
-        random_delay(DETAIL_DELAY_MIN, DETAIL_DELAY_MAX)
+        self._bucket.acquire()
 
         try:
             item_id = generate_item_id()
@@ -170,20 +181,9 @@ class NHSACrawler(BaseCrawler):
             content = ''.join(content_elements).strip()
 
             hrefs = doc.xpath('//div[@id="zoom"]//a/@href')
-            has_downloadable = False
-            for href in hrefs:
-                if not href or not isinstance(href, str):
-                    continue
-                href = href.strip().lower()
-                if not href:
-                    continue
-                is_downloadable = any(ext in href for ext in self.DOWNLOADABLE_EXTENSIONS)
-                is_page_link = any(ext in href for ext in self.PAGE_LINK_EXTENSIONS)
-                if is_downloadable and not is_page_link:
-                    has_downloadable = True
-                    break
-
-            if not content and not has_downloadable:
+            dl_urls = self.filter_download_urls(hrefs, 'https://www.nhsa.gov.cn/')
+
+            if not content and not dl_urls:
                 self.logger.info(f'无内容且无附件，已跳过: {title}', error_type='no_content', url=url)
                 return None
 
@@ -191,7 +191,7 @@ class NHSACrawler(BaseCrawler):
             if content:
                 save_content_to_file(content, item_dir, f'{item_id}_1.txt')
 
-            attachments = self.download_attachments(hrefs, item_dir, item_id, 'https://www.nhsa.gov.cn/')
+            attachments = self.download_attachments(dl_urls, item_dir, item_id)
 
             data = self.get_item_data(item_id, link_data, title, content, attachments)
             self.save_item_data(data)
@@ -3,15 +3,81 @@
 所有爬虫项目共享的工具函数
 """
 
+import functools
+import json
 import time
 import os
-from datetime import datetime
+import random
+import re
+import shutil
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, Iterable, Optional, Pattern, Tuple, Union
+from urllib.parse import urljoin, urlparse, unquote, parse_qs
+
+import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 CRAWLERS_DIR = BASE_DIR / 'backend' / 'spiders' / 'crawlers'
 DATA_DIR = BASE_DIR / 'data'
+_BASE_DIR_PREFIX = str(BASE_DIR).replace('\\', '/') + '/'
+
+MAX_DOWNLOADS_PER_HOST = 4
+HOST_MIN_INTERVAL = 0.5
+CHARSET_SNIFF_BYTES = 1024
+DOWNLOAD_COPY_BUFFER_SIZE = 1024 * 1024
+
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+# 已创建的数据项目录（FIFO淘汰，避免长时间运行时无限增长）
+_ENSURED_ITEM_DIRS_MAX = 8192
+_ensured_item_dirs: set = set()
+_ensured_item_dirs_order: deque = deque()
+_ensured_item_dirs_lock = threading.Lock()
+
+_host_pacers: Dict[str, 'HostPacer'] = {}
+_host_pacers_lock = threading.Lock()
+
+_last_item_id = 0
+_item_id_lock = threading.Lock()
+
+_BAD_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+# 兼容 charset="gbk"、charset='gbk' 与不带引号的 charset=gbk
+_CHARSET_RE = re.compile(rb'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+_HEADER_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+_XML_DECL_RE = re.compile(r'<\?xml[^>]*\?>')
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_SESSION = _create_session()
+
+
+def get_session() -> requests.Session:
+    """获取共享的 requests.Session
+    
+    所有爬虫请求复用同一个连接池，通过 HTTP keep-alive
+    避免每次请求重新建立 TCP/TLS 连接。
+    
+    Returns:
+        requests.Session 对象
+    """
+    return _SESSION
 
 
 def get_data_dir(spider_name: str) -> Path:
@@ -29,6 +95,7 @@ def get_data_dir(spider_name: str) -> Path:
     return DATA_DIR / spider_name
 
 
+@functools.lru_cache(maxsize=64)
 def get_spider_files_base_dir(spider_name: str) -> Path:
     """获取爬虫附件文件基础目录
     
@@ -56,8 +123,12 @@ def get_item_dir(spider_name: str, item_id: int) -> Path:
     Returns:
         Path 对象，存储目录，如 data/nhsa/nhsa_files/1769153573123/
     """
-    files_dir = get_spider_files_base_dir(spider_name)
-    return files_dir / str(item_id)
+    return _item_dir_cached(spider_name, item_id)
+
+
+@functools.lru_cache(maxsize=4096)
+def _item_dir_cached(spider_name: str, item_id: int) -> Path:
+    return get_spider_files_base_dir(spider_name) / str(item_id)
 
 
 def get_data_file(spider_name: str) -> Path:
@@ -98,9 +169,19 @@ def ensure_directories(spider_name: str) -> Tuple[Path, Path]:
     return data_dir, files_base_dir
 
 
+@functools.lru_cache(maxsize=4096)
+def _ensure_parent(dir_path: Path) -> Path:
+    """确保父目录存在（每个目录只创建一次）"""
+    dir_path.mkdir(parents=True, exist_ok=True)
+    return dir_path
+
+
 def ensure_item_dir(spider_name: str, item_id: int) -> Path:
     """确保数据项的存储目录存在
     
+    附件基础目录只在首次调用时创建并缓存，之后每个数据项只需
+    创建自身所在的叶子目录；已创建过的数据项目录直接返回。
+    
     Args:
         spider_name: 爬虫名称
         item_id: 数据项ID
@@ -108,8 +189,20 @@ def ensure_item_dir(spider_name: str, item_id: int) -> Path:
     Returns:
         Path 对象，数据项存储目录
     """
-    item_dir = get_item_dir(spider_name, item_id)
-    item_dir.mkdir(parents=True, exist_ok=True)
+    key = (spider_name, item_id)
+    item_dir = _item_dir_cached(spider_name, item_id)
+    if key in _ensured_item_dirs:
+        return item_dir
+
+    _ensure_parent(get_spider_files_base_dir(spider_name))
+    item_dir.mkdir(exist_ok=True)
+
+    with _ensured_item_dirs_lock:
+        if key not in _ensured_item_dirs:
+            _ensured_item_dirs.add(key)
+            _ensured_item_dirs_order.append(key)
+            if len(_ensured_item_dirs_order) > _ENSURED_ITEM_DIRS_MAX:
+                _ensured_item_dirs.discard(_ensured_item_dirs_order.popleft())
     return item_dir
 
 
@@ -117,12 +210,19 @@ def generate_item_id() -> int:
     """生成毫秒级时间戳唯一ID
     
     为每条采集数据生成全局唯一的时间戳ID。
-    格式为毫秒级 Unix 时间戳，可保证高并发下的唯一性。
+    格式为毫秒级 Unix 时间戳；同一毫秒内多次调用时顺延 1，
+    保证ID严格递增、进程内不重复。
     
     Returns:
         int 类型的毫秒时间戳，如 1769153573123
     """
-    return int(datetime.now().timestamp() * 1000)
+    global _last_item_id
+    with _item_id_lock:
+        now = time.time_ns() // 1_000_000
+        if now <= _last_item_id:
+            now = _last_item_id + 1
+        _last_item_id = now
+        return now
 
 
 def to_relative_path(absolute_path: str, base_dir: Path = BASE_DIR) -> str:
@@ -139,8 +239,11 @@ def to_relative_path(absolute_path: str, base_dir: Path = BASE_DIR) -> str:
         相对路径字符串，使用正斜杠分隔
         例如：data/nhsa/nhsa_files/1769153573123/1.pdf
     """
-    from pathlib import Path as PathLib
-    abs_path = PathLib(absolute_path)
+    if base_dir is BASE_DIR:
+        path_str = str(absolute_path).replace('\\', '/')
+        if path_str.startswith(_BASE_DIR_PREFIX):
+            return path_str[len(_BASE_DIR_PREFIX):]
+    abs_path = Path(absolute_path)
     try:
         rel_path = abs_path.relative_to(base_dir)
         return str(rel_path).replace('\\', '/')
@@ -148,6 +251,51 @@ def to_relative_path(absolute_path: str, base_dir: Path = BASE_DIR) -> str:
         return str(abs_path).replace('\\', '/')
 
 
+def json_loads(data: Any) -> Any:
+    """解析JSON（bytes 或 str），优先使用 orjson
+    
+    Args:
+        data: JSON 内容
+    
+    Returns:
+        解析后的 Python 对象
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON 字节串（不转义中文），优先使用 orjson
+    
+    Args:
+        obj: 待序列化的对象
+    
+    Returns:
+        JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def dumps_jsonl(obj: Any) -> bytes:
+    """序列化为一行 JSON Lines 记录（含末尾换行），优先使用 orjson
+    
+    orjson 直接在序列化时追加换行，无需再拼接 bytes；非字符串键
+    按标准库 json 的方式转为字符串。
+    
+    Args:
+        obj: 待序列化的对象
+    
+    Returns:
+        以 b'\\n' 结尾的 JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+
 def random_delay(min_delay: float, max_delay: float) -> None:
     """随机延迟一段时间
     
@@ -161,11 +309,87 @@ def random_delay(min_delay: float, max_delay: float) -> None:
     Example:
         random_delay(1, 2)  # 随机等待1-2秒
     """
-    import random
     delay = random.uniform(min_delay, max_delay)
     time.sleep(delay)
 
 
+class TokenBucket:
+    """令牌桶限速器
+    
+    以固定速率补充令牌，允许短时突发。多个线程共享同一个桶时，
+    只有令牌耗尽才需要等待，从而把逐次固定延迟变为全局平均限速。
+    
+    Args:
+        rate: 每秒补充的令牌数（即平均请求速率）
+        burst: 桶容量（允许的最大突发请求数）
+        jitter: 等待时间的随机扰动幅度（秒），保留访问间隔的随机性
+    
+    Example:
+        bucket = TokenBucket(rate=2.0, burst=4)
+        bucket.acquire()  # 取得令牌后再发起请求
+    """
+
+    def __init__(self, rate: float, burst: int, jitter: float = 0.02):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.jitter = jitter
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> None:
+        """获取一个令牌，令牌不足时阻塞等待"""
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                wait += random.uniform(-self.jitter, self.jitter)
+                self._cond.wait(max(wait, 0))
+
+
+class HostPacer:
+    """单主机请求节拍器
+    
+    保证对同一主机的相邻请求间隔不小于 min_interval。等待时间按
+    上次预约的时间点计算，响应慢时不再额外叠加固定延迟。
+    
+    Args:
+        min_interval: 相邻请求的最小间隔（秒）
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_ok = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """预约下一个请求时间点，未到时间则等待"""
+        with self._lock:
+            now = time.monotonic()
+            sleep_for = self._next_ok - now
+            self._next_ok = max(now, self._next_ok) + self.min_interval
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+
+
+def pacer_for(url: str, min_interval: float = HOST_MIN_INTERVAL) -> HostPacer:
+    """获取URL所属主机的节拍器（按主机共享）"""
+    host = urlparse(url).netloc
+    pacer = _host_pacers.get(host)
+    if pacer is None:
+        with _host_pacers_lock:
+            pacer = _host_pacers.setdefault(host, HostPacer(min_interval))
+    return pacer
+
+
 def human_like_delay() -> None:
     """人类-like随机延迟
     
@@ -176,14 +400,14 @@ def human_like_delay() -> None:
         - 降低被反爬虫机制检测的风险
         - 减少对目标服务器的访问压力
     """
-    import random
     base = random.uniform(0.5, 1.5)
     jitter = random.uniform(0, 0.5)
     time.sleep(base + jitter)
 
 
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(filename: str) -> str:
-    """清理文件名，移除非法字符
+    """清理文件名，移除非法字符（纯函数，结果缓存）
     
     Args:
         filename: 原始文件名
@@ -191,17 +415,39 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         清理后的文件名
     """
-    import re
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = _BAD_FILENAME_RE.sub('_', filename)
     filename = filename.strip()
     if len(filename) > 200:
         filename = filename[:200]
     return filename
 
 
+def compile_extension_pattern(extensions: Iterable[str]) -> Pattern:
+    """将扩展名列表编译为单个正则表达式
+    
+    生成的正则匹配以指定扩展名结尾（允许后跟 ? 或 # 参数）的链接，
+    用一次 search 代替对每个扩展名的逐个子串判断。
+    
+    Args:
+        extensions: 扩展名列表，如 ['.pdf', '.doc']
+    
+    Returns:
+        编译后的正则对象（忽略大小写）
+    """
+    alternatives = '|'.join(re.escape(ext.lstrip('.')) for ext in extensions)
+    if not alternatives:
+        return re.compile(r'(?!)')
+    return re.compile(r'\.(?:' + alternatives + r')(?:[?#]|$)', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=8192)
 def get_file_suffix(url: str, default: str = 'bin') -> str:
     """从URL获取文件扩展名
     
+    常见的直链URL直接截取末尾扩展名，只有带 filename 查询参数
+    或路径经过编码等情况才完整解析URL。路径参数（如 ;jsessionid=）、
+    查询串和锚点均不计入扩展名。
+    
     Args:
         url: 文件URL
         default: 默认扩展名
@@ -209,7 +455,19 @@ def get_file_suffix(url: str, default: str = 'bin') -> str:
     Returns:
         文件扩展名（小写），如 'pdf', 'doc', 'txt' 等
     """
-    from urllib.parse import urlparse, unquote, parse_qs
+    if 'filename=' not in url:
+        end = len(url)
+        for sep in (';', '?', '#'):
+            pos = url.find(sep)
+            if 0 <= pos < end:
+                end = pos
+        path = url[:end]
+        slash = path.rfind('/')
+        dot = path.rfind('.')
+        if slash > path.find('//') + 1 and dot > slash and '%' not in path[dot:]:
+            suffix = path[dot + 1:].lower()
+            return suffix if len(suffix) <= 10 else default
+
     parsed = urlparse(url)
     path = unquote(parsed.path)
     query = parse_qs(parsed.query)
@@ -227,6 +485,41 @@ def get_file_suffix(url: str, default: str = 'bin') -> str:
     return default
 
 
+@functools.lru_cache(maxsize=256)
+def _url_base_parts(base: str) -> Tuple[str, str, str]:
+    """拆分基准URL为 (scheme, origin, 目录前缀)"""
+    parsed = urlparse(base)
+    origin = f'{parsed.scheme}://{parsed.netloc}'
+    path = parsed.path or '/'
+    return parsed.scheme, origin, origin + path[:path.rfind('/') + 1]
+
+
+def fast_urljoin(base: str, href: str) -> str:
+    """拼接相对链接，常见形式直接按前缀拼接，其余情况回退到 urljoin
+    
+    Args:
+        base: 基准URL（通常为当前页面URL）
+        href: 页面中的链接
+    
+    Returns:
+        完整URL
+    """
+    # 页面中的 href 常带首尾空白/换行，urljoin 同样会先去除
+    href = href.strip()
+    if href.startswith(('http://', 'https://')):
+        return href
+    # 仅 //host、/path 和普通路径段走快速拼接；./、../、?、#、带scheme等交给 urljoin
+    if (not href or href[0] in '.?#' or '..' in href or '/./' in href
+            or ':' in href.split('/', 1)[0]):
+        return urljoin(base, href)
+    scheme, origin, base_dir = _url_base_parts(base)
+    if href.startswith('//'):
+        return f'{scheme}:{href}'
+    if href.startswith('/'):
+        return origin + href
+    return base_dir + href
+
+
 def save_content_to_file(content: str, item_dir: Path, filename: str, encoding: str = 'utf-8') -> str:
     """保存文本内容到文件
     
@@ -245,6 +538,16 @@ def save_content_to_file(content: str, item_dir: Path, filename: str, encoding:
     return to_relative_path(str(file_path))
 
 
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """获取目标主机的并发下载信号量（同一主机最多 MAX_DOWNLOADS_PER_HOST 个并发下载）"""
+    host = urlparse(url).netloc
+    sem = _host_semaphores.get(host)
+    if sem is None:
+        with _host_semaphores_lock:
+            sem = _host_semaphores.setdefault(host, threading.BoundedSemaphore(MAX_DOWNLOADS_PER_HOST))
+    return sem
+
+
 def download_file(url: str, item_dir: Path, filename: str, timeout: int = 60, headers: dict = None) -> str:
     """下载文件到指定目录
     
@@ -258,8 +561,6 @@ def download_file(url: str, item_dir: Path, filename: str, timeout: int = 60, he
     Returns:
         相对路径，下载失败返回 None
     """
-    import requests
-    
     suffix = get_file_suffix(url)
     if not filename.endswith(f'.{suffix}'):
         filename = f'{filename}.{suffix}'
@@ -267,16 +568,21 @@ def download_file(url: str, item_dir: Path, filename: str, timeout: int = 60, he
     file_path = item_dir / sanitize_filename(filename)
     
     try:
-        resp = requests.get(url, timeout=timeout, headers=headers or {}, stream=True)
-        resp.raise_for_status()
-        
-        total_size = int(resp.headers.get('content-length', 0))
-        downloaded_size = 0
-        
-        with open(file_path, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-                downloaded_size += len(chunk)
+        with _host_semaphore(url):
+            with _SESSION.get(url, timeout=timeout, headers=headers or {}, stream=True) as resp:
+                resp.raise_for_status()
+                
+                total_size = int(resp.headers.get('content-length', 0))
+                is_encoded = bool(resp.headers.get('content-encoding'))
+                resp.raw.decode_content = True
+                
+                with open(file_path, 'wb') as f:
+                    shutil.copyfileobj(resp.raw, f, DOWNLOAD_COPY_BUFFER_SIZE)
+                    downloaded_size = f.tell()
+            
+            # 未压缩传输时，实际字节数少于 content-length 说明连接中途断开
+            if total_size and not is_encoded and downloaded_size < total_size:
+                raise IOError(f'文件不完整: {downloaded_size}/{total_size} 字节')
         
         return to_relative_path(str(file_path))
     except Exception as e:
@@ -284,16 +590,35 @@ def download_file(url: str, item_dir: Path, filename: str, timeout: int = 60, he
         return None
 
 
+def backoff_delay(previous: float, base: float, cap: float) -> float:
+    """计算下一次重试的等待时间（decorrelated jitter 指数退避）
+    
+    等待时间在 [base, min(cap, previous * 3)] 之间随机取值，
+    既能快速重试，又避免多个线程同时重试。
+    
+    Args:
+        previous: 上一次的等待时间（秒），首次传入 base
+        base: 最小等待时间（秒）
+        cap: 最大等待时间（秒）
+    
+    Returns:
+        本次等待时间（秒）
+    """
+    return random.uniform(base, max(base, min(cap, previous * 3)))
+
+
 def request_get_with_retry(
     url: str,
     headers: dict = None,
     proxies: dict = None,
     timeout: int = 10,
     retry_times: int = 3,
-    retry_delay: int = 10,
+    retry_delay: float = None,
     logger = None,
     error_recorder = None,
-    cookies: dict = None
+    cookies: dict = None,
+    retry_base: float = 1.0,
+    retry_cap: float = 30.0
 ):
     """发送GET请求（带重试机制）
     
@@ -303,26 +628,31 @@ def request_get_with_retry(
         proxies: 代理配置
         timeout: 超时时间（秒）
         retry_times: 重试次数
-        retry_delay: 重试间隔（秒）
+        retry_delay: 重试间隔（秒），兼容参数，等同于 retry_base
         logger: 日志记录器
         error_recorder: 错误记录函数
         cookies: 请求Cookie
+        retry_base: 退避基准间隔（秒）
+        retry_cap: 退避最大间隔（秒）
     
     Returns:
         requests.Response 对象，失败返回 None
     """
-    import requests
-    
+    if retry_delay is not None:
+        retry_base = retry_delay
+    sleep_for = retry_base
+    pacer = pacer_for(url)
     resp = None
     for i in range(1, retry_times + 1):
+        pacer.wait()
         try:
-            resp = requests.get(
+            resp = _SESSION.get(
                 url,
                 headers=headers,
                 proxies=proxies,
                 timeout=timeout,
-                verify=False,
-                cookies=cookies
+                cookies=cookies,
+                verify=False
             )
             if resp.status_code == 200:
                 return resp
@@ -335,13 +665,14 @@ def request_get_with_retry(
                     logger.warning(f'状态码 {resp.status_code}，重试第{i}次: {url}')
                 if i == retry_times and error_recorder:
                     error_recorder('retry_exhausted', url, f'重试{i}次后失败')
-                time.sleep(retry_delay)
         except Exception as e:
             if logger:
                 logger.error(f'请求错误: {e}，重试第{i}次: {url}')
             if i == retry_times and error_recorder:
                 error_recorder('retry_exhausted', url, str(e))
-            time.sleep(retry_delay)
+        if i < retry_times:
+            sleep_for = backoff_delay(sleep_for, retry_base, retry_cap)
+            time.sleep(sleep_for)
     return resp
 
 
@@ -355,9 +686,11 @@ def request_post_with_retry(
     proxies: dict = None,
     timeout: int = 10,
     retry_times: int = 3,
-    retry_delay: int = 10,
+    retry_delay: float = None,
     logger = None,
-    error_recorder = None
+    error_recorder = None,
+    retry_base: float = 1.0,
+    retry_cap: float = 30.0
 ):
     """发送POST请求（带重试机制）
     
@@ -371,19 +704,22 @@ def request_post_with_retry(
         proxies: 代理配置
         timeout: 超时时间（秒）
         retry_times: 重试次数
-        retry_delay: 重试间隔（秒）
+        retry_delay: 重试间隔（秒），兼容参数，等同于 retry_base
         logger: 日志记录器
         error_recorder: 错误记录函数
+        retry_base: 退避基准间隔（秒）
+        retry_cap: 退避最大间隔（秒）
     
     Returns:
         requests.Response 对象，失败返回 None
     """
-    import requests
-    
+    if retry_delay is not None:
+        retry_base = retry_delay
+    sleep_for = retry_base
     resp = None
     for i in range(1, retry_times + 1):
         try:
-            resp = requests.post(
+            resp = _SESSION.post(
                 url,
                 data=data,
                 json=json,
@@ -401,13 +737,14 @@ def request_post_with_retry(
                     logger.warning(f'POST状态码 {resp.status_code}，重试第{i}次: {url}')
                 if i == retry_times and error_recorder:
                     error_recorder('retry_exhausted', url, f'重试{i}次后失败')
-                time.sleep(retry_delay)
         except Exception as e:
             if logger:
                 logger.error(f'POST请求错误: {e}，重试第{i}次: {url}')
             if i == retry_times and error_recorder:
                 error_recorder('retry_exhausted', url, str(e))
-            time.sleep(retry_delay)
+        if i < retry_times:
+            sleep_for = backoff_delay(sleep_for, retry_base, retry_cap)
+            time.sleep(sleep_for)
     return resp
 
 
@@ -420,11 +757,9 @@ def decode_response(resp) -> str:
     Returns:
         解码后的 HTML 字符串
     """
-    import re
-    html_text = resp.text
-    charset = re.findall(r'charset="(.*?)"', html_text)
-    if charset:
-        charset = charset[0]
+    match = _CHARSET_RE.search(resp.content)
+    if match:
+        charset = match.group(1).decode('ascii', errors='ignore')
         html = resp.content.decode(charset, errors='ignore')
     elif resp.encoding == "ISO-8859-1":
         resp.encoding = None
@@ -434,19 +769,66 @@ def decode_response(resp) -> str:
     return html
 
 
-def html_to_xpath(html: str):
+def decode_response_bytes(resp) -> Tuple[bytes, Optional[str]]:
+    """获取HTML响应的原始字节及页面声明的编码（不解码）
+    
+    Args:
+        resp: requests.Response 对象
+    
+    Returns:
+        元组 (content, charset)，先在前 CHARSET_SNIFF_BYTES 字节内查找 charset 声明，
+        未找到时取 Content-Type 响应头中的 charset，仍没有则为 None，由 lxml 自行识别
+    """
+    content = resp.content
+    match = _CHARSET_RE.search(content, 0, CHARSET_SNIFF_BYTES)
+    if match:
+        return content, match.group(1).decode('ascii', errors='ignore')
+    match = _HEADER_CHARSET_RE.search(resp.headers.get('Content-Type', ''))
+    return content, match.group(1) if match else None
+
+
+@functools.lru_cache(maxsize=16)
+def _get_html_parser(encoding: Optional[str] = None):
+    return etree.HTMLParser(encoding=encoding, recover=True, huge_tree=False,
+                            remove_comments=True, remove_pis=True)
+
+
+def html_to_xpath(html: Union[str, bytes], encoding: Optional[str] = None):
     """使用XPath解析HTML
     
+    传入 bytes 时直接交给复用的 HTMLParser 解析，省去先解码成 str
+    再由 lxml 重新编码的过程。
+    
     Args:
-        html: HTML 字符串
+        html: HTML 字符串或原始字节
+        encoding: 字节内容的编码，为空时由 lxml 自动识别
     
     Returns:
         etree.HTML 文档对象
     """
-    from lxml import etree
+    if isinstance(html, bytes):
+        if not html.strip():
+            return None
+        return etree.fromstring(html, _get_html_parser(encoding))
     return etree.HTML(html)
 
 
+def decode_and_parse(resp):
+    """直接从响应字节解析HTML文档
+    
+    编码取自页面头部或响应头的 charset 声明（或交由 lxml 识别），
+    全程不读取 resp.text，避免整页解码出一份额外的字符串。
+    
+    Args:
+        resp: requests.Response 对象
+    
+    Returns:
+        etree 文档对象，内容为空时返回 None
+    """
+    content, charset = decode_response_bytes(resp)
+    return html_to_xpath(content, charset)
+
+
 def parse_response(resp):
     """解析响应内容（用于 XML/HTML 响应）
     
@@ -456,10 +838,9 @@ def parse_response(resp):
     Returns:
         etree.HTML 文档对象，解析失败返回 None
     """
-    import re
     try:
         content = resp.text
-        content = re.sub(r'<\?xml[^>]*\?>', '', content)
+        content = _XML_DECL_RE.sub('', content)
         content = content.strip()
         if not content:
             return None
@@ -7,11 +7,9 @@ import json
 import os
 import re
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
-from urllib import parse
 from lxml import etree
 import urllib3
 
@@ -21,8 +19,6 @@ from .config import (
     COLUMN_CONFIGS,
     COOKIES,
     DATA_FILE,
-    DETAIL_DELAY_MAX,
-    DETAIL_DELAY_MIN,
     DOWNLOADABLE_EXTENSIONS,
     HEADERS,
     HTML_HEADERS,
@@ -42,16 +38,27 @@ from ..utils import (
     random_delay,
     ensure_item_dir,
     save_content_to_file,
-    download_file as utils_download_file,
     request_get_with_retry,
-    decode_response,
-    html_to_xpath,
+    decode_and_parse,
     parse_response,
     sanitize_filename,
+    fast_urljoin,
 )
 from ...redis_manager import get_spider_redis_manager
 from ...logger import get_spider_logger
 
+_LIST_ITEMS_XP = etree.XPath('//ul[@class="zxxx_list mt20"]//li')
+_SOURCE_SPANS_XP = etree.XPath('//div[@class="source"]/span[@class="mr"]')
+_CONTENT_PARAGRAPHS_XP = etree.XPath('//div[@id="xw_box"]//p')
+_BOX_LINK_HREFS_XP = etree.XPath('//div[@id="xw_box"]//a/@href')
+_BOX_LINK_TEXTS_XP = etree.XPath('//div[@id="xw_box"]//a//text()')
+_BOX_IMAGE_SRCS_XP = etree.XPath('//div[@id="xw_box"]//img/@src')
+
+
+def _element_text(elements) -> str:
+    """拼接各节点的全部文本（由 lxml 在C层遍历子树，不逐个构造文本节点）"""
+    return ''.join(etree.tostring(el, method='text', encoding='unicode', with_tail=False) for el in elements)
+
 
 class JWJCrawler(BaseCrawler):
     """卫健委爬虫"""
@@ -111,20 +118,23 @@ class JWJCrawler(BaseCrawler):
 
     def extract_items(self, response) -> List[Dict]:
         """从HTML提取数据（卫健委特有格式）"""
-        html = decode_response(response)
-        doc = html_to_xpath(html)
-
-        item_titles = doc.xpath('//ul[@class="zxxx_list mt20"]//li/a/@title')
-        item_links = doc.xpath('//ul[@class="zxxx_list mt20"]//li/a/@href')
-        item_dates = doc.xpath('//ul[@class="zxxx_list mt20"]//li/span[@class="ml"]//text()')
+        doc = decode_and_parse(response)
 
         data_list = []
-        for title, link, date in zip(item_titles, item_links, item_dates):
-            url = parse.urljoin('https://www.nhc.gov.cn/wjw/zcfg/list.shtml', link)
+        for li in _LIST_ITEMS_XP(doc):
+            a = li.find('a')
+            span = li.find('span[@class="ml"]')
+            if a is None or span is None:
+                continue
+            title = a.get('title')
+            link = a.get('href')
+            if title is None or link is None:
+                continue
+            url = fast_urljoin('https://www.nhc.gov.cn/wjw/zcfg/list.shtml', link)
             data_list.append({
                 '标题': title,
                 'URL': url,
-                '发布日期': date.strip()
+                '发布日期': ''.join(span.itertext()).strip()
             })
 
         return data_list
@@ -134,8 +144,6 @@ class JWJCrawler(BaseCrawler):
         url = link_data.get('url')
         title = link_data.get('title', '无标题')
 
-        random_delay(DETAIL_DELAY_MIN, DETAIL_DELAY_MAX)
-
         try:
             item_id = generate_item_id()
 
@@ -153,18 +161,14 @@ class JWJCrawler(BaseCrawler):
                 self.logger.info(f'无法获取页面: {url}', error_type='request_failed', url=url)
                 return None
 
-            html = decode_response(resp)
-            doc = html_to_xpath(html)
+            doc = decode_and_parse(resp)
 
-            source_elements = doc.xpath('//div[@class="source"]/span[@class="mr"]//text()')
-            source = ''.join(source_elements).replace('来源:', '').strip()
+            source = _element_text(_SOURCE_SPANS_XP(doc)).replace('来源:', '').strip()
+            content = _element_text(_CONTENT_PARAGRAPHS_XP(doc)).strip()
 
-            content_elements = doc.xpath('//div[@id="xw_box"]//p//text()')
-            content = ''.join(content_elements).strip()
-
-            download_links = doc.xpath('//div[@id="xw_box"]//a/@href')
-            download_names = doc.xpath('//div[@id="xw_box"]//a//text()')
-            image_links = doc.xpath('//div[@id="xw_box"]//img/@src')
+            download_links = _BOX_LINK_HREFS_XP(doc)
+            download_names = _BOX_LINK_TEXTS_XP(doc)
+            image_links = _BOX_IMAGE_SRCS_XP(doc)
 
             if not content and not download_links and not image_links:
                 self.logger.info(f'无内容且无附件，已跳过: {title}', error_type='no_content', url=url)
@@ -189,41 +193,27 @@ class JWJCrawler(BaseCrawler):
             return None
 
     def download_attachments_and_images(self, hrefs: List[str], names: List[str], image_srcs: List[str], item_dir: Path, item_id: int, base_url: str) -> List[str]:
-        """下载附件文件和图片"""
-        saved_paths = []
-        file_index = 2
+        """下载附件文件和图片（先去重生成下载任务，再交给 download_files 并发下载）"""
+        dl_urls = []
         downloaded_urls = set()
 
         for href, name in zip(hrefs, names):
-            if file_index > 40:
-                break
             if not href or not isinstance(href, str):
                 continue
             href = href.strip()
             if not href:
                 continue
 
-            href_lower = href.lower()
-            is_downloadable = any(ext in href_lower for ext in self.DOWNLOADABLE_EXTENSIONS)
-            is_page_link = any(ext in href_lower for ext in self.PAGE_LINK_EXTENSIONS)
-            if not is_downloadable or is_page_link:
+            if not self.is_downloadable_link(href):
                 continue
 
-            dl_url = parse.urljoin(base_url, href)
+            dl_url = fast_urljoin(base_url, href)
             if dl_url in downloaded_urls:
                 continue
             downloaded_urls.add(dl_url)
-
-            saved_path = utils_download_file(dl_url, item_dir, f'{item_id}_{file_index}')
-            if saved_path:
-                saved_paths.append(saved_path)
-                self.logger.info(f'[下载] 附件保存成功: {saved_path}')
-                file_index += 1
-            time.sleep(0.5)
+            dl_urls.append(dl_url)
 
         for img_src in image_srcs:
-            if file_index > 40:
-                break
             if not img_src or not isinstance(img_src, str):
                 continue
             img_src = img_src.strip()
@@ -234,18 +224,17 @@ class JWJCrawler(BaseCrawler):
             if img_ext not in self.DOWNLOADABLE_EXTENSIONS:
                 continue
 
-            img_url = parse.urljoin(base_url, img_src)
+            img_url = fast_urljoin(base_url, img_src)
             if img_url in downloaded_urls:
                 continue
             downloaded_urls.add(img_url)
+            dl_urls.append(img_url)
 
-            saved_path = utils_download_file(img_url, item_dir, f'{item_id}_{file_index}')
-            if saved_path:
-                saved_paths.append(saved_path)
-                self.logger.info(f'[下载] 图片保存成功: {saved_path}')
-                file_index += 1
-            time.sleep(0.5)
+        tasks = [(dl_url, f'{item_id}_{file_index}')
+                 for file_index, dl_url in enumerate(dl_urls[:self.MAX_ATTACHMENTS], start=2)]
+        saved_paths = self.download_files(tasks, item_dir, kind='文件')
 
+        random_delay(0.3, 0.8)
         return saved_paths
 
     def get_data_dict(self, link_data: Dict[str, Any], content: str, attachments: List[str]) -> Dict:
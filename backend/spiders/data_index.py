@@ -0,0 +1,207 @@
+"""
+数据文件索引模块
+为 {spider}_data.json（每行一条JSON）维护 SQLite 辅助索引，
+分页查询只读取当前页记录，避免每次请求都全量解析数据文件
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# 索引文件与数据文件同目录
+INDEX_SUFFIX = '.idx.sqlite'
+# 每次增量索引读取的块大小
+INDEX_READ_SIZE = 4 * 1024 * 1024
+# 可走索引排序的字段（值与 CrawledDataView 排序时的 str() 结果一致）
+SORT_COLUMNS = ('publish_date', 'title', 'item_id', 'url')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+CREATE TABLE IF NOT EXISTS items (
+    line_number INTEGER PRIMARY KEY,
+    byte_offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    date_filter TEXT NOT NULL,
+    title_filter TEXT NOT NULL,
+    publish_date TEXT,
+    title TEXT,
+    item_id TEXT,
+    url TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_publish_date ON items (publish_date, line_number);
+"""
+
+# 同一进程内同一数据文件的索引更新串行执行
+_index_locks: Dict[str, threading.Lock] = {}
+_index_locks_guard = threading.Lock()
+
+
+def summarize_item(raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    """数据记录转换为列表接口返回的字段"""
+    return {
+        'item_id': raw_data.get('item_id'),
+        'title': raw_data.get('title'),
+        'publish_date': raw_data.get('发布日期') or raw_data.get('publish_date'),
+        'url': raw_data.get('url'),
+        'data': raw_data.get('data', {}),
+    }
+
+
+def _sort_text(value: Any) -> str:
+    """与视图中 get_sort_value 相同的排序值"""
+    return value if isinstance(value, str) else str(value)
+
+
+def _index_lock(key: str) -> threading.Lock:
+    with _index_locks_guard:
+        lock = _index_locks.get(key)
+        if lock is None:
+            lock = _index_locks[key] = threading.Lock()
+        return lock
+
+
+def _connect(data_file: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(data_file) + INDEX_SUFFIX, timeout=10)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _get_meta(conn: sqlite3.Connection) -> Dict[str, int]:
+    return dict(conn.execute('SELECT key, value FROM meta'))
+
+
+def _ensure_index(conn: sqlite3.Connection, data_file: Path):
+    """把数据文件新追加的完整行写入索引；文件被替换或截断时重建"""
+    st = os.stat(data_file)
+    meta = _get_meta(conn)
+    indexed = meta.get('size', 0)
+    line_number = meta.get('lines', 0)
+
+    with open(data_file, 'rb') as f:
+        rebuild = meta.get('inode') != st.st_ino or st.st_size < indexed
+        if not rebuild and indexed:
+            # 已索引部分必须以换行结束，否则文件被改写过
+            f.seek(indexed - 1)
+            rebuild = f.read(1) != b'\n'
+        if rebuild:
+            conn.execute('DELETE FROM items')
+            indexed = line_number = 0
+        if not rebuild and indexed == st.st_size:
+            return
+
+        f.seek(indexed)
+        offset = indexed
+        tail = b''
+        while True:
+            chunk = f.read(INDEX_READ_SIZE)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b'\n')
+            # 最后一段可能是正在写入的半行，留到下次
+            tail = lines.pop()
+            rows = []
+            for raw_line in lines:
+                line_number += 1
+                length = len(raw_line) + 1
+                line = raw_line.strip()
+                if line:
+                    try:
+                        data = summarize_item(_json_loads(line))
+                    except (json.JSONDecodeError, AttributeError) as e:
+                        logger.warning(f"解析JSON行失败 (行号:{line_number}): {e}")
+                    else:
+                        rows.append((
+                            line_number, offset, length - 1,
+                            (data['publish_date'] or '').strip(),
+                            data['title'] or '',
+                            *(_sort_text(data[column]) for column in SORT_COLUMNS),
+                        ))
+                offset += length
+            conn.executemany('INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                     [('inode', st.st_ino), ('size', offset), ('lines', line_number)])
+    conn.commit()
+
+
+def query_items(data_file: Path, keyword: Optional[str] = None,
+                date_start: Optional[str] = None, date_end: Optional[str] = None,
+                sort_field: str = 'publish_date', sort_order: str = 'desc',
+                offset: int = 0, limit: int = 20) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+    """通过索引分页查询数据记录
+
+    过滤和排序规则与 CrawledDataView 的全量扫描一致（同值按文件顺序）。
+
+    Returns:
+        (匹配总数, 当前页记录)；排序字段不支持或索引不可用时返回 None，由调用方退回全量扫描
+    """
+    if sort_field not in SORT_COLUMNS:
+        sort_field = sort_field.lower()
+        if sort_field not in SORT_COLUMNS:
+            return None
+    try:
+        with _index_lock(str(data_file)):
+            conn = _connect(data_file)
+            try:
+                _ensure_index(conn, data_file)
+                where, params = [], []
+                # 没有发布日期的记录不参与日期过滤
+                if date_start:
+                    where.append("(date_filter = '' OR date_filter >= ?)")
+                    params.append(date_start)
+                if date_end:
+                    where.append("(date_filter = '' OR date_filter <= ?)")
+                    params.append(date_end)
+                if keyword:
+                    where.append('instr(title_filter, ?) > 0')
+                    params.append(keyword)
+                where_sql = f" WHERE {' AND '.join(where)}" if where else ''
+                total = conn.execute(f'SELECT COUNT(*) FROM items{where_sql}', params).fetchone()[0]
+                direction = 'DESC' if sort_order.lower() == 'desc' else 'ASC'
+                rows = conn.execute(
+                    f'SELECT byte_offset, length FROM items{where_sql} '
+                    f'ORDER BY {sort_field} {direction}, line_number LIMIT ? OFFSET ?',
+                    params + [max(limit, 0), max(offset, 0)]
+                ).fetchall()
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"数据索引不可用，改为全量扫描: {e}")
+        return None
+
+    items = []
+    with open(data_file, 'rb') as f:
+        for byte_offset, length in rows:
+            f.seek(byte_offset)
+            items.append(summarize_item(_json_loads(f.read(length))))
+    return total, items
+
+
+def count_items(data_file: Path) -> Optional[Tuple[int, int]]:
+    """通过索引统计 (有效记录数, 有标题的记录数)；索引不可用时返回 None"""
+    try:
+        with _index_lock(str(data_file)):
+            conn = _connect(data_file)
+            try:
+                _ensure_index(conn, data_file)
+                return conn.execute(
+                    "SELECT COUNT(*), COUNT(NULLIF(title_filter, '')) FROM items"
+                ).fetchone()
+            finally:
+                conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"数据索引不可用，改为全量扫描: {e}")
+        return None
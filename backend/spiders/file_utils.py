@@ -3,15 +3,74 @@
 提供ZIP打包、文件下载等工具函数
 """
 
-import os
 import io
+import os
 import zipfile
 import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import IO, Iterator, List, Optional, Union
+
+# 超过该大小的ZIP从内存转存到临时文件
+ZIP_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+ZIP_COPY_BUFFER_SIZE = 1024 * 1024
+# 流式打包时每次读取并产出的块大小
+ZIP_STREAM_CHUNK_SIZE = 64 * 1024
+# 批量打包时并发预读的文件数与单文件上限，超过上限的大文件仍由写入端流式读取
+ZIP_PREFETCH_WORKERS = 8
+ZIP_PREFETCH_WINDOW = 16
+ZIP_PREFETCH_MAX_SIZE = 4 * 1024 * 1024
+
+# DEFLATE 压缩级别：附件多为已压缩格式，文本类用 1 级即可，换取约3倍压缩速度
+ZIP_COMPRESS_LEVEL = int(os.environ.get('SPIDER_ZIP_COMPRESSLEVEL', '1'))
+
+# 本身已压缩的格式直接存储，不再做deflate
+STORED_SUFFIXES = {
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.zip', '.rar', '.7z', '.gz',
+    '.docx', '.xlsx', '.pptx', '.wps', '.ofd',
+}
+
+
+def _new_zip_buffer() -> IO[bytes]:
+    """创建ZIP输出缓冲：小文件留在内存，超过阈值自动落盘"""
+    return tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE)
+
 
+def _iter_files(root: Union[str, Path]) -> Iterator[str]:
+    """递归遍历目录下的所有文件路径（基于os.scandir，无需逐个stat）"""
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
 
-def create_zip_from_directory(source_dir: Path, arcname_prefix: str = '') -> io.BytesIO:
+
+def _zip_info(file_path: Union[str, Path], archive_name: str) -> zipfile.ZipInfo:
+    """生成压缩包条目：已压缩格式使用ZIP_STORED，其余按 ZIP_COMPRESS_LEVEL 做deflate"""
+    zinfo = zipfile.ZipInfo.from_file(file_path, archive_name)
+    if os.path.splitext(file_path)[1].lower() in STORED_SUFFIXES:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        # ZipFile.open(zinfo, 'w') 只读取条目上的压缩级别
+        zinfo._compresslevel = ZIP_COMPRESS_LEVEL
+    return zinfo
+
+
+def _write_to_zip(zip_file: zipfile.ZipFile, file_path: Union[str, Path], archive_name: str) -> None:
+    """以流式拷贝方式写入单个文件"""
+    zinfo = _zip_info(file_path, archive_name)
+    with open(file_path, 'rb') as src, zip_file.open(zinfo, 'w') as dst:
+        shutil.copyfileobj(src, dst, ZIP_COPY_BUFFER_SIZE)
+
+
+def create_zip_from_directory(source_dir: Path, arcname_prefix: str = '') -> IO[bytes]:
     """
     将目录打包为ZIP文件
 
@@ -20,25 +79,24 @@ def create_zip_from_directory(source_dir: Path, arcname_prefix: str = '') -> io.
         arcname_prefix: 压缩包内文件名的前缀
 
     Returns:
-        ZIP文件的BytesIO对象
+        ZIP文件对象（SpooledTemporaryFile）
     """
-    zip_buffer = io.BytesIO()
-
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for root, dirs, files in os.walk(source_dir):
-            for file in files:
-                file_path = Path(root) / file
-                if arcname_prefix:
-                    archive_name = f"{arcname_prefix}/{file_path.name}"
-                else:
-                    archive_name = file_path.name
-                zip_file.write(file_path, archive_name)
+    zip_buffer = _new_zip_buffer()
+
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+        for file_path in _iter_files(source_dir):
+            file_name = os.path.basename(file_path)
+            if arcname_prefix:
+                archive_name = f"{arcname_prefix}/{file_name}"
+            else:
+                archive_name = file_name
+            _write_to_zip(zip_file, file_path, archive_name)
 
     zip_buffer.seek(0)
     return zip_buffer
 
 
-def create_zip_from_files(files: List[dict], base_dir: Path) -> io.BytesIO:
+def create_zip_from_files(files: List[dict], base_dir: Path) -> IO[bytes]:
     """
     根据文件列表创建ZIP文件
 
@@ -47,16 +105,16 @@ def create_zip_from_files(files: List[dict], base_dir: Path) -> io.BytesIO:
         base_dir: 基础目录
 
     Returns:
-        ZIP文件的BytesIO对象
+        ZIP文件对象（SpooledTemporaryFile）
     """
-    zip_buffer = io.BytesIO()
+    zip_buffer = _new_zip_buffer()
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
         for file_info in files:
             file_path = base_dir / file_info['path']
             if file_path.exists() and file_path.is_file():
                 archive_name = file_info.get('name', file_path.name)
-                zip_file.write(file_path, archive_name)
+                _write_to_zip(zip_file, file_path, archive_name)
 
     zip_buffer.seek(0)
     return zip_buffer
@@ -66,7 +124,7 @@ def create_batch_zip(
     spider_files_dir: Path,
     item_ids: List[str],
     spider_name: str
-) -> tuple[io.BytesIO, List[str]]:
+) -> tuple[IO[bytes], List[str]]:
     """
     批量打包多个item文件夹为ZIP
 
@@ -76,20 +134,19 @@ def create_batch_zip(
         spider_name: 爬虫名称
 
     Returns:
-        (ZIP文件的BytesIO对象, 缺失的item_id列表)
+        (ZIP文件对象（SpooledTemporaryFile）, 缺失的item_id列表)
     """
-    zip_buffer = io.BytesIO()
+    zip_buffer = _new_zip_buffer()
     missing_items = []
+    prefix_len = len(os.fspath(spider_files_dir)) + 1
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
         for item_id in item_ids:
             item_dir = spider_files_dir / str(item_id)
             if item_dir.exists() and item_dir.is_dir():
-                for root, dirs, files in os.walk(item_dir):
-                    for file in files:
-                        file_path = Path(root) / file
-                        relative_path = file_path.relative_to(spider_files_dir)
-                        zip_file.write(file_path, str(relative_path))
+                for file_path in _iter_files(item_dir):
+                    relative_path = file_path[prefix_len:].replace(os.sep, '/')
+                    _write_to_zip(zip_file, file_path, relative_path)
             else:
                 missing_items.append(item_id)
 
@@ -97,6 +154,146 @@ def create_batch_zip(
     return zip_buffer, missing_items
 
 
+class _ZipStreamSink(io.RawIOBase):
+    """ZIP流式输出的写入端：只收集写入的字节，由生成器随时取走（不可seek，zipfile自动使用数据描述符）"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _read_small_file(file_path: str) -> Optional[bytes]:
+    """读取不超过 ZIP_PREFETCH_MAX_SIZE 的文件内容，大文件返回 None"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > ZIP_PREFETCH_MAX_SIZE:
+            return None
+        return f.read()
+
+
+def _prefetch_entries(entries: Iterator[tuple]) -> Iterator[tuple]:
+    """在线程池中提前读取后续文件，按原顺序产出 (文件路径, 压缩包内名称, Future)"""
+    global _prefetch_pool
+    if _prefetch_pool is None:
+        _prefetch_pool = ThreadPoolExecutor(max_workers=ZIP_PREFETCH_WORKERS,
+                                            thread_name_prefix='zip-prefetch')
+    pending = deque()
+    try:
+        for file_path, archive_name in entries:
+            pending.append((file_path, archive_name, _prefetch_pool.submit(_read_small_file, file_path)))
+            if len(pending) >= ZIP_PREFETCH_WINDOW:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        # 客户端中途断开时取消尚未开始的读取
+        for _, _, future in pending:
+            future.cancel()
+
+
+def _stream_zip(entries: Iterator[tuple], prefetch: bool = False) -> Iterator[bytes]:
+    """按 (文件路径, 压缩包内名称) 逐个写入ZIP并边写边产出字节，内存占用约为一个读缓冲
+
+    prefetch 为 True 时小文件由线程池并发预读，磁盘读取与压缩重叠进行
+    """
+    if prefetch:
+        entries = _prefetch_entries(entries)
+    else:
+        entries = ((file_path, archive_name, None) for file_path, archive_name in entries)
+    sink = _ZipStreamSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+        for file_path, archive_name, future in entries:
+            zinfo = _zip_info(file_path, archive_name)
+            content = future.result() if future is not None else None
+            with zip_file.open(zinfo, 'w') as dst:
+                if content is not None:
+                    view = memoryview(content)
+                    for start in range(0, len(view), ZIP_STREAM_CHUNK_SIZE):
+                        dst.write(view[start:start + ZIP_STREAM_CHUNK_SIZE])
+                        data = sink.drain()
+                        if data:
+                            yield data
+                else:
+                    with open(file_path, 'rb') as src:
+                        while True:
+                            chunk = src.read(ZIP_STREAM_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            dst.write(chunk)
+                            data = sink.drain()
+                            if data:
+                                yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # 中央目录在关闭时写出
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def stream_zip_from_directory(source_dir: Path, arcname_prefix: str = '') -> Iterator[bytes]:
+    """
+    将目录流式打包为ZIP（用于 StreamingHttpResponse）
+
+    Args:
+        source_dir: 源目录路径
+        arcname_prefix: 压缩包内文件名的前缀
+
+    Returns:
+        ZIP字节块生成器
+    """
+    def entries():
+        for file_path in _iter_files(source_dir):
+            file_name = os.path.basename(file_path)
+            yield file_path, f"{arcname_prefix}/{file_name}" if arcname_prefix else file_name
+
+    return _stream_zip(entries())
+
+
+def find_missing_items(spider_files_dir: Path, item_ids: List[str]) -> List[str]:
+    """返回不存在对应文件夹的item_id列表"""
+    return [item_id for item_id in item_ids
+            if not os.path.isdir(spider_files_dir / str(item_id))]
+
+
+def stream_batch_zip(spider_files_dir: Path, item_ids: List[str]) -> Iterator[bytes]:
+    """
+    批量流式打包多个item文件夹（不存在的item_id跳过）
+
+    Args:
+        spider_files_dir: 爬虫文件目录 (e.g., data/nhsa/nhsa_files)
+        item_ids: 要打包的item_id列表
+
+    Returns:
+        ZIP字节块生成器
+    """
+    prefix_len = len(os.fspath(spider_files_dir)) + 1
+
+    def entries():
+        for item_id in item_ids:
+            item_dir = spider_files_dir / str(item_id)
+            if item_dir.is_dir():
+                for file_path in _iter_files(item_dir):
+                    yield file_path, file_path[prefix_len:].replace(os.sep, '/')
+
+    return _stream_zip(entries(), prefetch=True)
+
+
 def get_file_size_str(size_bytes: int) -> str:
     """
     格式化文件大小
@@ -2,43 +2,575 @@
 爬虫日志管理器 - 将日志写入到logs文件夹
 """
 
+import atexit
 import json
+import mmap
 import os
+import shutil
+import sys
 import threading
-from datetime import datetime
+import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# 日志目录（项目根目录下的 logs），导入时解析并创建一次
+_LOGS_DIR = Path(__file__).resolve().parent.parent.parent / 'logs'
+_LOGS_DIR.mkdir(exist_ok=True)
+
+# 异步写入队列容量、单批最大条数/字节数与写线程空闲等待间隔（秒）
+LOG_QUEUE_SIZE = 8192
+LOG_BATCH_SIZE = 1000
+LOG_BATCH_BYTES = 64 * 1024
+LOG_FLUSH_INTERVAL = 0.1
+# 队列满时的处理策略：block（阻塞等待）/ drop_oldest（丢弃最旧）/ drop_newest（丢弃最新）
+LOG_OVERFLOW_POLICY = os.environ.get('SPIDER_LOG_OVERFLOW', 'block')
+
+# 日志级别，低于 SPIDER_LOG_LEVEL 的日志在格式化之前直接丢弃
+_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+LOG_LEVEL = os.environ.get('SPIDER_LOG_LEVEL', 'INFO').upper()
+
+# 日志文件超过 MAX_LOG_BYTES 时轮转为 .1/.2/...，最多保留 LOG_BACKUP_COUNT 个；
+# 写线程每写入 LOG_ROTATE_CHECK_BYTES 字节才 fstat 检查一次文件大小
+MAX_LOG_BYTES = 100 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_ROTATE_CHECK_BYTES = 1024 * 1024
+
+# 是否同时输出到控制台（SPIDER_LOG_STDOUT=0 关闭），开启时也由写线程统一输出
+LOG_STDOUT = os.environ.get('SPIDER_LOG_STDOUT', '1') == '1'
+
+# 紧凑模式（SPIDER_LOG_COMPACT=1）：动作日志只写 details，读取时再生成 message
+LOG_COMPACT = os.environ.get('SPIDER_LOG_COMPACT', '0') == '1'
+
+# 日志文件格式：json（默认，{spider}.log 每行一个 JSON）或 msgpack
+# （{spider}.log.mpk，4字节小端长度 + msgpack 记录，需安装 msgpack，可用 log_dump 转回 JSON）
+LOG_FORMAT = os.environ.get('SPIDER_LOG_FORMAT', 'json').lower()
+_USE_MSGPACK = LOG_FORMAT == 'msgpack' and msgpack is not None
+MSGPACK_SUFFIX = '.log.mpk'
+# 对外公开：日志接口据此决定读取 msgpack 记录文件还是 JSON 行文件
+USE_MSGPACK = _USE_MSGPACK
+
+_STOP = object()
+# 写线程把一批日志合并为一次 writev 提交，生产者不做任何系统调用；
+# io_uring 目前没有稳定维护的 Python 绑定，这里不引入，非 Linux 平台同样退回 os.write
+_HAS_WRITEV = hasattr(os, 'writev')
+# O_APPEND 保证每次 write/writev 原子地追加到文件末尾，写入时无需加锁
+_OPEN_FLAGS = (os.O_WRONLY | os.O_APPEND | os.O_CREAT
+               | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+
+
+_ts_cache = (-1, '')
+
+
+def _now_iso() -> str:
+    """当前本地时间的ISO格式字符串（秒级部分按秒缓存，只拼接微秒）"""
+    global _ts_cache
+    now_ns = time.time_ns()
+    sec, usec = divmod(now_ns // 1000, 1_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))
+        _ts_cache = (sec, prefix)
+    return f'{prefix}.{usec:06d}'
+
+
+def _dumps_line(entry: Dict[str, Any]) -> bytes:
+    """序列化为一行日志（UTF-8 bytes，含换行），优先使用 orjson"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+_encode_str = json.encoder.encode_basestring
+# 读取日志时优先使用 orjson 解析；orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_text(value: Any) -> str:
+    """JSON 字符串转义（不含两端引号），用于填充预序列化模板"""
+    return _encode_str(str(value))[1:-1]
+
+
+# 高频动作日志的 message 模板与 details 字段（True 表示字符串字段，需要 JSON 转义）
+_ACTION_MESSAGES = {
+    'link_collection': '栏目: %(category)s | 当前页: %(current_page)s/%(total_pages)s'
+                       ' | 抓取: %(items_count)s | 入队: %(links_count)s',
+    'detail_crawl': 'Crawl success: %(title)s - %(url)s',
+    'file_download': 'Download file success: %(file_name)s - %(url)s',
+}
+_ACTION_FIELDS = {
+    'link_collection': (('category', True), ('current_page', False), ('total_pages', False),
+                        ('items_count', False), ('links_count', False)),
+    'detail_crawl': (('title', True), ('url', True), ('crawled_count', False), ('total_count', False)),
+    'file_download': (('file_name', True), ('url', True)),
+}
+
+
+def _build_templates(spider_type: str, compact: bool = False) -> Dict[str, str]:
+    """为高频日志方法预生成 JSON 行模板，常量字段只序列化一次（compact 时不含 message）"""
+    sp = _json_text(spider_type).replace('%', '%%')
+    templates = {}
+    for action, fields in _ACTION_FIELDS.items():
+        parts = ['{"timestamp":"%(ts)s","level":"INFO",']
+        if not compact:
+            parts.append('"message":"' + _ACTION_MESSAGES[action] + '",')
+        parts.append('"spider_type":"' + sp + '","details":{')
+        for name, is_str in fields:
+            parts.append(f'"{name}":"%({name})s",' if is_str else f'"{name}":%({name})d,')
+        parts.append(f'"action":"{action}"}}}}\n')
+        templates[action] = ''.join(parts)
+    return templates
+
+
+def expand_log_message(entry: Dict[str, Any]):
+    """为紧凑模式写入的动作日志补全 message"""
+    details = entry.get('details')
+    if isinstance(details, dict):
+        fmt = _ACTION_MESSAGES.get(details.get('action'))
+        if fmt is not None:
+            try:
+                entry['message'] = fmt % details
+            except (KeyError, TypeError, ValueError):
+                pass
+
+
+def _pack_record(entry: Dict[str, Any]) -> bytes:
+    """序列化为一条长度前缀的 msgpack 记录"""
+    payload = msgpack.packb(entry, use_bin_type=True, default=str)
+    return len(payload).to_bytes(4, 'little') + payload
+
+
+def _read_records(path: Path, limit: int = 0) -> List[Dict[str, Any]]:
+    """读取 msgpack 日志的最后 limit 条记录（limit <= 0 时读取全部），忽略末尾不完整的记录"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 先只按长度前缀跳跃定位各条记录，再解包需要的部分
+            offsets = []
+            pos = 0
+            while pos + 4 <= size:
+                length = int.from_bytes(mm[pos:pos + 4], 'little')
+                if pos + 4 + length > size:
+                    break
+                offsets.append(pos)
+                pos += 4 + length
+            if limit > 0:
+                offsets = offsets[-limit:]
+            records = []
+            for pos in offsets:
+                length = int.from_bytes(mm[pos:pos + 4], 'little')
+                records.append(msgpack.unpackb(mm[pos + 4:pos + 4 + length], raw=False))
+    return records
+
+
+def read_log_records(path: Union[str, Path], limit: int = 0) -> List[Dict[str, Any]]:
+    """读取 msgpack 日志记录（供日志接口使用），文件不存在时返回空列表"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    return _read_records(path, limit)
+
+
+def log_dump(src: Union[str, Path], dst: Union[str, Path, None] = None) -> int:
+    """把 msgpack 格式的日志转换为 JSON 行（dst 为空时输出到标准输出），返回记录条数"""
+    if msgpack is None:
+        raise RuntimeError('msgpack 未安装，无法读取 msgpack 格式日志')
+    records = _read_records(Path(src))
+    data = b''.join(_dumps_line(entry) for entry in records)
+    if dst is None:
+        sys.stdout.write(data.decode('utf-8'))
+    else:
+        with open(dst, 'wb') as f:
+            f.write(data)
+    return len(records)
+
+
+def _tail_lines(path: Path, limit: int, chunk_size: int = 64 * 1024) -> List[str]:
+    """从文件末尾向前分块读取，返回最后 limit 行（limit <= 0 时返回全部行）"""
+    with open(path, 'rb') as f:
+        if limit <= 0:
+            data = f.read()
+        else:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            chunks = []
+            newlines = 0
+            # 末尾换行不计入行数，需要多读到 limit + 1 个换行才能确定第一行完整
+            while pos > 0 and newlines <= limit:
+                step = min(chunk_size, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b'\n')
+            data = b''.join(reversed(chunks))
+
+    lines = data.split(b'\n')
+    if lines and not lines[-1]:
+        lines.pop()
+    if limit > 0:
+        lines = lines[-limit:]
+    return [line.decode('utf-8', errors='replace') for line in lines]
+
+
+def _filtered_tail_lines(path: Path, limit: int, token: bytes, need_message: bool = False) -> List[str]:
+    """在最后 limit 行内用 mmap 跳跃查找 token，只返回可能命中的行
+
+    结果是 _tail_lines 的子集：跳过的行都以 '{' 开头且不含 token（need_message 时
+    还要求含 "message" 字段），无法确认的区间整段交回调用方逐行判断。
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = size
+            start = 0
+            if limit > 0:
+                pos = end - 1 if mm[end - 1] == 0x0A else end
+                for _ in range(limit):
+                    pos = mm.rfind(b'\n', 0, pos)
+                    if pos < 0:
+                        break
+                start = pos + 1
+
+            lines: List[bytes] = []
+            pos = start
+            while pos < end:
+                idx = mm.find(token, pos, end)
+                line_start = end if idx < 0 else max(pos, mm.rfind(b'\n', pos, idx) + 1)
+                if line_start > pos:
+                    gap = mm[pos:line_start]
+                    if gap[-1:] != b'\n':
+                        gap += b'\n'
+                    total = gap.count(b'\n')
+                    skippable = (gap[:1] == b'{') + gap.count(b'\n{') == total
+                    if skippable and need_message:
+                        skippable = gap.count(b'"message":') == total
+                    if not skippable:
+                        lines.extend(gap.split(b'\n')[:-1])
+                if idx < 0:
+                    break
+                line_end = mm.find(b'\n', idx, end)
+                if line_end < 0:
+                    line_end = end
+                lines.append(mm[line_start:line_end])
+                pos = line_end + 1
+
+    return [line.decode('utf-8', errors='replace') for line in lines if line]
+
+
+class _LogDispatcher:
+    """共享的后台写线程
+
+    所有 SpiderLogger 把序列化好的日志行放入同一个多生产者单消费者队列，
+    由唯一的写线程取出后按 spider_type 分组，每个文件一次 writev 写入。
+    """
+
+    def __init__(self):
+        # deque 的 append/popleft 在 GIL 下是原子操作，生产者之间无需争抢锁
+        self.ring: deque = deque()
+        self.stopped = False
+        self.overflow_policy = LOG_OVERFLOW_POLICY
+        self._loggers: Dict[str, 'SpiderLogger'] = {}
+        self._wake = threading.Event()
+        # 阻塞策略下队列满时生产者在此等待，写线程取出一批后唤醒
+        self._space = threading.Condition()
+        self._space_waiters = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def register(self, logger: 'SpiderLogger'):
+        """登记日志实例，关闭时统一释放其文件描述符"""
+        self._loggers[logger.spider_type] = logger
+
+    def submit(self, logger: 'SpiderLogger', data: bytes, console: Optional[str] = None):
+        """提交一行日志，队列满时按 overflow_policy 处理"""
+        self._ensure_thread()
+        ring = self.ring
+        if len(ring) >= LOG_QUEUE_SIZE:
+            policy = self.overflow_policy
+            if policy == 'drop_newest':
+                return
+            if policy == 'drop_oldest':
+                try:
+                    ring.popleft()
+                except IndexError:
+                    pass
+            else:
+                self._wait_for_space()
+        self._put((logger, data, console))
+
+    def _wait_for_space(self):
+        """阻塞直到写线程腾出队列空间（或写线程已停止）"""
+        with self._space:
+            self._space_waiters += 1
+            try:
+                while len(self.ring) >= LOG_QUEUE_SIZE and not self.stopped:
+                    self._space.wait(LOG_FLUSH_INTERVAL)
+            finally:
+                self._space_waiters -= 1
+
+    def _notify_space(self):
+        """唤醒因队列满而等待的生产者（没有等待者时不加锁）"""
+        if self._space_waiters:
+            with self._space:
+                self._space.notify_all()
+
+    def flush(self, timeout: float = 5):
+        """等待队列中已提交的日志写入文件"""
+        thread = self._thread
+        if thread is not None and thread.is_alive() and not self.stopped \
+                and thread is not threading.current_thread():
+            done = threading.Event()
+            self._put(done)
+            done.wait(timeout)
+
+    def shutdown(self):
+        """停止写线程（写完队列中剩余日志），并关闭所有日志文件"""
+        thread = self._thread
+        if thread is not None and thread.is_alive() and not self.stopped:
+            self._put(_STOP)
+            thread.join(timeout=5)
+        self.stopped = True
+        self._notify_space()
+        for logger in list(self._loggers.values()):
+            logger.close()
+
+    def _put(self, item):
+        """放入队列，写线程空闲时唤醒它"""
+        self.ring.append(item)
+        if not self._wake.is_set():
+            self._wake.set()
+
+    def _ensure_thread(self):
+        """按需启动写线程"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name='spider-log-writer', daemon=True)
+                thread.start()
+                self._thread = thread
+                atexit.register(self.shutdown)
+
+    def _run(self):
+        """写线程：批量取出日志，按文件合并写入"""
+        ring = self.ring
+        running = True
+        while running:
+            if not ring:
+                self._wake.wait(LOG_FLUSH_INTERVAL)
+                self._wake.clear()
+            batch = []
+            batch_bytes = 0
+            while len(batch) < LOG_BATCH_SIZE and batch_bytes < LOG_BATCH_BYTES:
+                try:
+                    item = ring.popleft()
+                except IndexError:
+                    break
+                batch.append(item)
+                if isinstance(item, tuple):
+                    batch_bytes += len(item[1])
+            if batch:
+                self._notify_space()
+
+            pending: Dict['SpiderLogger', List[bytes]] = {}
+            console: List[str] = []
+            for item in batch:
+                if item is _STOP:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    self._write_pending(pending, console)
+                    item.set()
+                else:
+                    logger, data, text = item
+                    pending.setdefault(logger, []).append(data)
+                    if text is not None:
+                        console.append(text)
+            self._write_pending(pending, console)
+
+    @staticmethod
+    def _write_pending(pending: Dict['SpiderLogger', List[bytes]], console: List[str]):
+        for logger, chunks in pending.items():
+            logger._write_chunks(chunks)
+            logger._bytes_since_check += sum(map(len, chunks))
+            if logger._bytes_since_check >= LOG_ROTATE_CHECK_BYTES:
+                logger._maybe_rotate()
+        pending.clear()
+        if console:
+            try:
+                sys.stdout.write('\n'.join(console) + '\n')
+                sys.stdout.flush()
+            except Exception:
+                pass
+            console.clear()
+
+
+_DISPATCHER = _LogDispatcher()
 
 
 class SpiderLogger:
-    """爬虫日志管理器"""
+    """爬虫日志管理器
+    
+    日志条目在调用线程中序列化后交给共享的 _LogDispatcher，由后台写线程
+    批量写入文件并输出到控制台，调用方不再等待磁盘I/O。
+    """
 
     _instances: Dict[str, 'SpiderLogger'] = {}
-    _lock = threading.Lock()
 
     def __new__(cls, spider_type: str):
-        if spider_type not in cls._instances:
-            with cls._lock:
-                if spider_type not in cls._instances:
-                    cls._instances[spider_type] = super().__new__(cls)
-                    cls._instances[spider_type]._initialized = False
-        return cls._instances[spider_type]
+        instance = cls._instances.get(spider_type)
+        if instance is None:
+            # dict.setdefault 在 GIL 下是原子操作，并发创建时只有一个实例会被保留
+            instance = super().__new__(cls)
+            instance._initialized = False
+            instance = cls._instances.setdefault(spider_type, instance)
+        return instance
 
     def __init__(self, spider_type: str):
         if self._initialized:
             return
         self.spider_type = spider_type
-        self._logs_dir = Path(__file__).resolve().parent.parent.parent / 'logs'
-        self._logs_dir.mkdir(exist_ok=True)
-        self._log_file = self._logs_dir / f'{spider_type}.log'
-        self._log_file.touch(exist_ok=True)
+        self._logs_dir = _LOGS_DIR
+        self._binary = _USE_MSGPACK
+        self._log_file = _LOGS_DIR / (spider_type + (MSGPACK_SUFFIX if self._binary else '.log'))
         self._initialized = True
-        self._write_lock = threading.Lock()
+        self._fd = os.open(str(self._log_file), _OPEN_FLAGS, 0o644)
+        self._closed = False
+        self._bytes_since_check = 0
+        self._min_level = _LEVELS.get(LOG_LEVEL, _LEVELS['INFO'])
+        self._stdout_enabled = LOG_STDOUT
+        self._compact = LOG_COMPACT
+        # msgpack 格式不使用 JSON 行模板
+        self._templates = None if self._binary else _build_templates(spider_type, self._compact)
+        _DISPATCHER.register(self)
+
+    @classmethod
+    def shutdown(cls):
+        """停止后台写线程（写完队列中剩余日志），并关闭所有日志文件"""
+        _DISPATCHER.shutdown()
+
+    # ============ 文件操作 ============
+
+    def _write_bytes(self, data: bytes):
+        """直接追加写入（O_APPEND，无需加锁），处理部分写入"""
+        if self._closed:
+            return
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+        except Exception as e:
+            print(f"[Logger] 写入日志失败: {e}")
+
+    def _write_chunks(self, chunks: List[bytes]):
+        """一次系统调用写入多条日志（os.writev），处理部分写入"""
+        if not _HAS_WRITEV or len(chunks) == 1:
+            self._write_bytes(b''.join(chunks))
+            return
+        if self._closed:
+            return
+        try:
+            fd = self._fd
+            while chunks:
+                written = os.writev(fd, chunks)
+                while chunks and written >= len(chunks[0]):
+                    written -= len(chunks[0])
+                    chunks = chunks[1:]
+                if chunks and written:
+                    chunks = [chunks[0][written:]] + chunks[1:]
+        except Exception as e:
+            print(f"[Logger] 写入日志失败: {e}")
+
+    def _maybe_rotate(self):
+        """文件超过 MAX_LOG_BYTES 时轮转（仅由写线程调用）
+
+        Windows 下仍被打开的文件无法重命名，先关闭自身的描述符再轮转；
+        其他进程（如日志接口）占用文件导致重命名失败时，改为复制后截断
+        """
+        self._bytes_since_check = 0
+        if self._closed:
+            return
+        try:
+            if os.fstat(self._fd).st_size < MAX_LOG_BYTES:
+                return
+        except OSError as e:
+            print(f"[Logger] 日志轮转失败: {e}")
+            return
+        path = str(self._log_file)
+        os.close(self._fd)
+        try:
+            if LOG_BACKUP_COUNT > 0:
+                for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+                    src = f'{path}.{i}'
+                    if os.path.exists(src):
+                        os.replace(src, f'{path}.{i + 1}')
+                os.replace(path, f'{path}.1')
+            else:
+                os.unlink(path)
+        except PermissionError:
+            self._copy_truncate(path)
+        except OSError as e:
+            print(f"[Logger] 日志轮转失败: {e}")
+        try:
+            self._fd = os.open(path, _OPEN_FLAGS, 0o644)
+        except OSError as e:
+            # 描述符已关闭，不能再写入旧的描述符号
+            self._closed = True
+            print(f"[Logger] 重新打开日志文件失败: {e}")
+
+    def _copy_truncate(self, path: str):
+        """复制当前日志为备份后原地截断，复制或截断失败时等下次检查再重试"""
+        try:
+            if LOG_BACKUP_COUNT > 0:
+                shutil.copyfile(path, f'{path}.1')
+            with open(path, 'r+b') as f:
+                f.truncate(0)
+        except OSError as e:
+            print(f"[Logger] 日志轮转失败，下次检查时重试: {e}")
+
+    def flush(self):
+        """等待队列中已提交的日志写入文件"""
+        _DISPATCHER.flush()
+
+    def close(self):
+        """关闭日志文件"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            os.close(self._fd)
+        except Exception as e:
+            print(f"[Logger] 关闭日志失败: {e}")
+
+    def set_level(self, level: str):
+        """设置最低输出级别"""
+        self._min_level = _LEVELS.get(level.upper(), _LEVELS['INFO'])
+
+    def is_enabled_for(self, level: str) -> bool:
+        """判断指定级别的日志是否会被输出"""
+        return _LEVELS.get(level.upper(), 0) >= self._min_level
 
     def _format_entry(self, level: str, message: str, **kwargs) -> Dict[str, Any]:
         """格式化日志条目"""
         entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_iso(),
             'level': level,
             'message': message,
             'spider_type': self.spider_type
@@ -47,133 +579,193 @@ class SpiderLogger:
             entry['details'] = kwargs
         return entry
 
-    def _write_to_file(self, entry: Dict[str, Any]):
-        """写入日志文件"""
-        with self._write_lock:
-            try:
-                with open(self._log_file, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
-            except Exception as e:
-                print(f"[Logger] 写入日志失败: {e}")
+    def _write_to_file(self, entry: Dict[str, Any], console: Optional[str] = None):
+        """序列化日志条目并提交给后台写线程（console 为同时输出到控制台的文本）"""
+        self._write_line(_pack_record(entry) if self._binary else _dumps_line(entry), console)
+
+    def _write_line(self, data: bytes, console: Optional[str] = None):
+        """提交一行已序列化的日志"""
+        if _DISPATCHER.stopped:
+            self._write_bytes(data)
+            if console is not None and self._stdout_enabled:
+                print(console)
+            return
+        _DISPATCHER.submit(self, data, console)
 
     def info(self, message: str, **kwargs):
         """ INFO级别日志 """
+        if self._min_level > 20:
+            return
         entry = self._format_entry('INFO', message, **kwargs)
-        self._write_to_file(entry)
-        print(f"[INFO] {message}")
+        self._write_to_file(entry, f"[INFO] {message}" if self._stdout_enabled else None)
 
     def warning(self, message: str, **kwargs):
         """ WARNING级别日志 """
+        if self._min_level > 30:
+            return
         entry = self._format_entry('WARNING', message, **kwargs)
-        self._write_to_file(entry)
-        print(f"[WARNING] {message}")
+        self._write_to_file(entry, f"[WARNING] {message}" if self._stdout_enabled else None)
 
     def error(self, message: str, **kwargs):
         """ ERROR级别日志 """
+        if self._min_level > 40:
+            return
         entry = self._format_entry('ERROR', message, **kwargs)
-        self._write_to_file(entry)
-        print(f"[ERROR] {message}")
+        self._write_to_file(entry, f"[ERROR] {message}" if self._stdout_enabled else None)
 
     def debug(self, message: str, **kwargs):
         """ DEBUG级别日志 """
+        if self._min_level > 10:
+            return
         entry = self._format_entry('DEBUG', message, **kwargs)
-        self._write_to_file(entry)
-        print(f"[DEBUG] {message}")
+        self._write_to_file(entry, f"[DEBUG] {message}" if self._stdout_enabled else None)
+
+    def _log_action(self, action: str, fields: Dict[str, Any], console_prefix: str = ''):
+        """按预生成模板写入动作日志，字段类型不符时退回通用序列化"""
+        message = None
+        if not self._compact or self._stdout_enabled:
+            message = _ACTION_MESSAGES[action] % fields
+        console = console_prefix + message if self._stdout_enabled else None
+        values = {'ts': _now_iso()}
+        for name, is_str in () if self._templates is None else _ACTION_FIELDS[action]:
+            value = fields[name]
+            if is_str:
+                if not isinstance(value, str):
+                    break
+                value = _json_text(value)
+            values[name] = value
+        else:
+            try:
+                if self._templates is None:
+                    raise TypeError
+                line = self._templates[action] % values
+                self._write_line(line.encode('utf-8'), console)
+                return
+            except TypeError:
+                pass
+        entry = {'timestamp': values['ts'], 'level': 'INFO'}
+        if not self._compact:
+            entry['message'] = message
+        entry['spider_type'] = self.spider_type
+        entry['details'] = dict(fields, action=action)
+        self._write_to_file(entry, console)
 
     def link_collection(self, category: str, current_page: int, total_pages: int, 
                        items_count: int, links_count: int):
         """记录翻页抓取链接日志"""
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'level': 'INFO',
-            'message': f'栏目: {category} | 当前页: {current_page}/{total_pages} | 抓取: {items_count} | 入队: {links_count}',
-            'spider_type': self.spider_type,
-            'details': {
-                'category': category,
-                'current_page': current_page,
-                'total_pages': total_pages,
-                'items_count': items_count,
-                'links_count': links_count,
-                'action': 'link_collection'
-            }
-        }
-        self._write_to_file(entry)
-        print(f"[翻页] 栏目: {category} | 当前页: {current_page}/{total_pages} | 抓取: {items_count} | 入队: {links_count}")
+        if self._min_level > 20:
+            return
+        self._log_action('link_collection', {
+            'category': category,
+            'current_page': current_page,
+            'total_pages': total_pages,
+            'items_count': items_count,
+            'links_count': links_count,
+        }, '[翻页] ')
 
     def detail_crawl(self, title: str, url: str, crawled_count: int, total_count: int):
         """记录详情页爬取成功日志"""
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'level': 'INFO',
-            'message': f'Crawl success: {title} - {url}',
-            'spider_type': self.spider_type,
-            'details': {
-                'title': title,
-                'url': url,
-                'crawled_count': crawled_count,
-                'total_count': total_count,
-                'action': 'detail_crawl'
-            }
-        }
-        self._write_to_file(entry)
-        print(f'Crawl success: {title} - {url}')
+        if self._min_level > 20:
+            return
+        self._log_action('detail_crawl', {
+            'title': title,
+            'url': url,
+            'crawled_count': crawled_count,
+            'total_count': total_count,
+        })
 
     def file_download(self, file_name: str, dl_url: str):
         """记录文件下载成功日志"""
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'level': 'INFO',
-            'message': f'Download file success: {file_name} - {dl_url}',
-            'spider_type': self.spider_type,
-            'details': {
-                'file_name': file_name,
-                'url': dl_url,
-                'action': 'file_download'
-            }
-        }
-        self._write_to_file(entry)
-        print(f'Download file success: {file_name} - {dl_url}')
+        if self._min_level > 20:
+            return
+        self._log_action('file_download', {
+            'file_name': file_name,
+            'url': dl_url,
+        })
 
     def get_logs(self, limit: int = 100, level: str = None, keyword: str = None) -> List[Dict[str, Any]]:
         """读取日志"""
         if not self._log_file.exists():
             return []
 
+        self.flush()
+        if self._binary:
+            return self._get_binary_logs(limit, level, keyword)
         logs = []
+        append = logs.append
+        loads = _json_loads
+        decode_error = json.JSONDecodeError
+        want_level = level.upper() if level else None
+        # 原始行预筛选：级别值带引号出现在行内；关键字不含需转义字符时也可直接在原始行中查找
+        level_token = f'"{want_level}"' if want_level else None
+        raw_keyword = keyword if keyword and keyword.isprintable() \
+            and not any(c in keyword for c in '"\\') else None
         try:
-            with open(self._log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                recent_lines = lines[-limit:] if len(lines) > limit else lines
-
-                for line in recent_lines:
-                    line = line.strip()
-                    if not line:
+            # 有筛选条件时用 mmap 跳过不可能命中的行，只解码候选行
+            if raw_keyword is not None:
+                lines = _filtered_tail_lines(self._log_file, limit, raw_keyword.encode('utf-8'), True)
+            elif level_token is not None:
+                lines = _filtered_tail_lines(self._log_file, limit, level_token.encode('utf-8'))
+            else:
+                lines = _tail_lines(self._log_file, limit)
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                if line[0] == '{':
+                    if level_token is not None and level_token not in line:
+                        continue
+                    # 紧凑模式的行没有 message，关键字可能出现在读取时生成的 message 中
+                    if raw_keyword is not None and raw_keyword not in line and '"message"' in line:
                         continue
 
-                    try:
-                        log_entry = json.loads(line)
-                        if level and log_entry.get('level', '').upper() != level.upper():
-                            continue
-                        if keyword and keyword not in log_entry.get('message', ''):
-                            continue
-                        logs.append(log_entry)
-                    except json.JSONDecodeError:
-                        logs.append({
-                            'message': line,
-                            'raw': True,
-                            'timestamp': None,
-                            'level': 'UNKNOWN'
-                        })
+                try:
+                    log_entry = loads(line)
+                    if 'message' not in log_entry:
+                        expand_log_message(log_entry)
+                    if want_level and log_entry.get('level', '').upper() != want_level:
+                        continue
+                    if keyword and keyword not in log_entry.get('message', ''):
+                        continue
+                    append(log_entry)
+                except decode_error:
+                    append({
+                        'message': line,
+                        'raw': True,
+                        'timestamp': None,
+                        'level': 'UNKNOWN'
+                    })
         except Exception as e:
             print(f"[Logger] 读取日志失败: {e}")
 
         return logs
 
+    def _get_binary_logs(self, limit: int, level: str = None, keyword: str = None) -> List[Dict[str, Any]]:
+        """读取 msgpack 格式日志"""
+        want_level = level.upper() if level else None
+        logs = []
+        try:
+            for log_entry in _read_records(self._log_file, limit):
+                if 'message' not in log_entry:
+                    expand_log_message(log_entry)
+                if want_level and log_entry.get('level', '').upper() != want_level:
+                    continue
+                if keyword and keyword not in log_entry.get('message', ''):
+                    continue
+                logs.append(log_entry)
+        except Exception as e:
+            print(f"[Logger] 读取日志失败: {e}")
+        return logs
+
     def clear_logs(self) -> bool:
         """清空日志文件"""
         try:
-            with open(self._log_file, 'w', encoding='utf-8') as f:
-                f.write('')
+            self.flush()
+            if self._closed:
+                with open(self._log_file, 'w', encoding='utf-8') as f:
+                    f.write('')
+            else:
+                os.ftruncate(self._fd, 0)
             return True
         except Exception as e:
             print(f"[Logger] 清空日志失败: {e}")
@@ -183,3 +775,11 @@ class SpiderLogger:
 def get_spider_logger(spider_type: str) -> SpiderLogger:
     """获取指定爬虫的日志管理器"""
     return SpiderLogger(spider_type)
+
+
+if __name__ == '__main__':
+    # python -m spiders.logger <spider.log.mpk> [output.log]：把 msgpack 日志转换为 JSON 行
+    if len(sys.argv) < 2:
+        print('用法: python -m spiders.logger <spider.log.mpk> [output.log]')
+        sys.exit(1)
+    log_dump(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
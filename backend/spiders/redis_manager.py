@@ -3,13 +3,192 @@ Redis管理器 - 统一管理爬虫相关的Redis操作
 优化键设计，减少键数量，将相关数据合并到一张表中
 """
 
+import functools
+import hashlib
 import json
+import os
+import socket
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 import redis
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any):
+    """序列化队列/错误/检查点数据，优先使用 orjson（返回UTF-8字节，不转义中文）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _loads(data: Any) -> Any:
+    """解析 _dumps 写入的数据（str 或 bytes）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# (秒级时间戳, ISO字符串)，以元组整体替换，多线程读写无需加锁
+_iso_cache = (0, '')
+
+
+def _now_iso() -> str:
+    """当前时间的ISO字符串（按秒缓存，避免每次写入都创建 datetime）"""
+    global _iso_cache
+    ts = int(time.time())
+    cached_ts, text = _iso_cache
+    if ts != cached_ts:
+        text = datetime.fromtimestamp(ts).isoformat()
+        _iso_cache = (ts, text)
+    return text
+
+# 增量统计脚本：KEYS[1]=stats 表，KEYS[2]=栏目计数表
+# ARGV: 是否新增item(1/0)、类别、发布日期、文件数增量、已爬取数增量、更新时间
+_STATS_INCR_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    local old = redis.call('HGET', KEYS[1], 'categories')
+    if old then
+        for k, v in pairs(cjson.decode(old)) do
+            redis.call('HSET', KEYS[2], k, v)
+        end
+        redis.call('HDEL', KEYS[1], 'categories')
+    end
+end
+if ARGV[1] == '1' then
+    redis.call('HINCRBY', KEYS[1], 'total_items', 1)
+    redis.call('HINCRBY', KEYS[2], ARGV[2], 1)
+    local d = ARGV[3]
+    if d ~= '' then
+        local earliest = redis.call('HGET', KEYS[1], 'date_earliest')
+        if not earliest or earliest == '' or d < earliest then
+            redis.call('HSET', KEYS[1], 'date_earliest', d)
+        end
+        local latest = redis.call('HGET', KEYS[1], 'date_latest')
+        if not latest or latest == '' or d > latest then
+            redis.call('HSET', KEYS[1], 'date_latest', d)
+        end
+    end
+end
+local fields = {'file_count', 'crawled_count'}
+for i = 1, 2 do
+    local delta = tonumber(ARGV[3 + i])
+    if delta ~= 0 then
+        if redis.call('HINCRBY', KEYS[1], fields[i], delta) < 0 then
+            redis.call('HSET', KEYS[1], fields[i], 0)
+        end
+    end
+end
+redis.call('HSET', KEYS[1], 'last_update', ARGV[6])
+return 1
+"""
+
+
+# 爬虫键名后缀的短名（键名随每条命令发送，短名减少网络字节）；
+# 旧的长键名在首次使用时通过 RENAMENX 迁移
+_KEY_SHORT = {
+    'state': 'st',
+    'progress': 'pg',
+    'pagination': 'pn',
+    'visited_urls': 'v',
+    'visited_bloom': 'vb',
+    'visited_cuckoo': 'vcf',
+    'visited_count': 'vc',
+    'crawled_urls': 'c',
+    'empty_content_urls': 'em',
+    'url_queue': 'uq',
+    'url_queue_list': 'uql',
+    'links_queue': 'lq',
+    'links_processing': 'lp',
+    'stats': 's',
+    'stats:categories': 's:cat',
+    'stats:file_types': 's:ft',
+    'errors': 'e',
+    'errors_stream': 'es',
+    'checkpoint': 'cp',
+    'status_version': 'sv',
+}
+
+
+# 标记已访问脚本：KEYS[1]=当月 visited 集合，KEYS[2]=状态表，KEYS[3..]=更早的月份桶
+# ARGV[1]=当月桶过期秒数（0 表示不过期），ARGV[2..]=URL列表
+# 已在旧桶中的URL用 SMOVE 移到当月桶（不算新增）；新增时同步维护状态表中的 visited_count，
+# 状态表没有计数时用各桶 SCARD 之和初始化
+_MARK_VISITED_LUA = """
+local added = 0
+for i = 2, #ARGV do
+    if redis.call('SISMEMBER', KEYS[1], ARGV[i]) == 0 then
+        local moved = false
+        for k = 3, #KEYS do
+            if redis.call('SMOVE', KEYS[k], KEYS[1], ARGV[i]) == 1 then
+                moved = true
+                break
+            end
+        end
+        if not moved then
+            added = added + redis.call('SADD', KEYS[1], ARGV[i])
+        end
+    end
+end
+if ARGV[1] ~= '0' then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+if redis.call('HEXISTS', KEYS[2], 'visited_count') == 0 then
+    local total = redis.call('SCARD', KEYS[1])
+    for k = 3, #KEYS do
+        total = total + redis.call('SCARD', KEYS[k])
+    end
+    redis.call('HSET', KEYS[2], 'visited_count', total)
+elseif added > 0 then
+    redis.call('HINCRBY', KEYS[2], 'visited_count', added)
+end
+return added
+"""
+
+# 合并未分桶集合脚本：KEYS[1]=旧集合，KEYS[2]=当月桶，ARGV[1]=过期秒数
+# 当月桶不存在时直接 RENAME（O(1)），否则 SUNIONSTORE 合并后删除旧集合
+_MERGE_INTO_BUCKET_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('RENAME', KEYS[1], KEYS[2])
+else
+    redis.call('SUNIONSTORE', KEYS[2], KEYS[2], KEYS[1])
+    redis.call('DEL', KEYS[1])
+end
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+# 归还处理中链接脚本：KEYS[1]=处理中列表，KEYS[2]=链接队列
+# 处理中列表头部是最后领取的链接，依次 RPUSH 到队列出口端后最早领取的链接最先被取出
+_RECOVER_LINKS_LUA = """
+local items = redis.call('LRANGE', KEYS[1], 0, -1)
+for i = 1, #items do
+    redis.call('RPUSH', KEYS[2], items[i])
+end
+redis.call('DEL', KEYS[1])
+return #items
+"""
+
+# 概率过滤器命令：(创建, 单个添加, 单个检查, 批量检查, 批量添加)
+_FILTER_COMMANDS = {
+    'bloom': ('BF.RESERVE', 'BF.ADD', 'BF.EXISTS', 'BF.MEXISTS', 'BF.MADD'),
+    'cuckoo': ('CF.RESERVE', 'CF.ADDNX', 'CF.EXISTS', 'CF.MEXISTS', 'CF.INSERTNX'),
+}
+
 
 class RedisManager:
     """Redis管理器单例"""
@@ -18,34 +197,57 @@ class RedisManager:
     _lock = threading.Lock()
 
     def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
+        # 初始化完成后直接返回实例，不再获取锁
+        inst = cls._instance
+        if inst is not None:
+            return inst
+        with cls._lock:
+            if cls._instance is None:
+                inst = super().__new__(cls)
+                inst._initialized = False
+                cls._instance = inst
         return cls._instance
 
+    # 连接池最大连接数
+    MAX_CONNECTIONS = 64
+    # is_connected 的 PING 结果缓存时间（秒）
+    PING_CACHE_TTL = 1.0
+
     def __init__(self):
         if self._initialized:
             return
         self._initialized = True
         self._client = None
+        self._last_ping_ts = 0.0
+        self._last_ping_ok = False
         self._connect()
 
     def _connect(self):
         """建立Redis连接"""
         try:
-            self._client = redis.Redis(
+            # 有上限的阻塞连接池：多线程爬取时每个线程独占一条连接，超出上限时等待而不是无限建连；
+            # redis-py 建立连接时已设置 TCP_NODELAY
+            keepalive_options = {}
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                keepalive_options[socket.TCP_KEEPIDLE] = 30
+            pool = redis.BlockingConnectionPool(
                 host='192.168.1.40',
                 password='1421nbnb',
                 port=6379,
                 db=0,
                 decode_responses=True,
                 socket_timeout=5,
-                socket_connect_timeout=5
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+                socket_keepalive_options=keepalive_options,
+                max_connections=self.MAX_CONNECTIONS,
+                timeout=5
             )
+            self._client = redis.Redis(connection_pool=pool)
             self._client.ping()
-            print("[Redis] 连接成功")
+            # 安装 hiredis 后 redis-py 自动改用C实现的响应解析器
+            parser = 'hiredis' if getattr(redis.utils, 'HIREDIS_AVAILABLE', False) else 'python'
+            print(f"[Redis] 连接成功 (parser: {parser})")
         except redis.ConnectionError as e:
             print(f"[Redis] 连接失败: {e}")
             self._client = None
@@ -55,14 +257,19 @@ class RedisManager:
 
     @property
     def is_connected(self) -> bool:
-        """检查是否已连接"""
+        """检查是否已连接（PING 结果缓存 PING_CACHE_TTL 秒）"""
         if not self._client:
             return False
+        now = time.monotonic()
+        if now - self._last_ping_ts <= self.PING_CACHE_TTL:
+            return self._last_ping_ok
         try:
             self._client.ping()
-            return True
+            self._last_ping_ok = True
         except Exception:
-            return False
+            self._last_ping_ok = False
+        self._last_ping_ts = now
+        return self._last_ping_ok
 
     def get_client(self) -> Optional[redis.Redis]:
         """获取Redis客户端"""
@@ -72,35 +279,159 @@ class RedisManager:
 class SpiderRedisManager:
     """爬虫专用Redis管理器 - 优化键设计，减少键数量"""
 
+    # URL去重可选用 RedisBloom 布隆过滤器（SPIDER_REDIS_BLOOM=1），约 1‰ 误判率换取远小于SET的内存；
+    # SPIDER_REDIS_BLOOM=cuckoo 时使用布谷鸟过滤器
+    USE_BLOOM = os.environ.get('SPIDER_REDIS_BLOOM', '0') in ('1', 'cuckoo')
+    FILTER_TYPE = 'cuckoo' if os.environ.get('SPIDER_REDIS_BLOOM') == 'cuckoo' else 'bloom'
+    BLOOM_ERROR_RATE = 0.001
+    BLOOM_CAPACITY = 10_000_000
+    # 去重集合中存放 URL 的 8 字节 blake2b 摘要而不是完整 URL（SPIDER_REDIS_HASH_URLS=1）；
+    # 与已有的原始 URL 集合不兼容，切换后需要清理去重数据
+    HASH_URLS = os.environ.get('SPIDER_REDIS_HASH_URLS', '0') == '1'
+    # SET 去重（visited/crawled）按月分桶（SPIDER_REDIS_VISITED_MONTHS，默认12）：写入当月桶，
+    # 检查最近N个月的桶，命中旧桶的URL移到当月桶，N个月未再出现的URL随旧桶过期删除；
+    # 0 表示使用单个不过期的集合。升级时未分桶的集合合并到当月桶
+    VISITED_MONTHS = int(os.environ.get('SPIDER_REDIS_VISITED_MONTHS', '12'))
+    # 进程内缓存的已访问URL数量上限（只缓存确认已访问的URL）
+    VISITED_LOCAL_SIZE = 100_000
+    # 错误流保留的最近错误条数（近似裁剪）
+    ERRORS_MAXLEN = 100
+
     def __init__(self, spider_type: str):
         self.spider_type = spider_type
         self.rm = RedisManager()
+        # 单例的客户端在连接建立后不再变化，直接缓存引用
+        self._client = self.rm.get_client()
         self._prefix = f'spider:{spider_type}'
-        self._state_key = f'{self._prefix}:state'
-        self._progress_key = f'{self._prefix}:progress'
-        self._pagination_key = f'{self._prefix}:pagination'
+        self._state_key = self._key('state')
+        self._progress_key = self._key('progress')
+        self._pagination_key = self._key('pagination')
+        # 热路径上使用的键名在初始化时一次生成
+        self._visited_key = self._key('visited_urls')
+        self._visited_bloom_key = self._key('visited_bloom')
+        self._visited_cuckoo_key = self._key('visited_cuckoo')
+        self._visited_count_key = self._key('visited_count')
+        self._crawled_key = self._key('crawled_urls')
+        self._empty_content_key = self._key('empty_content_urls')
+        self._queue_key = self._key('url_queue')
+        self._queue_list_key = self._key('url_queue_list')
+        self._links_queue_key = self._key('links_queue')
+        self._links_processing_key = self._key('links_processing')
+        self._stats_key = self._key('stats')
+        self._categories_key = self._key('stats:categories')
+        self._file_types_key = self._key('stats:file_types')
+        self._errors_key = self._key('errors')
+        self._errors_stream_key = self._key('errors_stream')
+        self._checkpoint_key = self._key('checkpoint')
+        self._status_version_key = self._key('status_version')
+        self._scripts: Dict[str, Any] = {}
+        self._use_bloom = self.USE_BLOOM
+        self._bloom_ready = False
+        self._filter_cmds = _FILTER_COMMANDS[self.FILTER_TYPE]
+        self._filter_key = (self._visited_cuckoo_key if self.FILTER_TYPE == 'cuckoo'
+                            else self._visited_bloom_key)
+        self._hash_urls = self.HASH_URLS
+        self._bucket_months = max(self.VISITED_MONTHS, 0)
+        # 当月桶在最后一次写入后至少保留到窗口结束
+        self._bucket_ttl = self._bucket_months * 31 * 86400
+        self._visited_local: OrderedDict = OrderedDict()
+        self._visited_local_lock = threading.Lock()
+        self._migrate_legacy_keys()
 
     @property
     def client(self) -> Optional[redis.Redis]:
         """获取Redis客户端"""
-        return self.rm.get_client()
+        return self._client
 
     def _key(self, key: str) -> str:
-        """生成带前缀的键名"""
-        return f'{self._prefix}:{key}'
+        """生成带前缀的键名（常用键使用短名）"""
+        return f'{self._prefix}:{_KEY_SHORT.get(key, key)}'
+
+    _migrated_prefixes: Set[str] = set()
+
+    def _migrate_legacy_keys(self):
+        """把旧的长键名重命名为短键名（每个进程每种爬虫只检查一次）"""
+        if self._prefix in self._migrated_prefixes or not self._client:
+            return
+        try:
+            legacy = [(f'{self._prefix}:{name}', self._key(name)) for name in _KEY_SHORT]
+            pipe = self._client.pipeline(transaction=False)
+            for old, _ in legacy:
+                pipe.exists(old)
+            found = [pair for pair, exists in zip(legacy, pipe.execute()) if exists]
+            if found:
+                pipe = self._client.pipeline(transaction=False)
+                for old, new in found:
+                    pipe.renamenx(old, new)
+                pipe.execute()
+            if self._bucket_months:
+                merge = self._get_script(_MERGE_INTO_BUCKET_LUA)
+                for base in (self._visited_key, self._crawled_key):
+                    merge(keys=[base, self._bucket_keys(base)[0]], args=[self._bucket_ttl])
+            self._migrated_prefixes.add(self._prefix)
+        except Exception as e:
+            print(f"[Redis] 迁移旧键名失败: {e}")
+
+    def _bucket_keys(self, base: str) -> List[str]:
+        """SET 去重的月份桶键名（当月在前）；未开启分桶时只有原集合"""
+        if not self._bucket_months:
+            return [base]
+        now = time.localtime()
+        month = now.tm_year * 12 + now.tm_mon - 1
+        return [f'{base}:{(month - i) // 12}{(month - i) % 12 + 1:02d}'
+                for i in range(self._bucket_months)]
+
+    def _scard_buckets(self, base: str) -> int:
+        """各月份桶的成员数之和（一次流水线）"""
+        pipe = self._client.pipeline(transaction=False)
+        for key in self._bucket_keys(base):
+            pipe.scard(key)
+        return sum(pipe.execute())
+
+    def _smismember_buckets(self, keys: List[str], members: List[Any]) -> List[List[bool]]:
+        """在多个集合中批量检查成员（一次往返），按集合返回结果"""
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key in keys:
+                pipe.smismember(key, members)
+            return [[bool(flag) for flag in flags] for flags in pipe.execute()]
+        except redis.ResponseError:
+            # Redis < 6.2 不支持 SMISMEMBER，退化为流水线 SISMEMBER
+            pipe = self._client.pipeline(transaction=False)
+            for key in keys:
+                for member in members:
+                    pipe.sismember(key, member)
+            flags = [bool(flag) for flag in pipe.execute()]
+            n = len(members)
+            return [flags[i * n:(i + 1) * n] for i in range(len(keys))]
+
+    def _mark_visited_script(self, members: List[Any], client=None):
+        """调用标记已访问脚本，返回新增数量"""
+        keys = self._bucket_keys(self._visited_key)
+        return self._get_script(_MARK_VISITED_LUA)(
+            keys=[keys[0], self._state_key, *keys[1:]],
+            args=[self._bucket_ttl, *members], client=client)
+
+    def _member(self, url: str):
+        """去重集合中的成员：开启 HASH_URLS 时为定长二进制摘要"""
+        if self._hash_urls:
+            return hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+        return url
 
     # ============ 状态管理（合并到state表） ============
 
     def set_status(self, status: str, details: Dict[str, Any] = None) -> bool:
         """设置爬虫状态"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            state = {'status': status, 'updated_at': datetime.now().isoformat()}
+            state = {'status': status, 'updated_at': _now_iso()}
             if details:
                 state.update(details)
-            self.client.hset(self._state_key, mapping=state)
-            self._increment_status_version()
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hset(self._state_key, mapping=state)
+            pipe.incr(self._status_version_key)
+            pipe.execute()
             return True
         except Exception as e:
             print(f"[Redis] 设置状态失败: {e}")
@@ -109,9 +440,9 @@ class SpiderRedisManager:
     def _get_status_version(self) -> int:
         """获取状态版本号"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            version = self.client.get(self._key('status_version'))
+            version = self._client.get(self._status_version_key)
             return int(version) if version else 0
         except Exception:
             return 0
@@ -119,9 +450,9 @@ class SpiderRedisManager:
     def _increment_status_version(self) -> bool:
         """递增状态版本号"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.incr(self._key('status_version'))
+            self._client.incr(self._status_version_key)
             return True
         except Exception:
             return False
@@ -129,17 +460,32 @@ class SpiderRedisManager:
     def get_status(self) -> Dict[str, Any]:
         """获取爬虫状态"""
         try:
-            if not self.client:
+            if not self._client:
                 return {'status': 'unknown', 'error': 'Redis未连接'}
-            state = self.client.hgetall(self._state_key) or {}
+            # 一次流水线取回状态表、计数与版本号（details_crawled 就在状态表中）
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hgetall(self._state_key)
+            use_bloom = self._bloom_enabled()
+            if use_bloom:
+                pipe.get(self._visited_count_key)
+            pipe.llen(self._links_queue_key)
+            pipe.get(self._status_version_key)
+            results = pipe.execute()
+            state = results[0] or {}
+            pending, version = results[-2:]
+            # 已访问数由标记脚本维护在状态表中，旧数据没有计数时才 SCARD
+            visited = results[1] if use_bloom else state.get('visited_count')
+            if visited is None and not use_bloom:
+                visited = self._scard_buckets(self._visited_key)
+            details_crawled = state.get('details_crawled')
             return {
                 'status': state.get('status', 'idle'),
-                'links_collected': self.get_visited_count(),
-                'pending_links': self.get_links_queue_size(),
-                'details_crawled': self.get_details_crawled(),
+                'links_collected': int(visited) if visited else 0,
+                'pending_links': pending or 0,
+                'details_crawled': int(details_crawled) if details_crawled else 0,
                 'updated_at': state.get('updated_at'),
                 'reason': state.get('reason'),
-                'version': self._get_status_version(),
+                'version': int(version) if version else 0,
                 'source': 'redis'
             }
         except Exception as e:
@@ -153,21 +499,21 @@ class SpiderRedisManager:
     def is_paused(self) -> bool:
         """检查爬虫是否暂停"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            return self.client.hget(self._state_key, 'paused') == '1'
+            return self._client.hget(self._state_key, 'paused') == '1'
         except Exception:
             return False
 
     def set_paused(self, paused: bool) -> bool:
         """设置暂停状态"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
             if paused:
-                self.client.hset(self._state_key, 'paused', '1')
+                self._client.hset(self._state_key, 'paused', '1')
             else:
-                self.client.hdel(self._state_key, 'paused')
+                self._client.hdel(self._state_key, 'paused')
             return True
         except Exception as e:
             print(f"[Redis] 设置暂停状态失败: {e}")
@@ -179,14 +525,14 @@ class SpiderRedisManager:
                        errors: int = 0) -> bool:
         """更新爬取进度"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.hset(self._progress_key, mapping={
+            self._client.hset(self._progress_key, mapping={
                 'crawled': str(crawled),
                 'total': str(total),
                 'current_category': current_category,
                 'errors': str(errors),
-                'updated_at': datetime.now().isoformat()
+                'updated_at': _now_iso()
             })
             return True
         except Exception as e:
@@ -196,9 +542,9 @@ class SpiderRedisManager:
     def get_progress(self) -> Dict[str, str]:
         """获取爬取进度"""
         try:
-            if not self.client:
+            if not self._client:
                 return {}
-            return self.client.hgetall(self._progress_key) or {}
+            return self._client.hgetall(self._progress_key) or {}
         except Exception:
             return {}
 
@@ -207,18 +553,18 @@ class SpiderRedisManager:
     def increment_details_crawled(self, count: int = 1) -> int:
         """增加已爬取详情数量"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            return self.client.hincrby(self._state_key, 'details_crawled', count)
+            return self._client.hincrby(self._state_key, 'details_crawled', count)
         except Exception:
             return 0
 
     def get_details_crawled(self) -> int:
         """获取已爬取详情数量"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            value = self.client.hget(self._state_key, 'details_crawled')
+            value = self._client.hget(self._state_key, 'details_crawled')
             return int(value) if value else 0
         except Exception:
             return 0
@@ -226,9 +572,9 @@ class SpiderRedisManager:
     def set_details_crawled(self, count: int) -> bool:
         """设置已爬取详情数量"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.hset(self._state_key, 'details_crawled', str(count))
+            self._client.hset(self._state_key, 'details_crawled', str(count))
             return True
         except Exception:
             return False
@@ -236,18 +582,18 @@ class SpiderRedisManager:
     def increment_error_count(self, count: int = 1) -> int:
         """增加错误计数"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            return self.client.hincrby(self._state_key, 'error_count', count)
+            return self._client.hincrby(self._state_key, 'error_count', count)
         except Exception:
             return 0
 
     def get_error_count(self) -> int:
         """获取错误数量"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            value = self.client.hget(self._state_key, 'error_count')
+            value = self._client.hget(self._state_key, 'error_count')
             return int(value) if value else 0
         except Exception:
             return 0
@@ -257,10 +603,15 @@ class SpiderRedisManager:
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息（从Redis读取）"""
         try:
-            if not self.client:
+            if not self._client:
                 return {}
-            stats_key = self._key('stats')
-            stats = self.client.hgetall(stats_key) or {}
+            stats_key = self._stats_key
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hgetall(stats_key)
+            pipe.hgetall(self._categories_key)
+            pipe.hgetall(self._file_types_key)
+            stats, category_counts, file_type_counts = pipe.execute()
+            stats = stats or {}
             
             result = {
                 'total_items': int(stats.get('total_items', 0)),
@@ -271,8 +622,11 @@ class SpiderRedisManager:
                 'last_update': stats.get('last_update'),
             }
             
+            # 栏目/文件类型计数存放在独立的 hash 中，旧数据仍兼容 stats 表里的 JSON 字段
             categories_json = stats.get('categories')
-            if categories_json:
+            if category_counts:
+                result['categories'] = {k: int(v) for k, v in category_counts.items()}
+            elif categories_json:
                 result['categories'] = json.loads(categories_json)
             else:
                 result['categories'] = {}
@@ -288,7 +642,9 @@ class SpiderRedisManager:
                 result['date_range'] = {'earliest': None, 'latest': None}
             
             file_types_json = stats.get('file_types')
-            if file_types_json:
+            if file_type_counts:
+                result['file_types'] = {k: int(v) for k, v in file_type_counts.items()}
+            elif file_types_json:
                 result['file_types'] = json.loads(file_types_json)
             else:
                 result['file_types'] = {}
@@ -301,9 +657,9 @@ class SpiderRedisManager:
     def set_stats(self, stats: Dict[str, Any]) -> bool:
         """设置统计信息（覆盖更新）"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            stats_key = self._key('stats')
+            stats_key = self._stats_key
             
             data = {
                 'total_items': str(stats.get('total_items', 0)),
@@ -311,11 +667,15 @@ class SpiderRedisManager:
                 'html_count': str(stats.get('html_count', 0)),
                 'crawled_count': str(stats.get('crawled_count', 0)),
                 'visited_urls': str(stats.get('visited_urls', 0)),
-                'last_update': datetime.now().isoformat(),
+                'last_update': _now_iso(),
             }
             
+            categories_key = self._categories_key
+            pipe = self._client.pipeline(transaction=False)
             if stats.get('categories'):
-                data['categories'] = json.dumps(stats['categories'], ensure_ascii=False)
+                pipe.delete(categories_key)
+                pipe.hset(categories_key, mapping=stats['categories'])
+                pipe.hdel(stats_key, 'categories')
             
             if stats.get('date_range'):
                 if stats['date_range'].get('earliest'):
@@ -324,108 +684,264 @@ class SpiderRedisManager:
                     data['date_latest'] = stats['date_range']['latest']
             
             if stats.get('file_types'):
-                data['file_types'] = json.dumps(stats['file_types'], ensure_ascii=False)
+                pipe.delete(self._file_types_key)
+                pipe.hset(self._file_types_key, mapping=stats['file_types'])
+                pipe.hdel(stats_key, 'file_types')
             
-            self.client.hset(stats_key, mapping=data)
+            pipe.hset(stats_key, mapping=data)
+            pipe.execute()
             return True
         except Exception as e:
             print(f"[Redis] 设置统计信息失败: {e}")
             return False
 
+    def _get_script(self, source: str):
+        """获取（按需注册）Lua 脚本，之后通过 EVALSHA 调用"""
+        script = self._scripts.get(source)
+        if script is None or script.registered_client is not self._client:
+            script = self._scripts[source] = self._client.register_script(source)
+        return script
+
+    def _get_stats_script(self):
+        """获取增量统计 Lua 脚本"""
+        return self._get_script(_STATS_INCR_LUA)
+
     def update_stats_incremental(self, item_data: Dict[str, Any] = None, 
                                   file_count_delta: int = 0,
                                   crawled_delta: int = 0) -> bool:
-        """增量更新统计信息（新增item或文件时调用）"""
+        """增量更新统计信息（新增item或文件时调用）
+        
+        读-改-写在 Lua 脚本中原子完成，多个爬虫进程并发更新时不会丢失计数。
+        """
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            stats_key = self._key('stats')
-            
-            current = self.client.hgetall(stats_key) or {}
-            
+            category = ''
+            publish_date = ''
             if item_data:
-                total = int(current.get('total_items', 0)) + 1
-                self.client.hset(stats_key, 'total_items', str(total))
-                
                 category = item_data.get('类别', '未知')
-                categories_json = current.get('categories', '{}')
-                categories = json.loads(categories_json)
-                categories[category] = categories.get(category, 0) + 1
-                self.client.hset(stats_key, 'categories', json.dumps(categories, ensure_ascii=False))
-                
-                publish_date = item_data.get('发布日期') or item_data.get('颁布日期')
-                if publish_date:
-                    date_earliest = current.get('date_earliest')
-                    date_latest = current.get('date_latest')
-                    if not date_earliest or publish_date < date_earliest:
-                        self.client.hset(stats_key, 'date_earliest', publish_date)
-                    if not date_latest or publish_date > date_latest:
-                        self.client.hset(stats_key, 'date_latest', publish_date)
-            
-            if file_count_delta != 0:
-                current_count = int(current.get('file_count', 0))
-                new_count = current_count + file_count_delta
-                self.client.hset(stats_key, 'file_count', str(max(0, new_count)))
-            
-            if crawled_delta != 0:
-                current_crawled = int(current.get('crawled_count', 0))
-                new_crawled = current_crawled + crawled_delta
-                self.client.hset(stats_key, 'crawled_count', str(max(0, new_crawled)))
-            
-            self.client.hset(stats_key, 'last_update', datetime.now().isoformat())
+                publish_date = item_data.get('发布日期') or item_data.get('颁布日期') or ''
+            now = _now_iso()
+            try:
+                self._get_stats_script()(
+                    keys=[self._stats_key, self._categories_key],
+                    args=['1' if item_data else '0', category, publish_date,
+                          int(file_count_delta), int(crawled_delta), now]
+                )
+            except redis.ResponseError as e:
+                # 服务端禁用了 Lua 脚本时退化为 HINCRBY 流水线
+                print(f"[Redis] 统计脚本执行失败，改用流水线更新: {e}")
+                self._update_stats_pipelined(bool(item_data), category, publish_date,
+                                             file_count_delta, crawled_delta, now)
             return True
         except Exception as e:
             print(f"[Redis] 增量更新统计信息失败: {e}")
             return False
 
+    def _update_stats_pipelined(self, new_item: bool, category: str, publish_date: str,
+                                file_count_delta: int, crawled_delta: int, now: str):
+        """不使用 Lua 的增量统计：计数全部用 HINCRBY，只有日期范围需要先读后写"""
+        pipe = self._client.pipeline(transaction=False)
+        if new_item:
+            pipe.hincrby(self._stats_key, 'total_items', 1)
+            pipe.hincrby(self._categories_key, category, 1)
+        if file_count_delta:
+            pipe.hincrby(self._stats_key, 'file_count', file_count_delta)
+        if crawled_delta:
+            pipe.hincrby(self._stats_key, 'crawled_count', crawled_delta)
+        pipe.hset(self._stats_key, 'last_update', now)
+        if new_item and publish_date:
+            pipe.hmget(self._stats_key, ['date_earliest', 'date_latest'])
+        results = pipe.execute()
+        if new_item and publish_date:
+            date_earliest, date_latest = results[-1]
+            updates = {}
+            if not date_earliest or publish_date < date_earliest:
+                updates['date_earliest'] = publish_date
+            if not date_latest or publish_date > date_latest:
+                updates['date_latest'] = publish_date
+            if updates:
+                self._client.hset(self._stats_key, mapping=updates)
+
     def increment_file_count(self, delta: int = 1) -> int:
         """增加文件计数"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            stats_key = self._key('stats')
-            return self.client.hincrby(stats_key, 'file_count', delta)
+            stats_key = self._stats_key
+            return self._client.hincrby(stats_key, 'file_count', delta)
         except Exception:
             return 0
 
     def increment_crawled_count(self, delta: int = 1) -> int:
         """增加已爬取计数"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            stats_key = self._key('stats')
-            return self.client.hincrby(stats_key, 'crawled_count', delta)
+            stats_key = self._stats_key
+            return self._client.hincrby(stats_key, 'crawled_count', delta)
         except Exception:
             return 0
 
     # ============ URL去重 ============
 
+    def _bloom_enabled(self) -> bool:
+        """是否使用概率过滤器去重（首次使用时创建过滤器，服务端不支持时退回SET）"""
+        if not self._use_bloom or self._bloom_ready:
+            return self._use_bloom
+        try:
+            if self.FILTER_TYPE == 'cuckoo':
+                self._client.execute_command('CF.RESERVE', self._filter_key, self.BLOOM_CAPACITY)
+            else:
+                self._client.execute_command('BF.RESERVE', self._filter_key,
+                                            self.BLOOM_ERROR_RATE, self.BLOOM_CAPACITY)
+        except redis.ResponseError as e:
+            if 'exists' not in str(e).lower():
+                print(f"[Redis] 过滤器不可用，使用SET去重: {e}")
+                self._use_bloom = False
+        self._bloom_ready = True
+        return self._use_bloom
+
+    def _visited_local_hit(self, url: str) -> bool:
+        """本地缓存命中即确认已访问，无需访问Redis"""
+        with self._visited_local_lock:
+            if url in self._visited_local:
+                self._visited_local.move_to_end(url)
+                return True
+        return False
+
+    def _remember_visited(self, urls: Iterable[str]):
+        """记录已确认访问过的URL，超过上限时淘汰最久未使用的"""
+        cache = self._visited_local
+        with self._visited_local_lock:
+            for url in urls:
+                cache[url] = None
+                cache.move_to_end(url)
+            while len(cache) > self.VISITED_LOCAL_SIZE:
+                cache.popitem(last=False)
+
     def is_url_visited(self, url: str) -> bool:
         """检查URL是否已访问（去重）"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            return self.client.sismember(self._key('visited_urls'), url)
+            if self._visited_local_hit(url):
+                return True
+            if self._bloom_enabled():
+                visited = bool(self._client.execute_command(self._filter_cmds[2], self._filter_key, self._member(url)))
+            else:
+                visited = self._sets_visited([self._member(url)])[0]
+            if visited:
+                self._remember_visited((url,))
+            return visited
         except Exception:
             return False
 
     def mark_url_visited(self, url: str) -> bool:
         """标记URL为已访问"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.sadd(self._key('visited_urls'), url)
+            self._add_visited(url)
             return True
         except Exception as e:
             print(f"[Redis] 标记URL失败: {e}")
             return False
 
-    def check_and_mark_url(self, url: str) -> bool:
-        """检查并标记URL，返回是否新URL"""
-        if self.is_url_visited(url):
+    def _add_visited(self, url: str) -> bool:
+        """加入已访问集合，返回是否新URL（布隆模式下同时维护精确计数）"""
+        if self._visited_local_hit(url):
+            return False
+        if self._bloom_enabled():
+            added = self._client.execute_command(self._filter_cmds[1], self._filter_key, self._member(url))
+            if added:
+                self._client.incr(self._visited_count_key)
+        else:
+            added = self._mark_visited_script([self._member(url)])
+        self._remember_visited((url,))
+        return bool(added)
+
+    def is_urls_visited_many(self, urls: List[str]) -> List[bool]:
+        """批量检查URL是否已访问（一次SMISMEMBER往返）"""
+        try:
+            if not self._client or not urls:
+                return [False] * len(urls)
+            result = [self._visited_local_hit(url) for url in urls]
+            misses = [url for url, hit in zip(urls, result) if not hit]
+            if not misses:
+                return result
+            members = [self._member(url) for url in misses] if self._hash_urls else misses
+            if self._bloom_enabled():
+                flags = self._client.execute_command(self._filter_cmds[3], self._filter_key, *members)
+            else:
+                flags = self._sets_visited(members)
+            flags = iter([bool(flag) for flag in flags])
+            result = [hit or next(flags) for hit in result]
+            self._remember_visited(url for url, hit in zip(urls, result) if hit)
+            return result
+        except Exception:
+            return [False] * len(urls)
+
+    def _sets_visited(self, members: List[Any]) -> List[bool]:
+        """在 SET 去重的各月份桶中批量检查成员，命中旧桶的成员移到当月桶"""
+        keys = self._bucket_keys(self._visited_key)
+        in_buckets = self._smismember_buckets(keys, members)
+        visited = [any(flags) for flags in zip(*in_buckets)]
+        if len(keys) > 1:
+            pipe = self._client.pipeline(transaction=False)
+            moved = False
+            for i, member in enumerate(members):
+                if visited[i] and not in_buckets[0][i]:
+                    source = next(k for k, flags in zip(keys[1:], in_buckets[1:]) if flags[i])
+                    pipe.smove(source, keys[0], member)
+                    moved = True
+            if moved:
+                pipe.expire(keys[0], self._bucket_ttl)
+                pipe.execute()
+        return visited
+
+    def push_links_and_mark_visited(self, entries: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """批量入队详情链接并标记URL已访问（单次流水线提交）
+        
+        Args:
+            entries: (去重URL, 链接数据) 列表
+        """
+        try:
+            if not self._client:
+                return False
+            if not entries:
+                return True
+            use_bloom = self._bloom_enabled()
+            members = [self._member(url) for url, _ in entries]
+            pipe = self._client.pipeline(transaction=False)
+            pipe.lpush(self._links_queue_key,
+                       *[_dumps(link_data) for _, link_data in entries])
+            if use_bloom:
+                # CF.INSERTNX 需要 ITEMS 关键字
+                items = ('ITEMS', *members) if self.FILTER_TYPE == 'cuckoo' else members
+                pipe.execute_command(self._filter_cmds[4], self._filter_key, *items)
+            else:
+                self._mark_visited_script(members, client=pipe)
+            results = pipe.execute()
+            self._remember_visited(url for url, _ in entries)
+            if use_bloom:
+                added = sum(1 for flag in results[1] if flag == 1)
+                if added:
+                    self._client.incrby(self._visited_count_key, added)
+            return True
+        except Exception as e:
+            print(f"[Redis] 批量入队链接失败: {e}")
             return False
-        self.mark_url_visited(url)
-        return True
+
+    def check_and_mark_url(self, url: str) -> bool:
+        """检查并标记URL，返回是否新URL（SADD/BF.ADD 的返回值即可判断，只需一次往返）"""
+        try:
+            if not self._client:
+                return True
+            return self._add_visited(url)
+        except Exception as e:
+            print(f"[Redis] 标记URL失败: {e}")
+            return True
 
     def is_duplicate(self, url: str) -> bool:
         """检查URL是否重复（用于URL去重）"""
@@ -434,18 +950,31 @@ class SpiderRedisManager:
     def get_visited_count(self) -> int:
         """获取已访问URL数量"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            return self.client.scard(self._key('visited_urls'))
+            if self._bloom_enabled():
+                count = self._client.get(self._visited_count_key)
+                return int(count) if count else 0
+            count = self._client.hget(self._state_key, 'visited_count')
+            if count is not None:
+                return int(count)
+            return self._scard_buckets(self._visited_key)
         except Exception:
             return 0
 
     def mark_url_crawled(self, url: str) -> bool:
         """标记详情页URL已爬取（去重）"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.sadd(self._key('crawled_urls'), url)
+            key = self._bucket_keys(self._crawled_key)[0]
+            if self._bucket_months:
+                pipe = self._client.pipeline(transaction=False)
+                pipe.sadd(key, self._member(url))
+                pipe.expire(key, self._bucket_ttl)
+                pipe.execute()
+            else:
+                self._client.sadd(key, self._member(url))
             return True
         except Exception as e:
             print(f"[Redis] 标记URL已爬取失败: {e}")
@@ -454,9 +983,9 @@ class SpiderRedisManager:
     def mark_url_empty_content(self, url: str) -> bool:
         """标记URL内容为空（不计入爬取失败，不重试）"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.sadd(self._key('empty_content_urls'), url)
+            self._client.sadd(self._empty_content_key, self._member(url))
             return True
         except Exception as e:
             print(f"[Redis] 标记空内容URL失败: {e}")
@@ -465,40 +994,51 @@ class SpiderRedisManager:
     def is_url_crawled(self, url: str) -> bool:
         """检查URL是否已爬取详情"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            return self.client.sismember(self._key('crawled_urls'), url)
+            keys = self._bucket_keys(self._crawled_key)
+            return any(flags[0] for flags in self._smismember_buckets(keys, [self._member(url)]))
         except Exception:
             return False
 
     def get_crawled_count(self) -> int:
         """获取已爬取详情页数量"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            return self.client.scard(self._key('crawled_urls'))
+            return self._scard_buckets(self._crawled_key)
         except Exception:
             return 0
 
     # ============ URL队列管理 ============
 
-    def push_to_queue(self, url: str, priority: float = 0.0) -> bool:
-        """添加URL到队列（有序集合）"""
+    def push_to_queue(self, url: str, priority: Optional[float] = None) -> bool:
+        """添加URL到队列
+        
+        未指定优先级（None/0）时放入先进先出的列表（O(1)，内存更省）；
+        指定优先级时放入有序集合，在列表取空后按优先级从低到高取出
+        """
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.zadd(self._key('url_queue'), {url: priority})
+            if not priority:
+                self._client.lpush(self._queue_list_key, url)
+            else:
+                self._client.zadd(self._queue_key, {url: priority})
             return True
         except Exception as e:
             print(f"[Redis] 添加到队列失败: {e}")
             return False
 
     def pop_from_queue(self) -> Optional[str]:
-        """从队列取出URL（优先级最低的）"""
+        """从队列取出URL（先取列表，再取优先级最低的）"""
         try:
-            if not self.client:
+            if not self._client:
                 return None
-            result = self.client.zpopmin(self._key('url_queue'))
+            url = self._client.rpop(self._queue_list_key)
+            if url is not None:
+                return url
+            result = self._client.zpopmin(self._queue_key)
             if result:
                 return result[0][0]
             return None
@@ -509,9 +1049,12 @@ class SpiderRedisManager:
     def get_queue_size(self) -> int:
         """获取队列大小"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            return self.client.zcard(self._key('url_queue'))
+            pipe = self._client.pipeline(transaction=False)
+            pipe.llen(self._queue_list_key)
+            pipe.zcard(self._queue_key)
+            return sum(pipe.execute())
         except Exception:
             return 0
 
@@ -520,17 +1063,20 @@ class SpiderRedisManager:
     def log_error(self, error_type: str, url: str, message: str) -> bool:
         """记录错误"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
             error_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'type': error_type,
-                'url': url,
-                'message': message
+                'timestamp': _now_iso(),
+                'type': error_type or '',
+                'url': url or '',
+                'message': message or ''
             }
-            self.client.lpush(self._key('errors'), json.dumps(error_entry, ensure_ascii=False))
-            self.client.ltrim(self._key('errors'), 0, 99)
-            self.increment_error_count(1)
+            # 写入定长错误流，由服务端按 MAXLEN ~ 裁剪，不再需要 LTRIM
+            pipe = self._client.pipeline(transaction=False)
+            pipe.xadd(self._errors_stream_key, error_entry,
+                      maxlen=self.ERRORS_MAXLEN, approximate=True)
+            pipe.hincrby(self._state_key, 'error_count', 1)
+            pipe.execute()
             return True
         except Exception as e:
             print(f"[Redis] 记录错误失败: {e}")
@@ -539,10 +1085,14 @@ class SpiderRedisManager:
     def get_recent_errors(self, limit: int = 10) -> List[Dict]:
         """获取最近错误"""
         try:
-            if not self.client:
+            if not self._client:
                 return []
-            errors = self.client.lrange(self._key('errors'), 0, limit - 1)
-            return [json.loads(e) for e in errors]
+            entries = self._client.xrevrange(self._errors_stream_key, count=limit)
+            if entries:
+                return [fields for _, fields in entries]
+            # 兼容改用错误流之前写入的列表
+            errors = self._client.lrange(self._errors_key, 0, limit - 1)
+            return [_loads(e) for e in errors]
         except Exception:
             return []
 
@@ -551,48 +1101,104 @@ class SpiderRedisManager:
     def push_to_links_queue(self, link_data: Dict[str, Any]) -> bool:
         """添加详情页链接到队列"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.lpush(self._key('links_queue'), json.dumps(link_data, ensure_ascii=False))
+            self._client.lpush(self._links_queue_key, _dumps(link_data))
             return True
         except Exception as e:
             print(f"[Redis] 添加到链接队列失败: {e}")
             return False
 
-    def pop_from_links_queue(self) -> Optional[Dict[str, Any]]:
-        """从详情页队列取出链接（FIFO）"""
+    def claim_links(self, n: int = 32) -> List[Tuple[Any, Dict[str, Any]]]:
+        """领取最多 n 条详情页链接，返回 (原始数据, 链接) 列表
+
+        链接用 LMOVE 原子地移入处理中列表，处理完成后需调用 ack_link 删除，
+        进程被强制终止时未确认的链接留在处理中列表，由 recover_processing_links 放回队列
+        """
         try:
-            if not self.client:
-                return None
-            data = self.client.rpop(self._key('links_queue'))
-            if data:
-                return json.loads(data)
-            return None
+            if not self._client:
+                return []
+            pipe = self._client.pipeline(transaction=False)
+            for _ in range(n):
+                pipe.lmove(self._links_queue_key, self._links_processing_key, 'RIGHT', 'LEFT')
+            try:
+                raws = pipe.execute()
+            except redis.ResponseError:
+                # Redis < 6.2 没有 LMOVE，改用等价的 RPOPLPUSH
+                pipe = self._client.pipeline(transaction=False)
+                for _ in range(n):
+                    pipe.rpoplpush(self._links_queue_key, self._links_processing_key)
+                raws = pipe.execute()
+            return [(raw, _loads(raw)) for raw in raws if raw is not None]
         except Exception as e:
-            print(f"[Redis] 从链接队列取出失败: {e}")
-            return None
+            print(f"[Redis] 从链接队列领取失败: {e}")
+            return []
+
+    def ack_link(self, raw: Any) -> bool:
+        """确认链接已处理完成，从处理中列表删除"""
+        try:
+            if not self._client:
+                return False
+            self._client.lrem(self._links_processing_key, 1, raw)
+            return True
+        except Exception as e:
+            print(f"[Redis] 确认链接失败: {e}")
+            return False
+
+    def retry_link(self, raw: Any) -> bool:
+        """把处理失败的链接从处理中列表移回队列入口端，稍后重试"""
+        try:
+            if not self._client:
+                return False
+            pipe = self._client.pipeline(transaction=True)
+            pipe.lrem(self._links_processing_key, 1, raw)
+            pipe.lpush(self._links_queue_key, raw)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"[Redis] 放回链接队列失败: {e}")
+            return False
+
+    def recover_processing_links(self) -> int:
+        """把处理中列表里未确认的链接放回队列出口端（启动时及停止时调用），返回数量"""
+        try:
+            if not self._client:
+                return 0
+            return self._get_script(_RECOVER_LINKS_LUA)(
+                keys=[self._links_processing_key, self._links_queue_key])
+        except Exception as e:
+            print(f"[Redis] 归还处理中链接失败: {e}")
+            return 0
 
     def get_links_queue_size(self) -> int:
         """获取待爬取详情链接队列大小"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            return self.client.llen(self._key('links_queue'))
+            return self._client.llen(self._links_queue_key)
         except Exception:
             return 0
 
     def has_pending_links(self) -> bool:
-        """检查是否有待爬取的详情链接"""
-        return self.get_links_queue_size() > 0
+        """检查是否有待爬取的详情链接（包括上次运行领取后未确认的链接）"""
+        try:
+            if not self._client:
+                return False
+            pipe = self._client.pipeline(transaction=False)
+            pipe.llen(self._links_queue_key)
+            pipe.llen(self._links_processing_key)
+            return sum(pipe.execute()) > 0
+        except Exception:
+            return False
 
     # ============ 翻页进度管理（合并到pagination表） ============
 
     def set_last_pagination_page(self, column_id: int, page: int) -> bool:
         """记录翻页进度"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            self.client.hset(self._pagination_key, str(column_id), str(page))
+            self._client.hset(self._pagination_key, str(column_id), str(page))
             return True
         except Exception as e:
             print(f"[Redis] 记录翻页进度失败: {e}")
@@ -601,9 +1207,9 @@ class SpiderRedisManager:
     def get_last_pagination_page(self, column_id: int) -> int:
         """获取指定栏目的翻页进度"""
         try:
-            if not self.client:
+            if not self._client:
                 return 0
-            page = self.client.hget(self._pagination_key, str(column_id))
+            page = self._client.hget(self._pagination_key, str(column_id))
             return int(page) if page else 0
         except Exception:
             return 0
@@ -611,13 +1217,13 @@ class SpiderRedisManager:
     def set_pagination_complete(self, column_id: int, complete: bool) -> bool:
         """标记栏目翻页是否完成"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
             complete_key = f'{column_id}_complete'
             if complete:
-                self.client.hset(self._pagination_key, complete_key, '1')
+                self._client.hset(self._pagination_key, complete_key, '1')
             else:
-                self.client.hdel(self._pagination_key, complete_key)
+                self._client.hdel(self._pagination_key, complete_key)
             return True
         except Exception as e:
             print(f"[Redis] 设置翻页完成状态失败: {e}")
@@ -626,38 +1232,44 @@ class SpiderRedisManager:
     def is_pagination_complete(self, column_id: int) -> bool:
         """检查栏目翻页是否完成"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
             complete_key = f'{column_id}_complete'
-            return self.client.hget(self._pagination_key, complete_key) == '1'
+            return self._client.hget(self._pagination_key, complete_key) == '1'
         except Exception:
             return False
 
     def get_all_pagination_progress(self) -> Dict[str, str]:
         """获取所有栏目的翻页进度"""
         try:
-            if not self.client:
+            if not self._client:
                 return {}
-            return self.client.hgetall(self._pagination_key) or {}
+            return self._client.hgetall(self._pagination_key) or {}
         except Exception:
             return {}
 
     def has_incomplete_pagination(self, column_configs: Dict[int, Dict]) -> bool:
-        """检查是否有未完成的翻页"""
-        for column_id, config in column_configs.items():
-            if not self.is_pagination_complete(column_id):
+        """检查是否有未完成的翻页（一次 HMGET 取回所有栏目的完成标记）"""
+        if not column_configs:
+            return False
+        try:
+            if not self._client:
                 return True
-        return False
+            flags = self._client.hmget(self._pagination_key,
+                                      [f'{column_id}_complete' for column_id in column_configs])
+            return any(flag != '1' for flag in flags)
+        except Exception:
+            return True
 
     # ============ 检查点管理 ============
 
     def save_checkpoint(self, checkpoint_data: Dict[str, Any]) -> bool:
         """保存检查点数据"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
-            checkpoint_data['saved_at'] = datetime.now().isoformat()
-            self.client.set(self._key('checkpoint'), json.dumps(checkpoint_data, ensure_ascii=False))
+            checkpoint_data['saved_at'] = _now_iso()
+            self._client.set(self._checkpoint_key, _dumps(checkpoint_data))
             return True
         except Exception as e:
             print(f"[Redis] 保存检查点失败: {e}")
@@ -666,11 +1278,11 @@ class SpiderRedisManager:
     def load_checkpoint(self) -> Optional[Dict[str, Any]]:
         """加载检查点数据"""
         try:
-            if not self.client:
+            if not self._client:
                 return None
-            data = self.client.get(self._key('checkpoint'))
+            data = self._client.get(self._checkpoint_key)
             if data:
-                return json.loads(data)
+                return _loads(data)
             return None
         except Exception as e:
             print(f"[Redis] 加载检查点失败: {e}")
@@ -681,20 +1293,33 @@ class SpiderRedisManager:
     def cleanup(self) -> bool:
         """清理该爬虫的所有Redis数据（完全重置）"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
             keys_to_delete = [
                 self._state_key,
                 self._progress_key,
                 self._pagination_key,
-                self._key('visited_urls'),
-                self._key('url_queue'),
-                self._key('errors'),
-                self._key('links_queue'),
-                self._key('crawled_urls'),
-                self._key('checkpoint'),
+                self._visited_key,
+                self._visited_bloom_key,
+                self._visited_cuckoo_key,
+                self._visited_count_key,
+                self._queue_key,
+                self._queue_list_key,
+                self._errors_key,
+                self._errors_stream_key,
+                self._links_queue_key,
+                self._links_processing_key,
+                self._crawled_key,
+                self._checkpoint_key,
             ]
-            self.client.delete(*keys_to_delete)
+            # 月份桶（包括已滑出窗口、尚未过期的桶）
+            for base in (self._visited_key, self._crawled_key):
+                keys_to_delete.extend(self._client.scan_iter(match=f'{base}:*', count=1000))
+            self._client.delete(*keys_to_delete)
+            # 过滤器已删除，下次使用时按配置重新创建
+            self._bloom_ready = False
+            with self._visited_local_lock:
+                self._visited_local.clear()
             return True
         except Exception as e:
             print(f"[Redis] 清理失败: {e}")
@@ -703,32 +1328,33 @@ class SpiderRedisManager:
     def reset_state(self) -> bool:
         """只清理状态数据，保留进度和去重数据（用于断点续传）"""
         try:
-            if not self.client:
+            if not self._client:
                 return False
             keys_to_delete = [
                 self._state_key,
                 self._progress_key,
-                self._key('url_queue'),
-                self._key('errors'),
-                self._key('checkpoint'),
+                self._queue_key,
+                self._queue_list_key,
+                self._errors_key,
+                self._errors_stream_key,
+                self._checkpoint_key,
             ]
-            self.client.delete(*keys_to_delete)
+            self._client.delete(*keys_to_delete)
             return True
         except Exception as e:
             print(f"[Redis] 重置状态失败: {e}")
             return False
 
 
+@functools.lru_cache(maxsize=16)
 def get_spider_redis_manager(spider_type: str) -> SpiderRedisManager:
-    """获取指定爬虫的Redis管理器"""
+    """获取指定爬虫的Redis管理器（按爬虫类型复用，键名只生成一次）"""
     return SpiderRedisManager(spider_type)
 
 
 def get_all_spider_status() -> Dict[str, Dict[str, Any]]:
-    """获取所有爬虫状态"""
-    result = {}
+    """获取所有爬虫状态（各爬虫并行查询，每个使用连接池中的独立连接）"""
     spider_types = ['nhsa', 'wjw']
-    for spider_type in spider_types:
-        rm = get_spider_redis_manager(spider_type)
-        result[spider_type] = rm.get_status()
-    return result
+    with ThreadPoolExecutor(max_workers=len(spider_types)) as executor:
+        statuses = executor.map(lambda t: get_spider_redis_manager(t).get_status(), spider_types)
+        return dict(zip(spider_types, statuses))
@@ -3,22 +3,60 @@ API views for spider management.
 提供爬虫控制、数据查询、日志查看等API接口
 """
 
+import functools
+import hashlib
+import heapq
 import json
 import logging
+import mmap
 import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
-from django.http import JsonResponse, HttpResponse, FileResponse
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import (JsonResponse, HttpResponse, HttpResponseNotModified, FileResponse,
+                         StreamingHttpResponse)
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from .adapters import SpiderManager, count_files_recursive
-from .redis_manager import get_spider_redis_manager
-from .file_utils import create_zip_from_directory, create_batch_zip, safe_filename
+from .redis_manager import RedisManager, get_spider_redis_manager
+from .file_utils import find_missing_items, stream_batch_zip, stream_zip_from_directory, safe_filename
+from .logger import MSGPACK_SUFFIX, USE_MSGPACK, expand_log_message, read_log_records
+from .data_index import count_items, query_items, summarize_item
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# 项目根目录（backend 的上级目录），导入时计算一次
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+@functools.lru_cache(maxsize=16)
+def _spider_data_file(spider_name: str) -> Path:
+    """爬虫数据文件路径 data/{spider}/{spider}_data.json"""
+    return BASE_DIR / 'data' / spider_name / f'{spider_name}_data.json'
+
+
+@functools.lru_cache(maxsize=16)
+def _spider_files_dir(spider_name: str) -> Path:
+    """爬虫附件目录 data/{spider}/{spider}_files"""
+    return BASE_DIR / 'data' / spider_name / f'{spider_name}_files'
+
+# 数据/日志逐行解析优先使用 orjson（可直接解析 bytes）；orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 def get_spider_config_by_id(spider_id: str) -> dict:
     """
@@ -38,10 +76,98 @@ def get_all_spider_configs() -> List[dict]:
     return get_all_spiders()
 
 
-def safe_json_response(data: dict, status: int = 200) -> JsonResponse:
-    """安全的JSON响应"""
+# JSON 序列化时会被转义的字符（引号、反斜杠、斜杠、控制字符）
+_JSON_ESCAPED_CHARS = re.compile(r'["\\/\x00-\x1f]')
+# 紧凑格式日志行中的级别字段，只取出级别值比较，不复制整行
+_LEVEL_FIELD_RE = re.compile(rb'"level":"([A-Za-z]*)"')
+
+
+def iter_ndjson_lines(path: Path) -> Iterator[Tuple[int, bytes]]:
+    """mmap 逐行遍历NDJSON文件，返回 (行号, 去除首尾空白的非空行)
+
+    换行查找由 mmap.find 在C层完成，不经过文本解码和缓冲读取
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos = 0
+            line_num = 0
+            while pos < size:
+                nl = mm.find(b'\n', pos)
+                if nl == -1:
+                    nl = size
+                line_num += 1
+                line = mm[pos:nl].strip()
+                pos = nl + 1
+                if line:
+                    yield line_num, line
+
+
+LOG_READ_CHUNK_SIZE = 1 << 20
+
+
+def iter_file_lines(path: Path, chunk_size: int = LOG_READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """按固定大小块读取文件并逐行返回（bytes，不含换行），工作内存约为一个块"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        buf = b''
+        while True:
+            chunk = os.read(fd, chunk_size)
+            if not chunk:
+                break
+            *lines, buf = (buf + chunk).split(b'\n')
+            yield from lines
+        if buf:
+            yield buf
+    finally:
+        os.close(fd)
+
+
+# item目录附件数缓存：{目录路径: (目录 mtime_ns, 文件数)}，目录内容变化时 mtime 随之变化
+_FILE_COUNT_CACHE: Dict[str, Tuple[int, int]] = {}
+
+
+def _cached_file_count(item_dir: Path) -> int:
+    """统计目录下的文件数（不含子目录），目录未变化时直接返回缓存"""
+    key = str(item_dir)
     try:
-        return JsonResponse(data, status=status, json_dumps_params={'ensure_ascii': False})
+        mtime_ns = os.stat(key).st_mtime_ns
+    except OSError:
+        _FILE_COUNT_CACHE.pop(key, None)
+        return 0
+    cached = _FILE_COUNT_CACHE.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        with os.scandir(key) as entries:
+            count = sum(1 for entry in entries if entry.is_file())
+    except NotADirectoryError:
+        count = 0
+    _FILE_COUNT_CACHE[key] = (mtime_ns, count)
+    return count
+
+
+# 响应统一使用 orjson 序列化（无法处理的类型转为字符串），不可用时退回 JsonResponse
+_dumps = orjson.dumps if orjson is not None else None
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+def _encode_payload(data: dict):
+    """序列化响应体，优先使用 orjson"""
+    if _dumps is not None:
+        try:
+            return _dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, cls=DjangoJSONEncoder)
+
+
+def safe_json_response(data: dict, status: int = 200) -> HttpResponse:
+    """安全的JSON响应（orjson 直接输出UTF-8字节，不转义中文）"""
+    try:
+        return HttpResponse(_encode_payload(data), status=status, content_type=JSON_CONTENT_TYPE)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -50,6 +176,51 @@ def safe_json_response(data: dict, status: int = 200) -> JsonResponse:
         }, status=500)
 
 
+# 接口响应缓存（Redis，短TTL），仪表盘多页面高频轮询时直接返回缓存
+RESPONSE_CACHE_PREFIX = 'spider_api:'
+
+
+def get_cached_response(key: str) -> Optional[HttpResponse]:
+    """读取缓存的响应，未命中或Redis不可用时返回 None"""
+    client = RedisManager().get_client()
+    if not client:
+        return None
+    try:
+        cached = client.get(RESPONSE_CACHE_PREFIX + key)
+    except Exception as e:
+        logger.warning(f"读取响应缓存失败: {e}")
+        return None
+    if cached is None:
+        return None
+    return HttpResponse(cached, content_type=JSON_CONTENT_TYPE)
+
+
+def cached_json_response(key: str, data: dict, ttl: int) -> HttpResponse:
+    """序列化一次，写入缓存并返回响应"""
+    try:
+        body = _encode_payload(data)
+    except Exception:
+        return safe_json_response(data)
+    client = RedisManager().get_client()
+    if client:
+        try:
+            client.set(RESPONSE_CACHE_PREFIX + key, body, ex=ttl)
+        except Exception as e:
+            logger.warning(f"写入响应缓存失败: {e}")
+    return HttpResponse(body, content_type=JSON_CONTENT_TYPE)
+
+
+def invalidate_cached_responses(*keys: str) -> None:
+    """删除指定的响应缓存，状态变化后下一次轮询直接读取最新数据"""
+    client = RedisManager().get_client()
+    if not client or not keys:
+        return
+    try:
+        client.delete(*(RESPONSE_CACHE_PREFIX + key for key in keys))
+    except Exception as e:
+        logger.warning(f"清除响应缓存失败: {e}")
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class SpiderStatusView(View):
     """爬虫状态API - 优先从Redis读取，后台定时刷新"""
@@ -89,6 +260,10 @@ class SpiderStatusView(View):
                     'error': 'Spider type not found'
                 }, status=404)
 
+            cached = get_cached_response('status:all')
+            if cached is not None:
+                return cached
+
             all_status = SpiderManager.get_all_status()
             
             need_refresh = False
@@ -119,10 +294,10 @@ class SpiderStatusView(View):
                         'spider_type': spider_type
                     }
 
-            return safe_json_response({
+            return cached_json_response('status:all', {
                 'success': True,
                 'data': result
-            })
+            }, ttl=2)
 
         except Exception as e:
             logger.error(f"获取爬虫状态失败: {e}")
@@ -177,6 +352,12 @@ class SpiderControlView(View):
 
             if result:
                 logger.info(f"爬虫操作成功: {spider_type} - {action}")
+                invalidate_cached_responses(
+                    'status:all',
+                    f'stats:{spider_type}',
+                    *(f"detail:{config['spider_id']}" for config in get_all_spider_configs()
+                      if config['spider_name'] == spider_type)
+                )
                 return safe_json_response({
                     'success': True,
                     'message': f'{action.capitalize()} executed successfully',
@@ -208,6 +389,47 @@ class SpiderControlView(View):
             }, status=500)
 
 
+# 条件GET：数据/附件未变化时返回304，前端轮询不再重复解析
+CONDITIONAL_CACHE_CONTROL = 'private, max-age=2'
+
+
+def _files_tree_version(files_dir: Path) -> str:
+    """附件目录版本：附件目录及各item子目录的数量和最大 mtime_ns（附件都存放在item子目录中）"""
+    try:
+        latest = os.stat(files_dir).st_mtime_ns
+    except OSError:
+        return '0'
+    count = 0
+    with os.scandir(files_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                count += 1
+                latest = max(latest, entry.stat().st_mtime_ns)
+    return f'{count:x}.{latest:x}'
+
+
+def _make_etag(*parts) -> str:
+    """由文件版本和查询参数生成弱ETag（参数取摘要，避免非ASCII字符进入响应头）"""
+    digest = hashlib.blake2b('\x1f'.join(map(str, parts)).encode('utf-8'), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _not_modified(request, etag: str) -> Optional[HttpResponseNotModified]:
+    """请求携带的 If-None-Match 与当前ETag一致时返回304响应"""
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = CONDITIONAL_CACHE_CONTROL
+        return response
+    return None
+
+
+def _with_etag(response: HttpResponse, etag: str) -> HttpResponse:
+    response['ETag'] = etag
+    response['Cache-Control'] = CONDITIONAL_CACHE_CONTROL
+    return response
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class CrawledDataView(View):
     """爬取数据API"""
@@ -223,8 +445,7 @@ class CrawledDataView(View):
             sort_field = request.GET.get('sort_field', 'publish_date')
             sort_order = request.GET.get('sort_order', 'desc')
 
-            base_dir = Path(__file__).resolve().parent.parent.parent
-            data_file = base_dir / 'data' / spider_type / f'{spider_type}_data.json'
+            data_file = _spider_data_file(spider_type)
 
             if not data_file.exists():
                 return safe_json_response({
@@ -236,52 +457,47 @@ class CrawledDataView(View):
                     'message': '数据文件不存在'
                 })
 
-            items = []
-            files_dir = base_dir / 'data' / spider_type / f'{spider_type}_files'
-            with open(data_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
+            files_dir = _spider_files_dir(spider_type)
+            data_stat = data_file.stat()
+            etag = _make_etag(data_stat.st_size, data_stat.st_mtime_ns, _files_tree_version(files_dir),
+                              page, page_size, keyword, date_start, date_end, sort_field, sort_order)
+            not_modified = _not_modified(request, etag)
+            if not_modified is not None:
+                return not_modified
+            total = 0
+
+            def iter_items():
+                """逐行解析并过滤数据记录，不保留全部记录"""
+                nonlocal total
+                # 关键字不含JSON会转义的字符时，可先在原始字节上判断，跳过不可能匹配的行
+                keyword_bytes = None
+                if keyword and not _JSON_ESCAPED_CHARS.search(keyword):
+                    keyword_bytes = keyword.encode('utf-8')
+                for line_num, line in iter_ndjson_lines(data_file):
+                    if (keyword_bytes and keyword_bytes not in line
+                            and b'\\u' not in line):
                         continue
 
                     try:
-                        raw_data = json.loads(line)
-                        item_id = raw_data.get('item_id')
-                        data = {
-                            'item_id': item_id,
-                            'title': raw_data.get('title'),
-                            'publish_date': raw_data.get('发布日期') or raw_data.get('publish_date'),
-                            'url': raw_data.get('url'),
-                            'data': raw_data.get('data', {}),
-                        }
-                        publish_date = (data.get('publish_date') or '').strip()
-                        
-                        if date_start or date_end:
-                            in_range = True
-                            if date_start and publish_date and publish_date < date_start:
-                                in_range = False
-                            if date_end and publish_date and publish_date > date_end:
-                                in_range = False
-                            if not in_range:
-                                continue
-                        if keyword and keyword not in data.get('title', ''):
-                            continue
-                        
-                        if item_id and files_dir.exists():
-                            item_dir = files_dir / str(item_id)
-                            if item_dir.exists() and item_dir.is_dir():
-                                file_count = sum(1 for _ in item_dir.iterdir() if _.is_file())
-                                data['file_count'] = file_count
-                            else:
-                                data['file_count'] = 0
-                        else:
-                            data['file_count'] = 0
-                        
-                        data['_line_number'] = line_num
-                        items.append(data)
+                        raw_data = _json_loads(line)
                     except json.JSONDecodeError as e:
                         logger.warning(f"解析JSON行失败 (行号:{line_num}): {e}")
                         continue
+                    data = summarize_item(raw_data)
+                    publish_date = (data.get('publish_date') or '').strip()
+
+                    if date_start or date_end:
+                        in_range = True
+                        if date_start and publish_date and publish_date < date_start:
+                            in_range = False
+                        if date_end and publish_date and publish_date > date_end:
+                            in_range = False
+                        if not in_range:
+                            continue
+                    if keyword and keyword not in data.get('title', ''):
+                        continue
+                    total += 1
+                    yield data
 
             def get_sort_value(item):
                 sort_val = item.get(sort_field, item.get(sort_field.lower(), ''))
@@ -289,25 +505,38 @@ class CrawledDataView(View):
                     return sort_val
                 return str(sort_val)
 
-            reverse = sort_order.lower() == 'desc'
-            items.sort(key=get_sort_value, reverse=reverse)
-
-            total = len(items)
             start = (page - 1) * page_size
             end = start + page_size
-            paginated_items = items[start:end]
+            # 优先通过 SQLite 索引查询，只读取当前页的记录
+            indexed = None
+            if start >= 0:
+                indexed = query_items(data_file, keyword, date_start, date_end,
+                                      sort_field, sort_order, start, page_size)
+            if indexed is not None:
+                total, paginated_items = indexed
+            else:
+                # 只保留前 end 条（与完整排序后切片结果一致），内存为 O(page·page_size)
+                select = heapq.nlargest if sort_order.lower() == 'desc' else heapq.nsmallest
+                top_items = select(end, iter_items(), key=get_sort_value) if end > 0 else []
+                paginated_items = top_items[start:end]
 
+            # 附件数量只为当前页计算
+            files_dir_exists = files_dir.exists()
             for item in paginated_items:
-                item.pop('_line_number', None)
+                item_id = item.get('item_id')
+                if item_id and files_dir_exists:
+                    item['file_count'] = _cached_file_count(files_dir / str(item_id))
+                else:
+                    item['file_count'] = 0
 
-            return safe_json_response({
+            return _with_etag(safe_json_response({
                 'success': True,
                 'data': paginated_items,
                 'total': total,
                 'page': page,
                 'page_size': page_size,
                 'total_pages': (total + page_size - 1) // page_size
-            })
+            }), etag)
 
         except Exception as e:
             logger.error(f"获取爬取数据失败: {e}")
@@ -329,8 +558,7 @@ class CrawledFilesView(View):
             page_size = min(int(request.GET.get('page_size', 20)), 100)
             keyword = request.GET.get('keyword')
 
-            base_dir = Path(__file__).resolve().parent.parent.parent
-            files_dir = base_dir / 'data' / spider_type / f'{spider_type}_files'
+            files_dir = _spider_files_dir(spider_type)
 
             if not files_dir.exists():
                 return safe_json_response({
@@ -342,42 +570,57 @@ class CrawledFilesView(View):
                     'message': '文件目录不存在'
                 })
 
-            def scan_files(directory: Path) -> list:
-                """递归扫描目录下所有文件"""
-                items = []
-                for file_path in directory.iterdir():
-                    if file_path.is_file():
-                        file_name = file_path.name
-                        if keyword and keyword not in file_name:
-                            continue
-                        items.append({
-                            'name': file_name,
-                            'path': str(file_path.relative_to(base_dir)).replace('\\', '/'),
-                            'size': file_path.stat().st_size,
-                            'size_formatted': self.format_size(file_path.stat().st_size),
-                            'extension': file_path.suffix.lower(),
-                            'modified_time': file_path.stat().st_mtime,
-                            'modified_time_formatted': datetime.fromtimestamp(file_path.stat().st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    elif file_path.is_dir():
-                        items.extend(scan_files(file_path))
-                return items
-
-            items = scan_files(files_dir)
-            items.sort(key=lambda x: x['modified_time'], reverse=True)
-
-            total = len(items)
+            etag = _make_etag(_files_tree_version(files_dir), page, page_size, keyword)
+            not_modified = _not_modified(request, etag)
+            if not_modified is not None:
+                return not_modified
+
+            total = 0
+
+            def scan_files(directory: str) -> Iterator[Tuple[float, int, str]]:
+                """迭代扫描目录下所有文件，逐个返回 (修改时间, 大小, 完整路径) 元组
+
+                os.scandir 的 DirEntry 缓存了目录读取时的类型信息，每个文件只需一次 stat
+                """
+                nonlocal total
+                stack = [directory]
+                while stack:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                if keyword and keyword not in entry.name:
+                                    continue
+                                st = entry.stat()
+                                total += 1
+                                yield st.st_mtime, st.st_size, entry.path
+                            elif entry.is_dir():
+                                stack.append(entry.path)
+
             start = (page - 1) * page_size
             end = start + page_size
-            paginated_items = items[start:end]
+            # 按修改时间倒序只保留前 end 个文件（与完整排序后切片一致）
+            top_files = heapq.nlargest(end, scan_files(str(files_dir)), key=lambda x: x[0]) if end > 0 else []
+            # 文件名、扩展名等只为当前页生成
+            paginated_items = []
+            for mtime, size, path in top_files[start:end]:
+                name = os.path.basename(path)
+                paginated_items.append({
+                    'name': name,
+                    'path': os.path.relpath(path, BASE_DIR).replace('\\', '/'),
+                    'size': size,
+                    'size_formatted': self.format_size(size),
+                    'extension': os.path.splitext(name)[1].lower(),
+                    'modified_time': mtime,
+                    'modified_time_formatted': datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+                })
 
-            return safe_json_response({
+            return _with_etag(safe_json_response({
                 'success': True,
                 'data': paginated_items,
                 'total': total,
                 'page': page,
                 'page_size': page_size
-            })
+            }), etag)
 
         except Exception as e:
             logger.error(f"获取爬取文件失败: {e}")
@@ -408,11 +651,10 @@ class FileDownloadView(View):
                     'error': 'path is required'
                 }, status=400)
 
-            base_dir = Path(__file__).resolve().parent.parent.parent
 
             file_path = Path(path_param)
             if not file_path.is_absolute():
-                file_path = base_dir / path_param
+                file_path = BASE_DIR / path_param
 
             if not file_path.exists() or not file_path.is_file():
                 return safe_json_response({
@@ -421,16 +663,10 @@ class FileDownloadView(View):
                 }, status=404)
 
             try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                    response = HttpResponse(content, content_type='application/octet-stream')
-                    filename = file_path.name
-                    try:
-                        encoded_filename = urllib.parse.quote(filename, safe='')
-                        response['Content-Disposition'] = f'attachment; filename="{encoded_filename}"; filename*=utf-8\'\'{encoded_filename}'
-                    except Exception:
-                        response['Content-Disposition'] = f'attachment; filename="{encoded_filename}"'
-                    return response
+                # FileResponse 分块流式输出，服务器支持时使用 sendfile；文件名编码（filename*）由 Django 处理
+                return FileResponse(open(file_path, 'rb'), as_attachment=True,
+                                    filename=file_path.name,
+                                    content_type='application/octet-stream')
             except IOError as e:
                 logger.error(f"读取文件失败: {e}")
                 return safe_json_response({
@@ -447,6 +683,24 @@ class FileDownloadView(View):
             }, status=500)
 
 
+# 日志类型对应的消息关键字
+LINKS_KW = ('翻页', '栏目', '入队', '链接收集')
+DETAILS_KW = ('详情', 'Crawl success', '已爬取')
+DOWNLOAD_KW = ('下载', 'Download')
+ERROR_KW = ('错误', '[错误]', '失败')
+LOG_TYPE_KEYWORDS = {
+    'links': LINKS_KW,
+    'details': DETAILS_KW,
+    'download': DOWNLOAD_KW,
+    'error': ERROR_KW,
+}
+# 每种类型的关键字合并为一个正则，一次扫描完成匹配
+LOG_TYPE_PATTERNS = {
+    log_type: re.compile('|'.join(map(re.escape, keywords)))
+    for log_type, keywords in LOG_TYPE_KEYWORDS.items()
+}
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class SpiderLogsView(View):
     """爬虫日志API"""
@@ -456,18 +710,54 @@ class SpiderLogsView(View):
         if not log_type or log_type == 'all':
             return True
         
-        msg = log_entry.get('message', '')
-        level = log_entry.get('level', '').lower()
-        
-        if log_type == 'links':
-            return any(keyword in msg for keyword in ['翻页', '栏目', '入队', '链接收集'])
-        elif log_type == 'details':
-            return any(keyword in msg for keyword in ['详情', 'Crawl success', '已爬取'])
-        elif log_type == 'download':
-            return any(keyword in msg for keyword in ['下载', 'Download'])
-        elif log_type == 'error':
-            return level == 'error' or any(keyword in msg for keyword in ['错误', '[错误]', '失败'])
-        return True
+        pattern = LOG_TYPE_PATTERNS.get(log_type)
+        if pattern is None:
+            return True
+        if log_type == 'error' and log_entry.get('level', '').lower() == 'error':
+            return True
+        return pattern.search(log_entry.get('message', '')) is not None
+
+    def _match_entry(self, log_entry: Dict, level_upper: Optional[str], keyword_search,
+                     log_type: str) -> bool:
+        """按级别、关键字、类型筛选已解析的日志（由廉价到昂贵）"""
+        if 'message' not in log_entry:
+            expand_log_message(log_entry)
+        if level_upper and log_entry.get('level', '').upper() != level_upper:
+            return False
+        if keyword_search and keyword_search(log_entry.get('message', '')) is None:
+            return False
+        return self._match_log_type(log_entry, log_type)
+
+    def _iter_line_entries(self, log_file: Path, level_bytes: Optional[bytes], keyword_raw: bool,
+                           level_upper: Optional[str], keyword_search, log_type: str) -> Iterator[Dict]:
+        """流式读取 JSON 行日志，逐条产出通过筛选的日志"""
+        for line in iter_file_lines(log_file):
+            line = line.strip()
+            if not line:
+                continue
+            if level_bytes:
+                match = _LEVEL_FIELD_RE.search(line)
+                if match is not None and match.group(1).upper() != level_bytes:
+                    continue
+            if (keyword_raw and b'"message":' in line and b'\\u' not in line
+                    and keyword_search(line.decode('utf-8', errors='replace')) is None):
+                continue
+
+            try:
+                log_entry = _json_loads(line)
+                if not self._match_entry(log_entry, level_upper, keyword_search, log_type):
+                    continue
+            except json.JSONDecodeError:
+                line = line.decode('utf-8', errors='replace')
+                if keyword_search and keyword_search(line) is None:
+                    continue
+                log_entry = {
+                    'message': line,
+                    'raw': True,
+                    'timestamp': None,
+                    'level': 'UNKNOWN'
+                }
+            yield log_entry
 
     def get(self, request):
         try:
@@ -484,9 +774,9 @@ class SpiderLogsView(View):
                     'error': 'spider_type is required'
                 }, status=400)
 
-            base_dir = Path(__file__).resolve().parent.parent.parent
-            logs_dir = base_dir / 'logs'
-            log_file = logs_dir / f'{spider_type}.log'
+            logs_dir = BASE_DIR / 'logs'
+            # SPIDER_LOG_FORMAT=msgpack 时爬虫写入长度前缀的 msgpack 记录文件
+            log_file = logs_dir / (spider_type + (MSGPACK_SUFFIX if USE_MSGPACK else '.log'))
 
             if not logs_dir.exists():
                 return safe_json_response({
@@ -502,65 +792,29 @@ class SpiderLogsView(View):
                     'message': '日志文件不存在'
                 })
 
-            logs = []
             total_count = 0
+            level_upper = level.upper() if level else None
+            # 解析前先在原始行上做廉价的预过滤（只在结论确定时跳过）：
+            # 紧凑格式写入的 "level":"X" 与级别比较；含 "message" 字段且无 \u 转义的行直接查找关键字
+            level_bytes = level_upper.encode() if level_upper and level_upper.isalpha() else None
+            keyword_raw = bool(keyword) and not _JSON_ESCAPED_CHARS.search(keyword)
+            # 关键字编译为忽略大小写的正则，逐行匹配不再复制 lower() 后的消息
+            keyword_search = re.compile(re.escape(keyword), re.IGNORECASE).search if keyword else None
+            # 单次流式读取，只保留最后 offset+limit 条匹配的日志
+            window = deque(maxlen=offset + limit)
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    all_lines = f.readlines()
-
-                    for line in all_lines:
-                        line = line.strip()
-                        if not line:
-                            continue
-
-                        try:
-                            log_entry = json.loads(line)
-                            if level and log_entry.get('level', '').upper() != level.upper():
-                                continue
-                            if not self._match_log_type(log_entry, log_type):
-                                continue
-                            if keyword and keyword.lower() not in log_entry.get('message', '').lower():
-                                continue
-                            total_count += 1
-                        except json.JSONDecodeError:
-                            if not keyword or keyword.lower() in line.lower():
-                                total_count += 1
-
-                    start_idx = max(0, total_count - offset - limit)
-                    end_idx = total_count - offset
-
-                    filtered_logs = []
-                    current_idx = 0
-                    count_in_range = 0
-
-                    for line in all_lines:
-                        line = line.strip()
-                        if not line:
-                            continue
+                if USE_MSGPACK:
+                    entries = (entry for entry in read_log_records(log_file)
+                               if self._match_entry(entry, level_upper, keyword_search, log_type))
+                else:
+                    entries = self._iter_line_entries(log_file, level_bytes, keyword_raw,
+                                                      level_upper, keyword_search, log_type)
+                for log_entry in entries:
+                    total_count += 1
+                    window.append(log_entry)
 
-                        try:
-                            log_entry = json.loads(line)
-                            if level and log_entry.get('level', '').upper() != level.upper():
-                                continue
-                            if not self._match_log_type(log_entry, log_type):
-                                continue
-                            if keyword and keyword.lower() not in log_entry.get('message', '').lower():
-                                continue
-                            current_idx += 1
-                            if start_idx < current_idx <= end_idx:
-                                filtered_logs.append(log_entry)
-                        except json.JSONDecodeError:
-                            if not keyword or keyword.lower() in line.lower():
-                                current_idx += 1
-                                if start_idx < current_idx <= end_idx:
-                                    filtered_logs.append({
-                                        'message': line,
-                                        'raw': True,
-                                        'timestamp': None,
-                                        'level': 'UNKNOWN'
-                                    })
-
-                    logs = filtered_logs
+                # 窗口末尾的 offset 条是更新的日志，不在本页
+                logs = list(window)[:max(0, len(window) - offset)]
 
             except Exception as e:
                 logger.error(f"读取日志文件失败: {e}")
@@ -602,6 +856,11 @@ class SpiderStatsView(View):
                     'error': f'Spider type not found: {spider_type}'
                 }, status=404)
 
+            cache_key = f'stats:{spider_type}'
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
             stats = adapter.get_stats()
 
             try:
@@ -611,10 +870,11 @@ class SpiderStatsView(View):
                 file_count = 0
                 html_count = 0
 
-                if files_dir and files_dir.exists():
-                    file_count = count_files_recursive(files_dir)
-                if html_dir and html_dir.exists():
-                    html_count = count_files_recursive(html_dir)
+                # 两个目录并行遍历（目录不存在时返回0）
+                file_future = _IO_POOL.submit(count_files_recursive, files_dir)
+                html_future = _IO_POOL.submit(count_files_recursive, html_dir)
+                file_count = file_future.result()
+                html_count = html_future.result()
             except Exception as e:
                 logger.warning(f"统计文件数量失败: {e}")
 
@@ -626,12 +886,12 @@ class SpiderStatsView(View):
             if 'date_range' not in stats:
                 stats['date_range'] = {'earliest': None, 'latest': None}
 
-            return safe_json_response({
+            return cached_json_response(cache_key, {
                 'success': True,
                 'stats': stats,
                 'spider_type': spider_type,
                 'spider_name': adapter.get_name()
-            })
+            }, ttl=5)
 
         except Exception as e:
             logger.error(f"获取爬虫统计失败: {e}")
@@ -642,16 +902,84 @@ class SpiderStatsView(View):
             }, status=500)
 
 
+# 目录遍历等IO密集任务使用的线程池
+_IO_POOL = ThreadPoolExecutor(max_workers=8)
+
+# 健康检查使用的Redis连接池和 PING 结果缓存：(时间戳, 是否连通, 错误信息)
+_HEALTH_REDIS_POOL = None
+_HEALTH_PING_TTL = 2.0
+_health_ping_cache = (0.0, False, None)
+
+
+def _health_redis_ping():
+    """PING 健康检查Redis（复用连接池，结果缓存 _HEALTH_PING_TTL 秒）"""
+    global _HEALTH_REDIS_POOL, _health_ping_cache
+    checked_at, ok, error = _health_ping_cache
+    now = time.monotonic()
+    if now - checked_at < _HEALTH_PING_TTL:
+        return ok, error
+    try:
+        import redis
+        if _HEALTH_REDIS_POOL is None:
+            _HEALTH_REDIS_POOL = redis.ConnectionPool(host='localhost', port=6379, db=0,
+                                                      socket_timeout=2, max_connections=16)
+        redis.Redis(connection_pool=_HEALTH_REDIS_POOL).ping()
+        ok, error = True, None
+    except Exception as e:
+        ok, error = False, str(e)
+    _health_ping_cache = (now, ok, error)
+    return ok, error
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class SpiderHealthView(View):
     """爬虫健康检查API"""
 
+    @staticmethod
+    def _collect_spider_health(st: str):
+        """收集单个爬虫的数据文件、附件目录和运行状态信息"""
+        data_file = _spider_data_file(st)
+        files_dir = _spider_files_dir(st)
+
+        try:
+            data_size = data_file.stat().st_size
+            data_exists = True
+        except OSError:
+            data_size = 0
+            data_exists = False
+
+        file_count = 0
+        try:
+            file_count = count_files_recursive(files_dir)
+        except Exception:
+            pass
+
+        data_info = {
+            'exists': data_exists,
+            'size_bytes': data_size,
+            'size_mb': round(data_size / 1024 / 1024, 2)
+        }
+        dir_info = {
+            'files_dir_exists': files_dir.exists(),
+            'file_count': file_count,
+            'html_count': 0
+        }
+
+        spider_info = None
+        adapter = SpiderManager.get_adapter(st)
+        if adapter:
+            status = adapter.get_status()
+            spider_info = {
+                'name': adapter.get_name(),
+                'status': status.get('status', 'unknown'),
+                'running': status.get('running', False)
+            }
+        return data_info, dir_info, spider_info
+
     def get(self, request):
         try:
             spider_type = request.GET.get('type')
 
-            base_dir = Path(__file__).resolve().parent.parent.parent
-
             health_info = {
                 'redis_connected': False,
                 'data_files': {},
@@ -659,51 +987,20 @@ class SpiderHealthView(View):
                 'spiders': {}
             }
 
-            try:
-                import redis
-                r = redis.Redis(host='localhost', port=6379, db=0, socket_timeout=2)
-                r.ping()
-                health_info['redis_connected'] = True
-            except Exception as e:
-                health_info['redis_error'] = str(e)
-
-            spider_types = ['nhsa', 'wjw']
-            for st in spider_types:
-                if spider_type and st != spider_type:
-                    continue
-
-                data_file = base_dir / 'data' / st / f'{st}_data.json'
-                files_dir = base_dir / 'data' / st / f'{st}_files'
-
-                data_exists = data_file.exists()
-                file_count = 0
-
-                try:
-                    if files_dir.exists():
-                        file_count = count_files_recursive(files_dir)
-                except Exception:
-                    pass
-
-                health_info['data_files'][st] = {
-                    'exists': data_exists,
-                    'size_bytes': data_file.stat().st_size if data_exists else 0,
-                    'size_mb': round(data_file.stat().st_size / 1024 / 1024, 2) if data_exists else 0
-                }
-
-                health_info['file_dirs'][st] = {
-                    'files_dir_exists': files_dir.exists(),
-                    'file_count': file_count,
-                    'html_count': 0
-                }
-
-                adapter = SpiderManager.get_adapter(st)
-                if adapter:
-                    status = adapter.get_status()
-                    health_info['spiders'][st] = {
-                        'name': adapter.get_name(),
-                        'status': status.get('status', 'unknown'),
-                        'running': status.get('running', False)
-                    }
+            # Redis检查与各爬虫的文件统计、状态查询在IO线程池中并行执行
+            ping_future = _IO_POOL.submit(_health_redis_ping)
+            spider_types = [st for st in ['nhsa', 'wjw'] if not spider_type or st == spider_type]
+            for st, (data_info, dir_info, spider_info) in zip(
+                    spider_types, _IO_POOL.map(self._collect_spider_health, spider_types)):
+                health_info['data_files'][st] = data_info
+                health_info['file_dirs'][st] = dir_info
+                if spider_info:
+                    health_info['spiders'][st] = spider_info
+
+            redis_ok, redis_error = ping_future.result()
+            health_info['redis_connected'] = redis_ok
+            if redis_error:
+                health_info['redis_error'] = redis_error
 
             overall_healthy = (
                 health_info['redis_connected'] or
@@ -767,10 +1064,13 @@ def spider_list(request):
     GET /api/v1/spiders/list/
     """
     try:
-        return safe_json_response({
+        cached = get_cached_response('list')
+        if cached is not None:
+            return cached
+        return cached_json_response('list', {
             'success': True,
             'data': get_all_spider_configs()
-        })
+        }, ttl=60)
     except Exception as e:
         logger.error(f"获取爬虫列表失败: {e}")
         return safe_json_response({
@@ -786,7 +1086,6 @@ def spider_detail(request, spider_id):
     GET /api/v1/spiders/{spider_id}/stats/
     """
     try:
-        base_dir = Path(__file__).resolve().parent.parent.parent
         
         config = get_spider_config_by_id(spider_id)
         if not config:
@@ -795,29 +1094,35 @@ def spider_detail(request, spider_id):
                 'error': '爬虫项目不存在'
             }, status=404)
 
+        # 按注册的 spider_id 缓存，控制接口可据此精确清除
+        cache_key = f"detail:{config['spider_id']}"
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
         spider_name = config['spider_name']
         spider_display_name = config['spider_display_name']
         spider_id_value = config['spider_id']
 
-        data_file = base_dir / 'data' / spider_name / f'{spider_name}_data.json'
-        files_dir = base_dir / 'data' / spider_name / f'{spider_name}_files'
+        data_file = _spider_data_file(spider_name)
+        files_dir = _spider_files_dir(spider_name)
 
         collected_links = 0
         crawled_links = 0
         error_count = 0
 
-        if data_file.exists():
-            with open(data_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            collected_links += 1
-                            if data.get('title'):
-                                crawled_links += 1
-                        except json.JSONDecodeError:
-                            pass
+        counts = count_items(data_file) if data_file.exists() else None
+        if counts is not None:
+            collected_links, crawled_links = counts
+        elif data_file.exists():
+            for _, line in iter_ndjson_lines(data_file):
+                try:
+                    data = _json_loads(line)
+                    collected_links += 1
+                    if data.get('title'):
+                        crawled_links += 1
+                except json.JSONDecodeError:
+                    pass
 
         redis_manager = get_spider_redis_manager(spider_name)
         pending_links = redis_manager.get_links_queue_size() if redis_manager else 0
@@ -827,7 +1132,7 @@ def spider_detail(request, spider_id):
 
         file_count = count_files_recursive(files_dir) if files_dir.exists() else 0
 
-        return safe_json_response({
+        return cached_json_response(cache_key, {
             'success': True,
             'data': {
                 'spider_id': spider_id_value or spider_id,
@@ -840,7 +1145,7 @@ def spider_detail(request, spider_id):
                 'error_count': error_count,
                 'last_updated': last_updated
             }
-        })
+        }, ttl=3)
 
     except Exception as e:
         logger.error(f"获取爬虫详情失败: {e}")
@@ -865,8 +1170,7 @@ def download_config(request, spider_id):
             }, status=404)
 
         spider_name = config['spider_name']
-        base_dir = Path(__file__).resolve().parent.parent.parent
-        data_file = base_dir / 'data' / spider_name / f'{spider_name}_data.json'
+        data_file = _spider_data_file(spider_name)
 
         if not data_file.exists():
             return safe_json_response({
@@ -874,12 +1178,24 @@ def download_config(request, spider_id):
                 'error': '数据文件不存在'
             }, status=404)
 
-        response = FileResponse(
+        accel_prefix = getattr(settings, 'SPIDER_X_ACCEL_REDIRECT_PREFIX', '')
+        if accel_prefix:
+            # 由 nginx 直接 sendfile 发送，不占用Python工作进程
+            response = HttpResponse(content_type='application/json')
+            response['X-Accel-Redirect'] = (
+                f"{accel_prefix.rstrip('/')}/{quote(spider_name)}/{quote(data_file.name)}"
+            )
+            response['Content-Disposition'] = f'attachment; filename="{spider_name}_data.json"'
+            return response
+
+        # 真实文件对象交给 FileResponse，WSGI 服务器可经 wsgi.file_wrapper 走 sendfile；
+        # Content-Disposition/Content-Length 由 Django 生成
+        return FileResponse(
             open(data_file, 'rb'),
+            as_attachment=True,
+            filename=f'{spider_name}_data.json',
             content_type='application/json'
         )
-        response['Content-Disposition'] = f'attachment; filename="{spider_name}_data.json"'
-        return response
 
     except Exception as e:
         logger.error(f"下载配置文件失败: {e}")
@@ -904,21 +1220,21 @@ def download_item_zip(request, spider_id, item_id):
             }, status=404)
 
         spider_name = config['spider_name']
-        base_dir = Path(__file__).resolve().parent.parent.parent
-        files_dir = base_dir / 'data' / spider_name / f'{spider_name}_files'
+        files_dir = _spider_files_dir(spider_name)
         item_dir = files_dir / str(item_id)
 
-        if not item_dir.exists() or not item_dir.is_dir():
+        # isdir 只做一次 stat，路径不存在时同样返回 False
+        if not os.path.isdir(item_dir):
             return safe_json_response({
                 'success': False,
                 'error': 'item文件夹不存在'
             }, status=404)
 
-        zip_buffer = create_zip_from_directory(item_dir, str(item_id))
         zip_filename = f'{spider_name}_{item_id}.zip'
 
-        response = FileResponse(
-            zip_buffer,
+        # 边打包边发送，不在内存或临时文件中缓存整个压缩包
+        response = StreamingHttpResponse(
+            stream_zip_from_directory(item_dir, str(item_id)),
             content_type='application/zip'
         )
         response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
@@ -933,21 +1249,31 @@ def download_item_zip(request, spider_id, item_id):
         }, status=500)
 
 
+# 批量下载请求体上限（item_ids 列表）
+BATCH_DOWNLOAD_MAX_BODY = 1024 * 1024
+
+
 @csrf_exempt
+@require_POST
 def batch_download_items(request, spider_id):
     """
     批量下载多个item_id文件夹的ZIP包
     POST /api/v1/spiders/{spider_id}/items/batch-download/
     Body: {"item_ids": ["123", "456", "789"]}
     """
-    if request.method != 'POST':
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > BATCH_DOWNLOAD_MAX_BODY:
         return safe_json_response({
             'success': False,
-            'error': '仅支持POST请求'
-        }, status=405)
+            'error': '请求体过大'
+        }, status=413)
 
     try:
-        body = json.loads(request.body)
+        # orjson 直接解析 bytes，不先解码为 str
+        body = _json_loads(request.body)
         item_ids = body.get('item_ids', [])
 
         if not item_ids:
@@ -970,8 +1296,7 @@ def batch_download_items(request, spider_id):
             }, status=404)
 
         spider_name = config['spider_name']
-        base_dir = Path(__file__).resolve().parent.parent.parent
-        files_dir = base_dir / 'data' / spider_name / f'{spider_name}_files'
+        files_dir = _spider_files_dir(spider_name)
 
         if not files_dir.exists():
             return safe_json_response({
@@ -979,9 +1304,9 @@ def batch_download_items(request, spider_id):
                 'error': '文件目录不存在'
             }, status=404)
 
-        zip_buffer, missing_items = create_batch_zip(files_dir, item_ids, spider_name)
+        missing_items = find_missing_items(files_dir, item_ids)
 
-        if missing_items and not zip_buffer.getvalue():
+        if missing_items and len(missing_items) == len(item_ids):
             return safe_json_response({
                 'success': False,
                 'error': '部分item_id不存在',
@@ -991,8 +1316,8 @@ def batch_download_items(request, spider_id):
         # timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         zip_filename = f'{spider_name}_batch_{len(item_ids)}.zip'
 
-        response = FileResponse(
-            zip_buffer,
+        response = StreamingHttpResponse(
+            stream_batch_zip(files_dir, item_ids),
             content_type='application/zip'
         )
         response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
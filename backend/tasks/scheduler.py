@@ -2,9 +2,12 @@
 定时任务管理模块
 """
 
+import heapq
+import itertools
 import json
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Callable
 from croniter import croniter
@@ -63,19 +66,28 @@ class TaskScheduler:
         self.tasks: Dict[str, ScheduledTask] = {}
         self.running = False
         self.scheduler_thread: Optional[threading.Thread] = None
+        # 按单调时钟截止时间排序的小顶堆 (deadline, 序号, task)，删除的任务在出堆时跳过
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        # 任务在线程池中执行，耗时任务不阻塞调度循环
+        self._pool = ThreadPoolExecutor(thread_name_prefix='scheduled-task')
         self._initialized = True
     
     def add_task(self, spider_type: str, cron_expression: str, task_id: str = None) -> ScheduledTask:
         """添加定时任务"""
         task = ScheduledTask(spider_type, cron_expression, task_id)
-        self.tasks[task.task_id] = task
+        with self._cond:
+            self.tasks[task.task_id] = task
+            self._push(task, task.next_run)
         return task
     
     def remove_task(self, task_id: str) -> bool:
         """删除定时任务"""
-        if task_id in self.tasks:
-            del self.tasks[task_id]
-            return True
+        with self._cond:
+            if task_id in self.tasks:
+                del self.tasks[task_id]
+                return True
         return False
     
     def get_task(self, task_id: str) -> Optional[ScheduledTask]:
@@ -96,27 +108,64 @@ class TaskScheduler:
     
     def stop(self):
         """停止调度器"""
-        self.running = False
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
         print("Task scheduler stopped")
     
+    def _push(self, task: ScheduledTask, run_at: datetime):
+        """任务入堆并唤醒调度线程（调用方需持有 self._cond）
+
+        cron 时间按墙上时钟计算，入堆时换算为 time.monotonic() 截止时间，
+        系统时间被调整（NTP、手动修改）时不会导致任务集中触发或长时间不触发
+        """
+        deadline = time.monotonic() + (run_at - datetime.now()).total_seconds()
+        heapq.heappush(self._heap, (deadline, next(self._seq), task))
+        self._cond.notify()
+    
     def _run_scheduler(self):
-        """调度器主循环"""
+        """调度器主循环：等待到堆顶任务的执行时间，没有到期任务时不轮询"""
         while self.running:
-            now = datetime.now()
+            with self._cond:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, _, task = self._heap[0]
+                delta = deadline - time.monotonic()
+                if delta > 0:
+                    self._cond.wait(timeout=delta)
+                    continue
+                heapq.heappop(self._heap)
+                # 已删除或被同ID新任务替换的旧条目
+                if self.tasks.get(task.task_id) is not task:
+                    continue
+                task.status = 'running'
             
-            for task_id, task in list(self.tasks.items()):
-                if task.next_run <= now and task.status != 'running':
-                    print(f"Executing task {task_id}: {task.spider_type}")
-                    task.execute()
-            
-            time.sleep(1)
+            print(f"Executing task {task.task_id}: {task.spider_type}")
+            self._pool.submit(self._execute_task, task)
+    
+    def _execute_task(self, task: ScheduledTask):
+        """在线程池中执行任务，完成后按新的执行时间重新入堆"""
+        try:
+            succeeded = task.execute()
+        except Exception:
+            succeeded = False
+        if succeeded:
+            next_run = task.next_run
+        else:
+            # 执行失败时 1 秒后重试
+            next_run = datetime.now() + timedelta(seconds=1)
+        
+        with self._cond:
+            if self.tasks.get(task.task_id) is task:
+                self._push(task, next_run)
     
     def get_schedule_status(self) -> Dict[str, Dict]:
         """获取调度状态"""
         status = {}
-        for task_id, task in self.tasks.items():
+        for task_id, task in list(self.tasks.items()):
             status[task_id] = {
                 'spider_type': task.spider_type,
                 'cron_expression': task.cron_expression,
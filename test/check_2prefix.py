@@ -1,26 +1,34 @@
 from pathlib import Path
 import json
+import mmap
 
 data_file = Path('data/nhsa/nhsa_data.json')
-lines = data_file.read_text(encoding='utf-8').strip().split('\n')
 
-def has_2_prefix(name):
-    """检查是否以'2'开头但不是年份（如'2024'）"""
-    if not name.startswith('2'):
+def name_start(path):
+    """文件名在路径中的起始下标（兼容 / 和 \\ 分隔符）"""
+    return max(path.rfind('/'), path.rfind('\\')) + 1
+
+def has_2_prefix(path, i):
+    """检查文件名是否以'2'开头但不是年份（如'2024'）"""
+    if path[i:i + 1] != '2':
         return False
-    if len(name) > 1 and name[1].isdigit():
+    if path[i + 1:i + 2].isdigit():
         return False  # 是年份，如"2024年"
     return True  # 是我们要删除的"2"前缀
 
 count_with_2 = 0
-for i, line in enumerate(lines):
-    data = json.loads(line)
-    if 'file_paths' in data:
-        for p in data['file_paths']:
-            filename = Path(p).name
-            if has_2_prefix(filename):
-                count_with_2 += 1
-                if count_with_2 <= 10:
-                    print(f'Line {i+1}: {filename[:60]}')
+# mmap 按需分页读取，逐行解析 bytes，不把整个文件解码为 str
+with open(data_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    for i, line in enumerate(iter(mm.readline, b'')):
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        if 'file_paths' in data:
+            for p in data['file_paths']:
+                start = name_start(p)
+                if has_2_prefix(p, start):
+                    count_with_2 += 1
+                    if count_with_2 <= 10:
+                        print(f'Line {i+1}: {p[start:start + 60]}')
 
 print(f'\nTotal paths with 2 prefix (not year): {count_with_2}')
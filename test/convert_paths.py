@@ -2,9 +2,30 @@
 将 nhsa_data.json 中的绝对路径转换为相对路径
 """
 import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DATA_FILE = Path(__file__).resolve().parent.parent / 'data' / 'nhsa' / 'nhsa_data.json'
+# 每个分片至少处理的字节数，文件较小时不启动进程池
+SHARD_MIN_SIZE = 8 * 1024 * 1024
+
+
+def _loads(line: bytes):
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def _dumps(data) -> bytes:
+    """orjson 默认输出 UTF-8 不转义中文，与 ensure_ascii=False 一致"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
 
 
 def to_relative_path(absolute_path: str) -> str:
@@ -18,6 +39,57 @@ def to_relative_path(absolute_path: str) -> str:
         return str(abs_path).replace('\\', '/')
 
 
+def _shard_bounds(path: Path, count: int) -> list:
+    """按换行边界把文件切成 count 段，返回 [(start, end), ...]"""
+    size = path.stat().st_size
+    offsets = [0]
+    with open(path, 'rb') as f:
+        for k in range(1, count):
+            f.seek(max(size * k // count, offsets[-1]))
+            f.readline()
+            offsets.append(min(f.tell(), size))
+    offsets.append(size)
+    return [(a, b) for a, b in zip(offsets, offsets[1:]) if b > a]
+
+
+def _convert_shard(args) -> tuple:
+    """转换 [start, end) 字节范围内的记录并写入分片临时文件
+
+    Returns:
+        (读取行数, 记录数, 修改记录数, 转换路径数, [(分片内行号, 错误信息), ...])
+    """
+    start, end, part_path = args
+    total = 0
+    converted_count = 0
+    path_count = 0
+    errors = []
+
+    with open(DATA_FILE, 'rb') as fin, open(part_path, 'wb') as fout:
+        fin.seek(start)
+        i = 0
+        while fin.tell() < end:
+            line = fin.readline().rstrip(b'\r\n')
+            i += 1
+            if not line.strip():
+                continue
+            total += 1
+            try:
+                data = _loads(line)
+                if 'file_paths' in data:
+                    original_paths = data['file_paths']
+                    new_paths = [to_relative_path(p) for p in original_paths]
+                    if original_paths != new_paths:
+                        data['file_paths'] = new_paths
+                        converted_count += 1
+                        path_count += len(original_paths)
+                        line = _dumps(data)
+            except json.JSONDecodeError as e:
+                errors.append((i, str(e)))
+            fout.write(line + b'\n')
+
+    return i, total, converted_count, path_count, errors
+
+
 def convert_data_file():
     if not DATA_FILE.exists():
         print(f"文件不存在: {DATA_FILE}")
@@ -25,31 +97,41 @@ def convert_data_file():
 
     print(f"读取文件: {DATA_FILE}")
 
-    lines = DATA_FILE.read_text(encoding='utf-8').strip().split('\n')
-    print(f"共 {len(lines)} 条记录")
+    # 按换行边界分片，各进程并行解析转换并写入分片临时文件，最后按顺序拼接
+    workers = max(1, min(os.cpu_count() or 1, DATA_FILE.stat().st_size // SHARD_MIN_SIZE))
+    shards = _shard_bounds(DATA_FILE, workers)
+    tasks = [(start, end, DATA_FILE.with_suffix(f'.json.part{k}'))
+             for k, (start, end) in enumerate(shards)]
+    print(f"  分片数: {len(tasks)}")
+
+    if len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(_convert_shard, tasks))
+    else:
+        results = [_convert_shard(task) for task in tasks]
 
+    total = 0
     converted_count = 0
     path_count = 0
+    line_base = 0
+    for shard_lines, shard_total, shard_converted, shard_paths, errors in results:
+        total += shard_total
+        converted_count += shard_converted
+        path_count += shard_paths
+        # 分片内行号加上前面分片的行数
+        for i, message in errors:
+            print(f"  JSON解析错误 at line {line_base + i}: {message}")
+        line_base += shard_lines
 
-    for i, line in enumerate(lines):
-        try:
-            data = json.loads(line)
-            if 'file_paths' in data:
-                original_paths = data['file_paths']
-                new_paths = [to_relative_path(p) for p in original_paths]
-                if original_paths != new_paths:
-                    data['file_paths'] = new_paths
-                    converted_count += 1
-                    path_count += len(original_paths)
-                    lines[i] = json.dumps(data, ensure_ascii=False)
-
-            if (i + 1) % 50 == 0:
-                print(f"  已处理 {i + 1}/{len(lines)} 条记录...")
-        except json.JSONDecodeError as e:
-            print(f"  JSON解析错误 at line {i + 1}: {e}")
-            continue
+    tmp_path = DATA_FILE.with_suffix('.json.tmp')
+    with open(tmp_path, 'wb') as fout:
+        for _, _, part_path in tasks:
+            with open(part_path, 'rb') as fin:
+                shutil.copyfileobj(fin, fout)
+            part_path.unlink()
 
     print(f"\n转换完成:")
+    print(f"  共 {total} 条记录")
     print(f"  修改记录数: {converted_count}")
     print(f"  转换路径数: {path_count}")
 
@@ -59,7 +141,7 @@ def convert_data_file():
     DATA_FILE.rename(backup_path)
     print(f"  备份文件: {backup_path}")
 
-    DATA_FILE.write_text('\n'.join(lines), encoding='utf-8')
+    os.replace(tmp_path, DATA_FILE)
     print(f"  新文件: {DATA_FILE}")
 
 
@@ -1,12 +1,21 @@
-from pathlib import Path
+import os
 
-base = Path('data/nhsa/nhsa_files')
+base = os.path.join('data', 'nhsa', 'nhsa_files')
 count = 0
 prefix_files = []
-for f in base.rglob('*'):
-    if f.is_file() and f.name.startswith('2'):
-        count += 1
-        prefix_files.append(str(f))
+# 用 os.scandir 显式栈遍历，DirEntry 自带文件类型，无需逐个 stat
+stack = [base]
+while stack:
+    try:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name[0] == '2' and entry.is_file():
+                    count += 1
+                    prefix_files.append(entry.path)
+    except OSError:
+        continue
 
 print(f'Files with 2 prefix: {count}')
 for f in prefix_files[:10]:
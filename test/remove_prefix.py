@@ -2,11 +2,28 @@
 删除 file_paths 中的文件名前缀 "2"
 """
 import json
+import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DATA_FILE = Path(__file__).resolve().parent.parent / 'data' / 'nhsa' / 'nhsa_data.json'
 
 
+def _loads(line: str):
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def _dumps(data) -> str:
+    """orjson 默认输出 UTF-8 不转义中文，与 ensure_ascii=False 一致"""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
+
+
 def remove_prefix_from_filenames():
     if not DATA_FILE.exists():
         print(f"文件不存在: {DATA_FILE}")
@@ -14,40 +31,46 @@ def remove_prefix_from_filenames():
 
     print(f"读取文件: {DATA_FILE}")
 
-    lines = DATA_FILE.read_text(encoding='utf-8').strip().split('\n')
-    print(f"共 {len(lines)} 条记录")
-
+    # 逐行读取并写入临时文件，内存占用与单行大小相当
+    tmp_path = DATA_FILE.with_suffix('.json.tmp')
+    total = 0
     modified_count = 0
     path_count = 0
 
-    for i, line in enumerate(lines):
-        try:
-            data = json.loads(line)
-            if 'file_paths' in data:
-                original_paths = data['file_paths']
-                new_paths = []
-                for p in original_paths:
-                    filename = Path(p).name
-                    if filename.startswith('2') and len(filename) > 1:
-                        new_filename = filename[1:]
-                        new_path = str(Path(p).parent / new_filename)
-                        new_paths.append(new_path)
-                        path_count += 1
-                    else:
-                        new_paths.append(p)
-
-                if original_paths != new_paths:
-                    data['file_paths'] = new_paths
-                    modified_count += 1
-                    lines[i] = json.dumps(data, ensure_ascii=False)
-
-            if (i + 1) % 50 == 0:
-                print(f"  已处理 {i + 1}/{len(lines)} 条记录...")
-        except json.JSONDecodeError as e:
-            print(f"  JSON解析错误 at line {i + 1}: {e}")
-            continue
+    with open(DATA_FILE, 'r', encoding='utf-8') as fin, \
+            open(tmp_path, 'w', encoding='utf-8') as fout:
+        for i, line in enumerate(fin):
+            line = line.rstrip('\r\n')
+            if not line.strip():
+                continue
+            total += 1
+            try:
+                data = _loads(line)
+                if 'file_paths' in data:
+                    original_paths = data['file_paths']
+                    new_paths = []
+                    for p in original_paths:
+                        # 直接按分隔符定位文件名，不构造 Path 对象
+                        start = max(p.rfind('/'), p.rfind('\\')) + 1
+                        if p[start:start + 1] == '2' and len(p) - start > 1:
+                            new_paths.append(p[:start] + p[start + 1:])
+                            path_count += 1
+                        else:
+                            new_paths.append(p)
+
+                    if original_paths != new_paths:
+                        data['file_paths'] = new_paths
+                        modified_count += 1
+                        line = _dumps(data)
+
+                if total % 50 == 0:
+                    print(f"  已处理 {total} 条记录...")
+            except json.JSONDecodeError as e:
+                print(f"  JSON解析错误 at line {i + 1}: {e}")
+            fout.write(line + '\n')
 
     print(f"\n处理完成:")
+    print(f"  共 {total} 条记录")
     print(f"  修改记录数: {modified_count}")
     print(f"  删除前缀的路径数: {path_count}")
 
@@ -57,9 +80,8 @@ def remove_prefix_from_filenames():
     DATA_FILE.rename(backup_path)
     print(f"  备份文件: {backup_path}")
 
-    DATA_FILE.write_text('\n'.join(lines), encoding='utf-8')
+    os.replace(tmp_path, DATA_FILE)
     print(f"  新文件: {DATA_FILE}")
 
-
 if __name__ == '__main__':
     remove_prefix_from_filenames()
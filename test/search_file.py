@@ -1,12 +1,24 @@
 from pathlib import Path
 import json
+import mmap
 
 data_file = Path('data/nhsa/nhsa_data.json')
-lines = data_file.read_text(encoding='utf-8').strip().split('\n')
+keyword = '骨、软骨'.encode('utf-8')
 
-for i, line in enumerate(lines):
-    if '骨、软骨' in line:
-        data = json.loads(line)
-        print(f'Line {i+1}:')
+# 直接在 mmap 上查找关键字的 UTF-8 字节，只解析命中的行
+with open(data_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    line_num = 1
+    counted = 0
+    pos = mm.find(keyword)
+    while pos != -1:
+        start = mm.rfind(b'\n', 0, pos) + 1
+        end = mm.find(b'\n', pos)
+        if end == -1:
+            end = len(mm)
+        line_num += mm[counted:start].count(b'\n')
+        counted = start
+        data = json.loads(mm[start:end])
+        print(f'Line {line_num}:')
         print(f'  标题: {data.get("标题", "")}')
         print(f'  file_paths: {data.get("file_paths", [])}')
+        pos = mm.find(keyword, end)
@@ -12,23 +12,107 @@
     python test_api_endpoints.py
 
 依赖：
-    pip install requests
+    pip install "httpx[http2]>=0.25"
+    pip install orjson  # 可选，加速 JSON 解析
 """
 
+import asyncio
+import json
 import os
+import socket
 import sys
-import time
-import requests
-from typing import List, Optional
+import httpx
+from itertools import islice
+from pathlib import Path
+from typing import List, Optional, Tuple
 from datetime import datetime
 
-BASE_URL = "http://localhost:8000/api/v1/spiders"
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-SPIDER_ID = "nhsa_2026"
-TEST_ITEM_IDS = ["1769172544270", "1769173209899", "1769173254861"]
+# 响应解析/请求体序列化优先使用 orjson；orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
 
+# 直接使用 127.0.0.1，避免每次新建连接时解析 localhost（可能先尝试 IPv6）
+BASE_URL = "http://127.0.0.1:8000/api/v1/spiders"
 
-def test_spider_list() -> bool:
+SPIDER_ID = "nhsa_2026"
+TEST_ITEM_IDS = ["1769172544270", "1769173209899", "1769173254861"]
+# 批量下载压测用的 item_id 列表，为空时跳过
+STRESS_ITEM_IDS: List[str] = []
+# 每个批量请求最多包含的 item 数，避免单个请求打包过久超时
+BATCH_CHUNK_SIZE = 200
+
+# 连接池大小与测试并发度一致；连接超时较短，读取超时默认 30 秒，下载接口单独放宽
+MAX_CONNECTIONS = 16
+CONNECT_TIMEOUT = 3
+# 同时发出的请求数上限；仅在服务端返回 429 时才等待重试，不做固定间隔的等待
+MAX_CONCURRENT_REQUESTS = 10
+# 小 JSON 请求关闭 Nagle 算法，减少首字节延迟
+SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+# 下载文件保存目录，导入时创建一次
+DOWNLOAD_DIR = Path("./downloads")
+DOWNLOAD_DIR.mkdir(exist_ok=True)
+# 下载时每次写入文件的块大小
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """限制并发请求数，服务端返回 429 时按 Retry-After 等待后重试一次"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_concurrent: int = MAX_CONCURRENT_REQUESTS):
+        self._transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self._semaphore:
+            response = await self._transport.handle_async_request(request)
+            if response.status_code != 429:
+                return response
+            await response.aclose()
+            try:
+                delay = float(response.headers.get("Retry-After", "1"))
+            except ValueError:
+                delay = 1.0
+            print(f"服务端限流 (429)，{delay} 秒后重试: {request.url}")
+            await asyncio.sleep(delay)
+            return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_client() -> httpx.AsyncClient:
+    """创建所有测试共用的客户端（持久连接池）"""
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    return httpx.AsyncClient(
+        transport=RateLimitedTransport(httpx.AsyncHTTPTransport(http2=True, limits=limits, socket_options=SOCKET_OPTIONS)),
+        timeout=httpx.Timeout(30, connect=CONNECT_TIMEOUT),
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+
+async def _save_stream(response: httpx.Response, filepath: str) -> Tuple[int, bytes]:
+    """把流式响应体分块写入文件，返回 (写入字节数, 第一个数据块)，无需再 stat 文件"""
+    total = 0
+    head = b""
+    with open(filepath, "wb") as f:
+        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+            if not head:
+                head = chunk
+            total += f.write(chunk)
+    return total, head
+
+
+async def test_spider_list(client: httpx.AsyncClient) -> bool:
     """
     测试接口 1：获取爬虫项目列表
 
@@ -45,11 +129,11 @@ def test_spider_list() -> bool:
     print(f"请求方法: GET")
 
     try:
-        response = requests.get(url, timeout=30)
+        response = await client.get(url)
         print(f"响应状态码: {response.status_code}")
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data.get("success"):
                 spiders = data.get("data", [])
                 print(f"获取到 {len(spiders)} 个爬虫项目：")
@@ -66,12 +150,12 @@ def test_spider_list() -> bool:
             print(f"请求失败，状态码: {response.status_code}")
             return False
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"请求异常: {e}")
         return False
 
 
-def test_spider_detail(spider_id: str) -> bool:
+async def test_spider_detail(client: httpx.AsyncClient, spider_id: str) -> bool:
     """
     测试接口 2：获取爬虫项目统计信息
 
@@ -89,11 +173,11 @@ def test_spider_detail(spider_id: str) -> bool:
     print(f"spider_id: {spider_id}")
 
     try:
-        response = requests.get(url, timeout=30)
+        response = await client.get(url)
         print(f"响应状态码: {response.status_code}")
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data.get("success"):
                 stats = data.get("data", {})
                 print("\n统计信息：")
@@ -116,12 +200,12 @@ def test_spider_detail(spider_id: str) -> bool:
             print(f"请求失败，状态码: {response.status_code}")
             return False
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"请求异常: {e}")
         return False
 
 
-def test_download_config(spider_id: str, output_dir: str = "./downloads") -> bool:
+async def test_download_config(client: httpx.AsyncClient, spider_id: str, output_dir: Path = DOWNLOAD_DIR) -> bool:
     """
     测试接口 3：下载爬虫项目 JSON 数据文件
 
@@ -138,55 +222,54 @@ def test_download_config(spider_id: str, output_dir: str = "./downloads") -> boo
     print(f"请求方法: GET")
     print(f"spider_id: {spider_id}")
 
-    os.makedirs(output_dir, exist_ok=True)
-
     try:
-        response = requests.get(url, timeout=30)
-        print(f"响应状态码: {response.status_code}")
-
-        if response.status_code == 200:
-            content_type = response.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                content_text = response.text.strip()
-                if content_text.startswith('{') and content_text.endswith('}'):
-                    try:
-                        data = response.json()
-                        if data.get("success") is False:
-                            print(f"请求失败: {data.get('error')}")
-                            return False
-                    except requests.exceptions.JSONDecodeError:
-                        pass
-
-            filename = response.headers.get("Content-Disposition", "").split("filename=")[-1].strip('"')
-            if not filename:
-                filename = f"{spider_id}_data.json"
-
-            filepath = os.path.join(output_dir, filename)
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-
-            file_size = os.path.getsize(filepath)
-            print(f"数据文件已保存: {filepath}")
-            print(f"文件大小: {file_size} 字节")
-
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read(500)
-                print(f"数据内容预览 (前500字符): {content[:500]}...")
-            return True
+        # 流式接收响应体并分块写入文件，内存占用与数据文件大小无关
+        async with client.stream("GET", url) as response:
+            print(f"响应状态码: {response.status_code}")
+
+            if response.status_code == 200:
+                filename = response.headers.get("Content-Disposition", "").split("filename=")[-1].strip('"')
+                if not filename:
+                    filename = f"{spider_id}_data.json"
+
+                filepath = os.path.join(output_dir, filename)
+                file_size, head = await _save_stream(response, filepath)
+
+                # 错误响应是单个很小的 JSON 对象，只有整个响应体都在首块内时才需要检查
+                content_type = response.headers.get("Content-Type", "")
+                if "application/json" in content_type and file_size == len(head):
+                    content_text = head.strip()
+                    if content_text.startswith(b'{') and content_text.endswith(b'}'):
+                        try:
+                            data = _json_loads(content_text)
+                            if data.get("success") is False:
+                                os.remove(filepath)
+                                print(f"请求失败: {data.get('error')}")
+                                return False
+                        except json.JSONDecodeError:
+                            pass
+
+                print(f"数据文件已保存: {filepath}")
+                print(f"文件大小: {file_size} 字节")
+
+                # 预览直接取自首个数据块，不再重新打开文件
+                content = head.decode("utf-8", errors="ignore")[:500]
+                print(f"数据内容预览 (前500字符): {content}...")
+                return True
 
-        elif response.status_code == 404:
-            print(f"数据文件不存在: {spider_id}")
-            return False
-        else:
-            print(f"请求失败，状态码: {response.status_code}")
-            return False
+            elif response.status_code == 404:
+                print(f"数据文件不存在: {spider_id}")
+                return False
+            else:
+                print(f"请求失败，状态码: {response.status_code}")
+                return False
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"请求异常: {e}")
         return False
 
 
-def test_download_item_zip(spider_id: str, item_id: str, output_dir: str = "./downloads") -> bool:
+async def test_download_item_zip(client: httpx.AsyncClient, spider_id: str, item_id: str, output_dir: Path = DOWNLOAD_DIR) -> bool:
     """
     测试接口 4：下载单个 item 的 ZIP 文件包
 
@@ -204,46 +287,46 @@ def test_download_item_zip(spider_id: str, item_id: str, output_dir: str = "./do
     print(f"spider_id: {spider_id}")
     print(f"item_id: {item_id}")
 
-    os.makedirs(output_dir, exist_ok=True)
-
     try:
-        response = requests.get(url, timeout=60)
-        print(f"响应状态码: {response.status_code}")
-
-        if response.status_code == 200:
-            content_type = response.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                data = response.json()
-                if data.get("success") is False:
-                    print(f"请求失败: {data.get('error')}")
-                    return False
-
-            filename = response.headers.get("Content-Disposition", "").split("filename=")[-1].strip('"')
-            if not filename:
-                filename = f"{spider_id}_{item_id}.zip"
-
-            filepath = os.path.join(output_dir, filename)
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-
-            file_size = os.path.getsize(filepath)
-            print(f"文件已保存: {filepath}")
-            print(f"文件大小: {file_size} 字节")
-            return True
-        elif response.status_code == 404:
-            error_data = response.json()
-            print(f"请求失败: {error_data.get('error')}")
-            return False
-        else:
-            print(f"请求失败，状态码: {response.status_code}")
-            return False
+        # 流式接收 ZIP 并分块写入文件，不在内存中保留整个压缩包
+        async with client.stream("GET", url, timeout=httpx.Timeout(60, connect=CONNECT_TIMEOUT)) as response:
+            print(f"响应状态码: {response.status_code}")
+
+            if response.status_code == 200:
+                content_type = response.headers.get("Content-Type", "")
+                if "application/json" in content_type:
+                    await response.aread()
+                    data = _json_loads(response.content)
+                    if data.get("success") is False:
+                        print(f"请求失败: {data.get('error')}")
+                        return False
+
+                filename = response.headers.get("Content-Disposition", "").split("filename=")[-1].strip('"')
+                if not filename:
+                    filename = f"{spider_id}_{item_id}.zip"
+
+                filepath = os.path.join(output_dir, filename)
+                file_size, _ = await _save_stream(response, filepath)
+
+                print(f"文件已保存: {filepath}")
+                print(f"文件大小: {file_size} 字节")
+                return True
+            elif response.status_code == 404:
+                await response.aread()
+                error_data = _json_loads(response.content)
+                print(f"请求失败: {error_data.get('error')}")
+                return False
+            else:
+                print(f"请求失败，状态码: {response.status_code}")
+                return False
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"请求异常: {e}")
         return False
 
 
-def test_batch_download_items(spider_id: str, item_ids: List[str], output_dir: str = "./downloads") -> bool:
+async def test_batch_download_items(client: httpx.AsyncClient, spider_id: str, item_ids: List[str], output_dir: Path = DOWNLOAD_DIR,
+                                    filename: Optional[str] = None) -> bool:
     """
     测试接口 5：批量下载多个 item 的 ZIP 文件包
 
@@ -264,57 +347,87 @@ def test_batch_download_items(spider_id: str, item_ids: List[str], output_dir: s
     payload = {"item_ids": item_ids}
     print(f"请求体: {payload}")
 
-    os.makedirs(output_dir, exist_ok=True)
-
     try:
-        response = requests.post(url, json=payload, timeout=120)
-        print(f"响应状态码: {response.status_code}")
-
-        if response.status_code == 200:
-            content_type = response.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                data = response.json()
-                if data.get("success") is False:
-                    print(f"请求失败: {data.get('error')}")
-                    if "missing_item_ids" in data:
-                        print(f"缺失的 item_ids: {data['missing_item_ids']}")
-                    return False
-
-            filename = response.headers.get("Content-Disposition", "").split("filename=")[-1].strip('"')
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{spider_id}_batch_{timestamp}.zip"
-
-            filepath = os.path.join(output_dir, filename)
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-
-            file_size = os.path.getsize(filepath)
-            print(f"文件已保存: {filepath}")
-            print(f"文件大小: {file_size} 字节")
-            print(f"包含 {len(item_ids)} 个项目的文件")
-            return True
-        elif response.status_code == 400:
-            error_data = response.json()
-            print(f"请求失败: {error_data.get('error')}")
-            return False
-        elif response.status_code == 404:
-            error_data = response.json()
-            print(f"请求失败: {error_data.get('error')}")
-            return False
-        else:
-            print(f"请求失败，状态码: {response.status_code}")
-            return False
+        # 流式接收 ZIP 并分块写入文件，不在内存中保留整个压缩包
+        async with client.stream(
+            "POST", url,
+            content=_json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=httpx.Timeout(120, connect=CONNECT_TIMEOUT),
+        ) as response:
+            print(f"响应状态码: {response.status_code}")
+
+            if response.status_code == 200:
+                content_type = response.headers.get("Content-Type", "")
+                if "application/json" in content_type:
+                    await response.aread()
+                    data = _json_loads(response.content)
+                    if data.get("success") is False:
+                        print(f"请求失败: {data.get('error')}")
+                        if "missing_item_ids" in data:
+                            print(f"缺失的 item_ids: {data['missing_item_ids']}")
+                        return False
+
+                filename = filename or response.headers.get("Content-Disposition", "").split("filename=")[-1].strip('"')
+                if not filename:
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    filename = f"{spider_id}_batch_{timestamp}.zip"
+
+                filepath = os.path.join(output_dir, filename)
+                file_size, _ = await _save_stream(response, filepath)
+
+                print(f"文件已保存: {filepath}")
+                print(f"文件大小: {file_size} 字节")
+                print(f"包含 {len(item_ids)} 个项目的文件")
+                return True
+            elif response.status_code in (400, 404):
+                await response.aread()
+                error_data = _json_loads(response.content)
+                print(f"请求失败: {error_data.get('error')}")
+                return False
+            else:
+                print(f"请求失败，状态码: {response.status_code}")
+                return False
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"请求异常: {e}")
         return False
 
 
-def run_all_tests() -> dict:
+async def stress_download(client: httpx.AsyncClient, spider_id: str, item_ids: List[str],
+                          chunk_size: int = BATCH_CHUNK_SIZE) -> bool:
+    """
+    批量下载压测：item_ids 按 chunk_size 分组，每组一个批量请求，各组并发执行
+    """
+    it = iter(item_ids)
+    chunks = list(iter(lambda: list(islice(it, chunk_size)), []))
+    results = await asyncio.gather(*(
+        # 同样大小的分组服务端返回的文件名相同，按分组序号区分
+        test_batch_download_items(client, spider_id, chunk, filename=f"{spider_id}_batch_part{k}.zip")
+        for k, chunk in enumerate(chunks)
+    ))
+    return all(results)
+
+
+async def test_parallel_item_downloads(client: httpx.AsyncClient, spider_id: str, item_ids: List[str]) -> bool:
+    """
+    并发逐个下载多个 item（接口 4），与批量接口的耗时做对比
+
+    请求共用客户端的连接池（HTTPS 下经 HTTP/2 在同一连接上多路复用），
+    并发数受 MAX_CONNECTIONS 和 MAX_CONCURRENT_REQUESTS 限制，不会压垮开发服务器
+    """
+    results = await asyncio.gather(*(
+        test_download_item_zip(client, spider_id, item_id) for item_id in item_ids
+    ))
+    return all(results)
+
+
+async def run_all_tests() -> dict:
     """
     运行所有 API 测试用例
 
+    各接口测试互不依赖，通过 asyncio.gather 并发执行，总耗时约为最慢的一个
+
     Returns:
         dict: 测试结果汇总
     """
@@ -328,24 +441,26 @@ def run_all_tests() -> dict:
 
     results = {}
 
-    results["test_spider_list"] = test_spider_list()
-    time.sleep(0.5)
-
-    results["test_spider_detail"] = test_spider_detail(SPIDER_ID)
-    time.sleep(0.5)
-
-    results["test_download_config"] = test_download_config(SPIDER_ID)
-    time.sleep(0.5)
-
-    if TEST_ITEM_IDS:
-        results["test_download_item_zip"] = test_download_item_zip(SPIDER_ID, TEST_ITEM_IDS[0])
-        time.sleep(0.5)
+    # 所有测试共用一个客户端，keep-alive 复用连接
+    async with create_client() as client:
+        tests = {
+            "test_spider_list": test_spider_list(client),
+            "test_spider_detail": test_spider_detail(client, SPIDER_ID),
+            "test_download_config": test_download_config(client, SPIDER_ID),
+        }
+        if TEST_ITEM_IDS:
+            tests["test_download_item_zip"] = test_download_item_zip(client, SPIDER_ID, TEST_ITEM_IDS[0])
+            tests["test_batch_download_items"] = test_batch_download_items(client, SPIDER_ID, TEST_ITEM_IDS[:3])
+            if STRESS_ITEM_IDS:
+                tests["stress_download"] = stress_download(client, SPIDER_ID, STRESS_ITEM_IDS)
+                tests["test_parallel_item_downloads"] = test_parallel_item_downloads(client, SPIDER_ID, STRESS_ITEM_IDS)
+        else:
+            print("\n警告: 未提供测试 item_id，跳过接口 4 和 5 的测试")
+            results["test_download_item_zip"] = False
+            results["test_batch_download_items"] = False
 
-        results["test_batch_download_items"] = test_batch_download_items(SPIDER_ID, TEST_ITEM_IDS[:3])
-    else:
-        print("\n警告: 未提供测试 item_id，跳过接口 4 和 5 的测试")
-        results["test_download_item_zip"] = False
-        results["test_batch_download_items"] = False
+        outcomes = await asyncio.gather(*tests.values())
+        results = {**dict(zip(tests, outcomes)), **results}
 
     print("\n" + "=" * 60)
     print("测试结果汇总")
@@ -368,7 +483,7 @@ def run_all_tests() -> dict:
 
 
 if __name__ == "__main__":
-    results = run_all_tests()
+    results = asyncio.run(run_all_tests())
 
     exit_code = 0 if all(results.values()) else 1
     sys.exit(exit_code)
@@ -0,0 +1,30 @@
+"""
+测试从URL提取文件扩展名
+"""
+import sys
+from pathlib import Path
+
+backend_path = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(backend_path))
+
+from spiders.crawlers.utils import get_file_suffix
+
+CASES = [
+    ('http://h/a.pdf', 'pdf'),
+    ('http://h/a.PDF?x=1', 'pdf'),
+    ('http://h/a.doc#page=2', 'doc'),
+    ('http://h/a.pdf;jsessionid=abc', 'pdf'),
+    ('http://h/a.pdf;jsessionid=abc?x=1.2', 'pdf'),
+    ('http://h/download?filename=%E6%96%87%E4%BB%B6.docx', 'docx'),
+    ('http://h.com/', 'bin'),
+]
+
+def test_get_file_suffix():
+    """测试常见URL形式的扩展名提取"""
+    for url, expected in CASES:
+        suffix = get_file_suffix(url)
+        print(f"   {url} -> {suffix}")
+        assert suffix == expected, f"{url}: {suffix} != {expected}"
+
+if __name__ == '__main__':
+    test_get_file_suffix()